@@ -78,7 +78,9 @@ def create_app() -> FastAPI:
             
             # Process the rebuild
             processor = get_tradition_processor()
-            result = await processor.process_tradition_rebuild(tradition)
+            result = await processor.process_tradition_rebuild(
+                tradition, incremental=data.get("incremental", True)
+            )
             
             return {"status": "success", "result": result}
                 
@@ -144,7 +146,9 @@ def create_app() -> FastAPI:
             
             # Process the rebuild
             processor = get_tradition_processor()
-            result = await processor.process_tradition_rebuild(tradition)
+            result = await processor.process_tradition_rebuild(
+                tradition, incremental=request.get("incremental", True)
+            )
             
             return {"status": "success", "task_id": f"http_{tradition}", "result": result}
                 
@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from google.cloud import storage
 
 logger = logging.getLogger(__name__)
@@ -28,6 +28,31 @@ class GCSClient:
             logger.error(f"Failed to list files in bucket {self.bucket_name}: {e}")
             return []
 
+    def list_documents(self, tradition: str) -> List[Dict[str, Any]]:
+        """
+        List a tradition's documents under the {tradition}/ prefix.
+
+        Each entry carries the MD5 hash GCS keeps for the object, so callers
+        can detect changed documents without downloading them.
+        """
+        try:
+            blobs = self.client.list_blobs(self.bucket_name, prefix=f"{tradition}/")
+            documents = [
+                {
+                    "name": blob.name,
+                    "size": blob.size,
+                    "md5_hash": blob.md5_hash,
+                    "updated": blob.updated.isoformat() if blob.updated else None,
+                }
+                for blob in blobs
+                if not blob.name.endswith("/")
+            ]
+            logger.info(f"Found {len(documents)} documents for tradition {tradition}")
+            return documents
+        except Exception as e:
+            logger.error(f"Failed to list documents for tradition {tradition}: {e}")
+            return []
+
     def download_to_filename(self, blob_name: str, filename: str) -> bool:
         """Download a blob to a local filename."""
         try:
@@ -203,11 +203,31 @@ class CeleryJournalClient:
             query = """
                 query GetJournalEntries($userId: UUID!, $startDate: DateTime!, $endDate: DateTime!) {
                     journalEntries(userId: $userId, startDate: $startDate, endDate: $endDate) {
+                        __typename
                         id
-                        content
+                        userId
                         entryType
                         createdAt
                         modifiedAt
+                        ... on FreeformJournalEntry {
+                            freeformPayload: payload
+                        }
+                        ... on GratitudeJournalEntry {
+                            gratitudePayload: payload {
+                                gratefulFor
+                                excitedAbout
+                                focus
+                                affirmation
+                                mood
+                            }
+                        }
+                        ... on ReflectionJournalEntry {
+                            reflectionPayload: payload {
+                                wins
+                                improvements
+                                mood
+                            }
+                        }
                     }
                 }
             """
@@ -5,7 +5,7 @@ import os
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from qdrant_client import QdrantClient as QdrantClientBase
 from qdrant_client.http.exceptions import ResponseHandlingException
@@ -13,13 +13,21 @@ from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    FilterSelector,
+    KeywordIndexParams,
+    KeywordIndexType,
+    MatchAny,
     MatchValue,
+    Modifier,
     PointStruct,
     SearchRequest,
+    SparseVector,
+    SparseVectorParams,
     VectorParams,
     Range,
 )
 from qdrant_client.http import models
+from shared.sparse_vectors import SPARSE_VECTOR_NAME, document_sparse_vector
 
 from ..config import Config
 
@@ -43,10 +51,13 @@ class SearchResult:
 class CeleryQdrantClient:
     """Qdrant client for celery-worker operations."""
 
-    def __init__(self, url: str = None, api_key: str = None):
+    def __init__(self, url: str = None, api_key: str = None, personal_layout: str = None):
         """Initialize Qdrant client."""
         self.url = url or Config.QDRANT_URL
         self.api_key = api_key or Config.QDRANT_API_KEY
+        self.personal_layout = personal_layout or Config.QDRANT_PERSONAL_LAYOUT
+        if self.personal_layout not in ("per_user", "shared"):
+            raise ValueError(f"Unsupported personal layout: {self.personal_layout}")
         
         # Debug logging
         logger.debug(f"Qdrant URL: {self.url}")
@@ -60,6 +71,13 @@ class CeleryQdrantClient:
             self.client = QdrantClientBase(url=self.url)
             logger.warning(f"Initialized CeleryQdrantClient with {self.url} (no API key - may cause auth issues)")
 
+        # Names of collections known to exist, so indexing skips listing
+        # every collection on the server
+        self._known_collections: Set[str] = set()
+        # Whether each collection has the BM25 sparse vector used by the
+        # agent's keyword search (older collections lack it until rebuilt)
+        self._sparse_collections: Dict[str, bool] = {}
+
     async def health_check(self) -> bool:
         """Check if Qdrant is healthy and reachable."""
         try:
@@ -83,15 +101,68 @@ class CeleryQdrantClient:
         await self._create_collection(collection_name)
         return collection_name
 
-    async def _create_collection(self, collection_name: str) -> bool:
-        """Internal method to create a collection with standard configuration."""
+    async def _collection_exists(self, collection_name: str) -> bool:
+        """
+        Check whether a collection exists, consulting the known-collections cache.
+
+        On a cache miss the full listing is fetched once and used to refresh
+        the cache, so repeated checks for existing collections are O(1).
+        """
+        if collection_name in self._known_collections:
+            return True
+
+        collections = self.client.get_collections()
+        self._known_collections = {col.name for col in collections.collections}
+        return collection_name in self._known_collections
+
+    def invalidate_collection_cache(self, collection_name: Optional[str] = None) -> None:
+        """Forget one cached collection name, or all of them if none is given."""
+        if collection_name is None:
+            self._known_collections.clear()
+            self._sparse_collections.clear()
+        else:
+            self._known_collections.discard(collection_name)
+            self._sparse_collections.pop(collection_name, None)
+
+    def _supports_sparse(self, collection_name: str) -> bool:
+        """Check (once per collection) whether it stores BM25 sparse vectors."""
+        if collection_name not in self._sparse_collections:
+            try:
+                info = self.client.get_collection(collection_name=collection_name)
+            except Exception as e:
+                logger.debug(f"Could not inspect collection {collection_name}: {e}")
+                return False
+            sparse_vectors = info.config.params.sparse_vectors or {}
+            self._sparse_collections[collection_name] = (
+                SPARSE_VECTOR_NAME in sparse_vectors
+            )
+        return self._sparse_collections[collection_name]
+
+    @staticmethod
+    def _point_vector(text: str, embedding: List[float], sparse: bool) -> Any:
+        """Build a point's vector, adding the BM25 sparse vector if supported."""
+        if not sparse:
+            return embedding
+        indices, values = document_sparse_vector(text)
+        return {
+            "": embedding,
+            SPARSE_VECTOR_NAME: SparseVector(indices=indices, values=values),
+        }
+
+    async def _create_collection(
+        self, collection_name: str, tenant_field: Optional[str] = None
+    ) -> bool:
+        """
+        Internal method to create a collection with standard configuration.
+
+        If tenant_field is given, a new collection also gets a keyword payload
+        index on that field, marked as the tenant key for filtered searches.
+        New collections also get the BM25 sparse vector for keyword search.
+        """
         try:
             # Check if collection already exists
-            collections = self.client.get_collections()
-            existing_names = [col.name for col in collections.collections]
-
-            if collection_name in existing_names:
-                logger.info(f"Collection {collection_name} already exists")
+            if await self._collection_exists(collection_name):
+                logger.debug(f"Collection {collection_name} already exists")
                 return True
 
             # Create new collection with vector configuration
@@ -100,7 +171,21 @@ class CeleryQdrantClient:
                 vectors_config=models.VectorParams(
                     size=Config.VECTOR_SIZE, distance=Distance.COSINE
                 ),
+                sparse_vectors_config={
+                    SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+                },
+                on_disk_payload=Config.QDRANT_ON_DISK_PAYLOAD,
             )
+            if tenant_field:
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=tenant_field,
+                    field_schema=KeywordIndexParams(
+                        type=KeywordIndexType.KEYWORD, is_tenant=True
+                    ),
+                )
+            self._known_collections.add(collection_name)
+            self._sparse_collections[collection_name] = True
 
             logger.info(f"Created collection: {collection_name}")
             return True
@@ -113,6 +198,7 @@ class CeleryQdrantClient:
         """Delete a collection and all its documents."""
         try:
             self.client.delete_collection(collection_name=collection_name)
+            self.invalidate_collection_cache(collection_name)
             logger.info(f"Deleted collection: {collection_name}")
             return True
         except Exception as e:
@@ -125,18 +211,23 @@ class CeleryQdrantClient:
         texts: List[str],
         embeddings: List[List[float]],
         metadatas: List[dict],
+        batch_size: Optional[int] = None,
     ) -> List[str]:
         """
         Indexes a batch of document chunks into a tradition's knowledge collection.
 
+        Points are written in batches of batch_size (QDRANT_UPSERT_BATCH_SIZE
+        by default) via upsert_points.
+
         Returns:
             A list of the point IDs for the indexed documents.
         """
         collection_name = self.get_knowledge_collection_name(tradition)
+        sparse = self._supports_sparse(collection_name)
         points = [
             PointStruct(
                 id=str(uuid.uuid4()),
-                vector=embedding,
+                vector=self._point_vector(text, embedding, sparse),
                 payload={**metadata, "text": text},
             )
             for text, embedding, metadata in zip(texts, embeddings, metadatas)
@@ -145,15 +236,112 @@ class CeleryQdrantClient:
         if not points:
             return []
 
-        operation_info = self.client.upsert(
-            collection_name=collection_name, wait=True, points=points
-        )
-        logger.info(
-            f"Upserted {len(points)} points to {collection_name}. Status: {operation_info.status}"
-        )
-
+        await self.upsert_points(collection_name, points, batch_size=batch_size)
         return [point.id for point in points]
 
+    async def upsert_points(
+        self,
+        collection_name: str,
+        points: List[PointStruct],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """
+        Upsert points in batches without waiting for each batch to be applied.
+
+        Every batch but the last is sent with wait=False. Qdrant applies the
+        updates of a collection in order, so waiting on the last batch acts
+        as a barrier: when this returns, all points are searchable.
+        """
+        batch_size = batch_size or Config.QDRANT_UPSERT_BATCH_SIZE
+        for start in range(0, len(points), batch_size):
+            batch = points[start : start + batch_size]
+            is_last = start + batch_size >= len(points)
+            operation_info = self.client.upsert(
+                collection_name=collection_name, wait=is_last, points=batch
+            )
+            logger.debug(
+                f"Upserted {len(batch)} points to {collection_name}. Status: {operation_info.status}"
+            )
+        logger.info(f"Upserted {len(points)} points to {collection_name}")
+
+    async def get_indexed_sources(
+        self,
+        collection_name: str,
+        source_field: str = "source",
+        batch_size: int = 1024,
+        indexed_by: Optional[str] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Map each indexed source document to the content hash stored on its chunks.
+
+        Only the source and content_hash payload fields are scrolled, without
+        vectors. Sources indexed before hashes were recorded map to None. When
+        indexed_by is given, only chunks carrying that indexed_by marker count.
+        """
+        if not await self._collection_exists(collection_name):
+            return {}
+
+        scroll_filter = None
+        if indexed_by is not None:
+            scroll_filter = Filter(
+                must=[FieldCondition(key="indexed_by", match=MatchValue(value=indexed_by))]
+            )
+
+        sources: Dict[str, Optional[str]] = {}
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                scroll_filter=scroll_filter,
+                with_payload=[source_field, "content_hash"],
+                with_vectors=False,
+            )
+            for record in records:
+                payload = record.payload or {}
+                source = payload.get(source_field)
+                if source is None:
+                    continue
+                content_hash = payload.get("content_hash")
+                # A source with any unhashed chunk must be treated as stale
+                if source in sources and sources[source] != content_hash:
+                    sources[source] = None
+                else:
+                    sources[source] = content_hash
+            if offset is None:
+                break
+        return sources
+
+    async def delete_points_by_source(
+        self,
+        collection_name: str,
+        sources: List[str],
+        source_field: str = "source",
+    ) -> bool:
+        """Delete every chunk belonging to the given source documents."""
+        if not sources:
+            return True
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(
+                        must=[
+                            FieldCondition(
+                                key=source_field, match=MatchAny(any=list(sources))
+                            )
+                        ]
+                    )
+                ),
+                wait=True,
+            )
+            logger.info(f"Deleted chunks of {len(sources)} sources from {collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete sources from {collection_name}: {e}")
+            return False
+
     async def search_knowledge_base(
         self,
         collection_name: str,
@@ -205,8 +393,15 @@ class CeleryQdrantClient:
             logger.error(f"Failed to get collection info for {collection_name}: {e}")
             return None
 
+    @property
+    def uses_shared_personal_layout(self) -> bool:
+        """Whether personal vectors live in one shared, user_id-filtered collection."""
+        return self.personal_layout == "shared"
+
     def get_personal_collection_name(self, tradition: str, user_id: str) -> str:
         """Get collection name for user's personal data (journals)."""
+        if self.uses_shared_personal_layout:
+            return f"{tradition}_personal"
         return f"{tradition}_{user_id}_personal"
 
     async def get_or_create_personal_collection(
@@ -214,7 +409,10 @@ class CeleryQdrantClient:
     ) -> str:
         """Get or create personal collection for user's data."""
         collection_name = self.get_personal_collection_name(tradition, user_id)
-        await self._create_collection(collection_name)
+        if self.uses_shared_personal_layout:
+            await self._create_collection(collection_name, tenant_field="user_id")
+        else:
+            await self._create_collection(collection_name)
         return collection_name
 
     async def index_personal_document(
@@ -235,6 +433,43 @@ class CeleryQdrantClient:
 
         return await self.index_document(collection_name, text, embedding, metadata)
 
+    async def index_personal_documents(
+        self,
+        tradition: str,
+        user_id: str,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+    ) -> List[str]:
+        """Index several personal documents of one user with a single bulk upsert."""
+        collection_name = await self.get_or_create_personal_collection(
+            tradition, user_id
+        )
+        sparse = self._supports_sparse(collection_name)
+        points = [
+            PointStruct(
+                id=str(uuid.uuid4()),
+                vector=self._point_vector(text, embedding, sparse),
+                payload={
+                    **metadata,
+                    "source_type": "journal",
+                    "user_id": user_id,
+                    "text": text,
+                },
+            )
+            for text, embedding, metadata in zip(texts, embeddings, metadatas)
+        ]
+        if not points:
+            return []
+
+        try:
+            await self.upsert_points(collection_name, points)
+        except Exception:
+            # The collection may have been deleted elsewhere; re-check next time
+            self.invalidate_collection_cache(collection_name)
+            raise
+        return [point.id for point in points]
+
     async def index_document(
         self,
         collection_name: str,
@@ -251,7 +486,13 @@ class CeleryQdrantClient:
             metadata["text"] = text
 
             # Create point for insertion
-            point = PointStruct(id=doc_id, vector=embedding, payload=metadata)
+            point = PointStruct(
+                id=doc_id,
+                vector=self._point_vector(
+                    text, embedding, self._supports_sparse(collection_name)
+                ),
+                payload=metadata,
+            )
 
             # Insert into collection
             self.client.upsert(collection_name=collection_name, points=[point])
@@ -262,6 +503,8 @@ class CeleryQdrantClient:
             return doc_id
 
         except Exception as e:
+            # The collection may have been deleted elsewhere; re-check next time
+            self.invalidate_collection_cache(collection_name)
             logger.error(
                 f"Failed to index document in collection {collection_name}: {e}"
             )
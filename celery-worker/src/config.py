@@ -25,6 +25,16 @@ class Config:
     # Qdrant configuration
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://qdrant:6333")
     QDRANT_API_KEY: Optional[str] = os.getenv("QDRANT_API_KEY")
+    # Personal journal vector layout: "per_user" ({tradition}_{user_id}_personal)
+    # or "shared" ({tradition}_personal filtered by an indexed user_id field)
+    QDRANT_PERSONAL_LAYOUT: str = os.getenv("QDRANT_PERSONAL_LAYOUT", "per_user")
+    # Points per upsert request when bulk-indexing knowledge chunks
+    QDRANT_UPSERT_BATCH_SIZE: int = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+    # Keep payloads (including chunk text) on disk instead of in RAM for new
+    # collections
+    QDRANT_ON_DISK_PAYLOAD: bool = (
+        os.getenv("QDRANT_ON_DISK_PAYLOAD", "false").lower() == "true"
+    )
 
     # Journal service configuration
     JOURNAL_SERVICE_URL: str = os.getenv(
@@ -45,11 +55,17 @@ class Config:
     OLLAMA_EMBEDDING_MODEL: str = os.getenv(
         "OLLAMA_EMBEDDING_MODEL", "nomic-embed-text"
     )
+    # Texts per /api/embed request and how many requests may run at once
+    OLLAMA_EMBED_BATCH_SIZE: int = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "32"))
+    OLLAMA_EMBED_CONCURRENCY: int = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", "4"))
+    OLLAMA_TIMEOUT_SECONDS: float = float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "60"))
 
     # Task configuration
     TASK_DEFAULT_RETRY_DELAY: int = int(os.getenv("TASK_DEFAULT_RETRY_DELAY", "60"))
     TASK_MAX_RETRIES: int = int(os.getenv("TASK_MAX_RETRIES", "3"))
     TASK_TIME_LIMIT: int = int(os.getenv("TASK_TIME_LIMIT", "300"))
+    # Journal entries fetched from the journal service at once during batch indexing
+    JOURNAL_INDEXING_CONCURRENCY: int = int(os.getenv("JOURNAL_INDEXING_CONCURRENCY", "8"))
 
     # Testing configuration - only "true" (lowercase) should enable testing
     TESTING: bool = os.getenv("TESTING", "false").lower() == "true"
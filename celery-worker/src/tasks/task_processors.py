@@ -6,21 +6,37 @@ without Celery, replacing the old task queue system.
 """
 
 import asyncio
+import hashlib
 import logging
 import tempfile
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from uuid import uuid4
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
 
 from src.clients.journal_client import create_celery_journal_client
 from src.clients.qdrant_client import get_celery_qdrant_client
 from src.clients.gcs_client import get_gcs_client
+from src.config import Config
 from src.utils.embedding import get_embedding, get_embeddings
 
 logger = logging.getLogger(__name__)
 
+# Marks knowledge chunks written by the GCS rebuild. The CLI writes local files
+# into the same collections, and incremental runs must never delete those.
+GCS_INDEXER = "celery-worker"
+
+
+def _file_sha256(path: str) -> str:
+    """Return the SHA-256 hex digest of a local file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 
 class JournalIndexingProcessor:
     """Processor for journal entry indexing operations."""
@@ -59,11 +75,7 @@ class JournalIndexingProcessor:
                 user_id=user_id,
                 text=text_content,
                 embedding=embedding,
-                metadata={
-                    **entry_data,
-                    "entry_id": entry_id,
-                    "entry_type": entry_data.get("entry_type", "UNKNOWN")
-                }
+                metadata=self._entry_metadata(entry_data, entry_id),
             )
             
             logger.info(f"Successfully indexed entry {entry_id}")
@@ -74,34 +86,47 @@ class JournalIndexingProcessor:
             return False
 
     async def process_batch_indexing(self, entries_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Process batch journal indexing."""
+        """
+        Process batch journal indexing.
+
+        Entries are fetched concurrently (at most JOURNAL_INDEXING_CONCURRENCY
+        at a time), then each user's entries are embedded in one call and
+        written with one bulk upsert.
+        """
         try:
             logger.info(f"Processing batch indexing for {len(entries_data)} entries")
             
-            # NOTE: Recursion exercise for readers?
-            # Process each entry individually
             indexed = 0
             failed = 0
-            
+
+            valid_requests = []
             for entry_data in entries_data:
-                try:
-                    entry_id = entry_data.get("entry_id")
-                    user_id = entry_data.get("user_id")
-                    tradition = entry_data.get("tradition", "canon-default")
-                    
-                    if entry_id and user_id:
-                        success = await self.process_journal_indexing(entry_id, user_id, tradition)
-                        if success:
-                            indexed += 1
-                        else:
-                            failed += 1
-                    else:
-                        failed += 1
-                        logger.warning(f"Missing entry_id or user_id in entry data: {entry_data}")
-                        
-                except Exception as e:
+                if entry_data.get("entry_id") and entry_data.get("user_id"):
+                    valid_requests.append(entry_data)
+                else:
+                    failed += 1
+                    logger.warning(f"Missing entry_id or user_id in entry data: {entry_data}")
+
+            fetched = await self._fetch_entries(
+                [(request["entry_id"], request["user_id"]) for request in valid_requests]
+            )
+
+            # Group fetched entries by target collection
+            groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            for request, entry in zip(valid_requests, fetched):
+                if not entry:
+                    logger.warning(f"Journal entry {request['entry_id']} not found after retries")
                     failed += 1
-                    logger.error(f"Error processing entry in batch: {e}")
+                    continue
+                key = (request["user_id"], request.get("tradition", "canon-default"))
+                groups.setdefault(key, []).append({**entry, "id": request["entry_id"]})
+
+            for (user_id, tradition), entries in groups.items():
+                group_indexed, group_failed = await self._index_user_entries(
+                    entries, user_id, tradition
+                )
+                indexed += group_indexed
+                failed += group_failed
             
             result = {"indexed": indexed, "failed": failed, "total": len(entries_data)}
             logger.info(f"Batch indexing completed: {result}")
@@ -112,7 +137,13 @@ class JournalIndexingProcessor:
             return {"indexed": 0, "failed": len(entries_data), "total": len(entries_data)}
 
     async def process_user_reindex(self, user_id: str, tradition: str = "canon-default", lookback_days: int = 30) -> Dict[str, Any]:
-        """Process user reindexing."""
+        """
+        Process user reindexing.
+
+        The period's entries come from a single listing call; only entries the
+        listing returned without content are fetched again by id. All of them
+        are embedded in one call and written with one bulk upsert.
+        """
         try:
             logger.info(f"Processing user reindex for user {user_id}, tradition {tradition}, lookback {lookback_days} days")
             
@@ -131,18 +162,20 @@ class JournalIndexingProcessor:
                 logger.warning(f"No entries found for user {user_id}")
                 return {"indexed": 0, "failed": 0, "total": 0}
 
-            # Process each entry
-            indexed = 0
-            failed = 0
-            
-            for entry in entries:
-                success = await self.process_journal_indexing(
-                    entry["id"], user_id, tradition
+            incomplete = [
+                position
+                for position, entry in enumerate(entries)
+                if not self._extract_text_from_entry(entry)
+            ]
+            if incomplete:
+                fetched = await self._fetch_entries(
+                    [(entries[position]["id"], user_id) for position in incomplete]
                 )
-                if success:
-                    indexed += 1
-                else:
-                    failed += 1
+                for position, entry in zip(incomplete, fetched):
+                    if entry:
+                        entries[position] = {**entry, "id": entries[position]["id"]}
+
+            indexed, failed = await self._index_user_entries(entries, user_id, tradition)
 
             result = {"indexed": indexed, "failed": failed, "total": len(entries)}
             logger.info(f"User reindex completed: {result}")
@@ -152,6 +185,88 @@ class JournalIndexingProcessor:
             logger.error(f"Error processing user reindex for user {user_id}: {e}")
             return {"indexed": 0, "failed": 1, "total": 1}
 
+    async def _fetch_entries(
+        self, requests: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Fetch (entry_id, user_id) pairs concurrently, None for entries that fail."""
+        semaphore = asyncio.Semaphore(Config.JOURNAL_INDEXING_CONCURRENCY)
+
+        async def _fetch(entry_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self._get_journal_entry_with_retry(entry_id, user_id)
+                except Exception as e:
+                    logger.error(f"Failed to fetch journal entry {entry_id}: {e}")
+                    return None
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(_fetch(entry_id, user_id))
+                for entry_id, user_id in requests
+            ]
+        return [task.result() for task in tasks]
+
+    async def _index_user_entries(
+        self, entries: List[Dict[str, Any]], user_id: str, tradition: str
+    ) -> Tuple[int, int]:
+        """
+        Embed one user's entries in a single call and index them in one upsert.
+
+        Returns:
+            (indexed, failed) counts
+        """
+        texts = []
+        metadatas = []
+        failed = 0
+        for entry_data in entries:
+            text_content = self._extract_text_from_entry(entry_data)
+            if not text_content:
+                logger.warning(f"No content found for entry {entry_data.get('id')}")
+                failed += 1
+                continue
+            texts.append(text_content)
+            metadatas.append(self._entry_metadata(entry_data, entry_data.get("id")))
+
+        if not texts:
+            return 0, failed
+
+        try:
+            embeddings = await get_embeddings(texts)
+            # Embedding services return zero vectors for failed inputs
+            keep = [i for i, embedding in enumerate(embeddings) if any(embedding)]
+            failed += len(texts) - len(keep)
+
+            await self.qdrant_client.index_personal_documents(
+                tradition=tradition,
+                user_id=user_id,
+                texts=[texts[i] for i in keep],
+                embeddings=[embeddings[i] for i in keep],
+                metadatas=[metadatas[i] for i in keep],
+            )
+        except Exception as e:
+            logger.error(f"Error indexing {len(texts)} entries for user {user_id}: {e}")
+            return 0, failed + len(texts)
+
+        logger.info(f"Indexed {len(keep)} entries for user {user_id}")
+        return len(keep), failed
+
+    def _entry_metadata(
+        self, entry_data: Dict[str, Any], entry_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Build the Qdrant payload metadata for a journal entry.
+
+        Only identifying fields are kept; the entry's content is already
+        stored once as the point's text, so the raw payload fragments are
+        not copied into the vector payload.
+        """
+        return {
+            "entry_id": entry_id,
+            "entry_type": entry_data.get("entry_type", "UNKNOWN"),
+            "created_at": entry_data.get("created_at"),
+            "modified_at": entry_data.get("modified_at"),
+        }
+
     def _extract_text_from_entry(self, entry_data: Dict[str, Any]) -> str:
         """Extract text content from journal entry data."""
         entry_type = entry_data.get("entry_type", "")
@@ -234,64 +349,150 @@ class TraditionRebuildProcessor:
         """Initialize the processor with required clients."""
         self.gcs_client = get_gcs_client()
         self.qdrant_client = get_celery_qdrant_client()
-
-    async def process_tradition_rebuild(self, tradition: str) -> Dict[str, Any]:
-        """Process tradition rebuild request."""
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=1000,
+            chunk_overlap=200
+        )
+
+    def _load_document_chunks(
+        self, doc: Dict[str, Any], indexed_hash: Optional[str]
+    ) -> Optional[Tuple[List[Document], str]]:
+        """
+        Download, parse and split one GCS document.
+
+        This is blocking I/O and CPU work, run in a worker thread. Returns
+        None when the downloaded content matches indexed_hash.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as temp_file:
+            if not self.gcs_client.download_to_filename(doc["name"], temp_file.name):
+                raise RuntimeError("download failed")
+
+            content_hash = doc.get("md5_hash") or _file_sha256(temp_file.name)
+            if indexed_hash is not None and indexed_hash == content_hash:
+                return None
+
+            pages = PyPDFLoader(temp_file.name).load()
+
+        return self.text_splitter.split_documents(pages), content_hash
+
+    async def process_tradition_rebuild(
+        self, tradition: str, incremental: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Process tradition rebuild request.
+
+        In incremental mode a document is only re-embedded when its content
+        hash differs from the one stored on its indexed chunks, and chunks of
+        documents that are no longer in GCS are deleted. A full rebuild
+        re-embeds everything but still replaces each document's old chunks.
+        """
         try:
-            logger.info(f"Processing tradition rebuild for {tradition}")
+            logger.info(f"Processing tradition rebuild for {tradition} (incremental={incremental})")
             
             # Get documents from GCS
             documents = self.gcs_client.list_documents(tradition)
             
             if not documents:
+                # An empty listing may be a GCS error, so nothing is deleted
                 logger.warning(f"No documents found for tradition {tradition}")
-                return {"indexed": 0, "failed": 0, "total": 0}
+                return {"indexed": 0, "failed": 0, "skipped": 0, "removed": 0, "total": 0}
+
+            collection_name = await self.qdrant_client.get_or_create_knowledge_collection(tradition)
+            indexed_sources = (
+                await self.qdrant_client.get_indexed_sources(
+                    collection_name, indexed_by=GCS_INDEXER
+                )
+                if incremental
+                else {}
+            )
+
+            document_names = {doc["name"] for doc in documents}
+            removed = [
+                source for source in indexed_sources if source not in document_names
+            ]
+            if removed:
+                await self.qdrant_client.delete_points_by_source(collection_name, removed)
 
             indexed = 0
             failed = 0
-            
-            for doc in documents:
+
+            # Documents whose GCS hash matches the index are skipped undownloaded
+            pending = [
+                doc
+                for doc in documents
+                if not (
+                    incremental
+                    and doc.get("md5_hash")
+                    and indexed_sources.get(doc["name"]) == doc["md5_hash"]
+                )
+            ]
+            skipped = len(documents) - len(pending)
+
+            def _prefetch(doc: Dict[str, Any]) -> asyncio.Task:
+                return asyncio.create_task(
+                    asyncio.to_thread(
+                        self._load_document_chunks, doc, indexed_sources.get(doc["name"])
+                    )
+                )
+
+            next_load = _prefetch(pending[0]) if pending else None
+            for position, doc in enumerate(pending):
+                current_load = next_load
+                # Download and parse the next document while this one embeds
+                next_load = (
+                    _prefetch(pending[position + 1])
+                    if position + 1 < len(pending)
+                    else None
+                )
+
                 try:
-                    # Download document
-                    with tempfile.NamedTemporaryFile(suffix=".pdf") as temp_file:
-                        self.gcs_client.download_document(tradition, doc["name"], temp_file.name)
-                        
-                        # Load and split document
-                        loader = PyPDFLoader(temp_file.name)
-                        pages = loader.load()
-                        
-                        text_splitter = RecursiveCharacterTextSplitter(
-                            chunk_size=1000,
-                            chunk_overlap=200
-                        )
-                        chunks = text_splitter.split_documents(pages)
-                        
-                        # Get embeddings for chunks
-                        texts = [chunk.page_content for chunk in chunks]
-                        embeddings = await get_embeddings(texts)
-                        
-                        # Index chunks in Qdrant
-                        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                            chunk_id = f"{doc['name']}_chunk_{i}"
-                            await self.qdrant_client.index_document(
-                                collection_name=self.qdrant_client.get_knowledge_collection_name(tradition),
-                                text=chunk.page_content,
-                                embedding=embedding,
-                                metadata={
-                                    "source": doc["name"], 
-                                    "page": chunk.metadata.get("page", 0),
-                                    "chunk_id": chunk_id,
-                                    "tradition": tradition
-                                }
-                            )
-                        
-                        indexed += len(chunks)
-                        
+                    loaded = await current_load
+                    if loaded is None:
+                        skipped += 1
+                        continue
+                    chunks, content_hash = loaded
+                    
+                    # Get embeddings for chunks
+                    texts = [chunk.page_content for chunk in chunks]
+                    embeddings = await get_embeddings(texts)
+                    if any(not any(embedding) for embedding in embeddings):
+                        # Keep the old chunks rather than index zero vectors
+                        raise RuntimeError("embedding failed for one or more chunks")
+
+                    # Replace the document's previous chunks, if any
+                    await self.qdrant_client.delete_points_by_source(
+                        collection_name, [doc["name"]]
+                    )
+                    await self.qdrant_client.index_knowledge_documents(
+                        tradition=tradition,
+                        texts=texts,
+                        embeddings=embeddings,
+                        metadatas=[
+                            {
+                                "source": doc["name"],
+                                "page": chunk.metadata.get("page", 0),
+                                "chunk_id": f"{doc['name']}_chunk_{i}",
+                                "tradition": tradition,
+                                "content_hash": content_hash,
+                                "indexed_by": GCS_INDEXER,
+                            }
+                            for i, chunk in enumerate(chunks)
+                        ],
+                    )
+                    
+                    indexed += len(chunks)
+                    
                 except Exception as e:
                     logger.error(f"Error processing document {doc['name']}: {e}")
                     failed += 1
 
-            result = {"indexed": indexed, "failed": failed, "total": len(documents)}
+            result = {
+                "indexed": indexed,
+                "failed": failed,
+                "skipped": skipped,
+                "removed": len(removed),
+                "total": len(documents),
+            }
             logger.info(f"Tradition rebuild completed: {result}")
             return result
             
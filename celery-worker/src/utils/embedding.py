@@ -1,8 +1,9 @@
 import logging
 import os
 import asyncio
+import time
 import httpx
-from typing import List, Protocol
+from typing import Any, Dict, List, Optional, Protocol
 from abc import ABC, abstractmethod
 
 from ..config import Config
@@ -23,14 +24,45 @@ class EmbeddingService(Protocol):
 
 
 class OllamaEmbeddingService:
-    """Ollama-based embedding service."""
+    """
+    Ollama-based embedding service.
+
+    Batches go to Ollama's /api/embed endpoint, several requests at a time
+    over one pooled keep-alive client. Servers that predate /api/embed are
+    detected on the first 404, after which texts are sent concurrently to
+    /api/embeddings one by one.
+    """
 
-    def __init__(self, base_url: str = None, model: str = None):
+    def __init__(
+        self,
+        base_url: str = None,
+        model: str = None,
+        batch_size: int = None,
+        concurrency: int = None,
+    ):
         self.base_url = base_url or os.getenv(
             "OLLAMA_BASE_URL", "http://host.docker.internal:11434"
         )
         self.model = model or os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
-        self.client = httpx.AsyncClient()
+        self.batch_size = batch_size or Config.OLLAMA_EMBED_BATCH_SIZE
+        self.concurrency = concurrency or Config.OLLAMA_EMBED_CONCURRENCY
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(Config.OLLAMA_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=self.concurrency * 2,
+                max_keepalive_connections=self.concurrency,
+                keepalive_expiry=30.0,
+            ),
+        )
+        # None until the first batch request shows whether /api/embed exists
+        self._batch_endpoint_supported: Optional[bool] = None
+        self._batch_metrics = {
+            "batches": 0,
+            "texts": 0,
+            "fallback_batches": 0,
+            "total_seconds": 0.0,
+            "last_batch_seconds": 0.0,
+        }
 
     async def get_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using Ollama."""
@@ -51,17 +83,85 @@ class OllamaEmbeddingService:
             return [0.0] * Config.VECTOR_SIZE
 
     async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
+        """Generate embeddings for multiple texts, batch_size texts per request."""
         try:
-            embeddings = []
-            for text in texts:
-                embedding = await self.get_embedding(text)
-                embeddings.append(embedding)
-            return embeddings
+            # Created per call: the semaphore must belong to the running loop
+            semaphore = asyncio.Semaphore(self.concurrency)
+            batches = [
+                texts[start : start + self.batch_size]
+                for start in range(0, len(texts), self.batch_size)
+            ]
+            results = await asyncio.gather(
+                *(self._embed_batch(batch, semaphore) for batch in batches)
+            )
+            return [embedding for batch in results for embedding in batch]
         except Exception as e:
             logger.error(f"Failed to generate embeddings with Ollama: {e}")
             return [[0.0] * Config.VECTOR_SIZE for _ in texts]
 
+    async def _embed_batch(
+        self, batch: List[str], semaphore: asyncio.Semaphore
+    ) -> List[List[float]]:
+        """Embed one batch natively, falling back to concurrent single requests."""
+        started = time.perf_counter()
+
+        embeddings = None
+        if self._batch_endpoint_supported is not False:
+            async with semaphore:
+                embeddings = await self._post_embed_batch(batch)
+
+        fallback = embeddings is None
+        if fallback:
+            async def _embed_one(text: str) -> List[float]:
+                async with semaphore:
+                    return await self.get_embedding(text)
+
+            embeddings = await asyncio.gather(*(_embed_one(text) for text in batch))
+
+        elapsed = time.perf_counter() - started
+        self._batch_metrics["batches"] += 1
+        self._batch_metrics["texts"] += len(batch)
+        self._batch_metrics["fallback_batches"] += int(fallback)
+        self._batch_metrics["total_seconds"] += elapsed
+        self._batch_metrics["last_batch_seconds"] = elapsed
+        logger.debug(
+            f"Embedded batch of {len(batch)} texts in {elapsed:.3f}s"
+            f"{' (per-text fallback)' if fallback else ''}"
+        )
+        return list(embeddings)
+
+    async def _post_embed_batch(self, batch: List[str]) -> Optional[List[List[float]]]:
+        """Call /api/embed for a batch; None means the caller should fall back."""
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/api/embed",
+                json={"model": self.model, "input": batch},
+            )
+            if response.status_code == 404:
+                logger.info("Ollama /api/embed not available, using /api/embeddings per text")
+                self._batch_endpoint_supported = False
+                return None
+            response.raise_for_status()
+            embeddings = response.json()["embeddings"]
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"expected {len(batch)} embeddings, got {len(embeddings)}"
+                )
+            self._batch_endpoint_supported = True
+            return embeddings
+        except Exception as e:
+            logger.error(f"Failed to generate batch embeddings with Ollama: {e}")
+            return None
+
+    def get_batch_metrics(self) -> Dict[str, Any]:
+        """Return batch timing counters, including the mean seconds per batch."""
+        metrics = dict(self._batch_metrics)
+        metrics["avg_batch_seconds"] = (
+            metrics["total_seconds"] / metrics["batches"] if metrics["batches"] else 0.0
+        )
+        metrics["batch_endpoint_supported"] = self._batch_endpoint_supported
+        return metrics
+
 
 class OpenAIEmbeddingService:
     """OpenAI-based embedding service."""
@@ -76,22 +76,61 @@ class TestOllamaEmbeddingService:
 
     @pytest.mark.asyncio
     async def test_get_embeddings_multiple_texts(self):
-        """Test embedding generation for multiple texts."""
-        service = OllamaEmbeddingService()
-
-        mock_response = Mock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {"embedding": [0.1] * Config.VECTOR_SIZE}
+        """Test that multiple texts are embedded through /api/embed in batches."""
+        service = OllamaEmbeddingService(batch_size=2)
+
+        def _batch_response(url, json):
+            response = Mock()
+            response.status_code = 200
+            response.raise_for_status.return_value = None
+            response.json.return_value = {
+                "embeddings": [[0.1] * Config.VECTOR_SIZE for _ in json["input"]]
+            }
+            return response
 
         with patch.object(service.client, "post", new_callable=AsyncMock) as mock_post:
-            mock_post.return_value = mock_response
+            mock_post.side_effect = _batch_response
 
             texts = ["text 1", "text 2", "text 3"]
             results = await service.get_embeddings(texts)
 
             assert len(results) == 3
             assert all(len(result) == Config.VECTOR_SIZE for result in results)
-            assert mock_post.call_count == 3
+            assert mock_post.call_count == 2
+            assert all(
+                call.args[0] == f"{service.base_url}/api/embed"
+                for call in mock_post.call_args_list
+            )
+            assert service.get_batch_metrics()["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_embeddings_falls_back_without_batch_endpoint(self):
+        """Test per-text fallback when the server has no /api/embed."""
+        service = OllamaEmbeddingService()
+
+        not_found = Mock()
+        not_found.status_code = 404
+        single = Mock()
+        single.status_code = 200
+        single.raise_for_status.return_value = None
+        single.json.return_value = {"embedding": [0.1] * Config.VECTOR_SIZE}
+
+        with patch.object(service.client, "post", new_callable=AsyncMock) as mock_post:
+            mock_post.side_effect = lambda url, json: (
+                not_found if url.endswith("/api/embed") else single
+            )
+
+            first = await service.get_embeddings(["text 1", "text 2"])
+            second = await service.get_embeddings(["text 3"])
+
+            assert len(first) == 2 and len(second) == 1
+            # /api/embed is probed once, then skipped
+            embed_calls = [
+                call for call in mock_post.call_args_list
+                if call.args[0].endswith("/api/embed")
+            ]
+            assert len(embed_calls) == 1
+            assert mock_post.call_count == 4
 
 
 class TestOpenAIEmbeddingService:
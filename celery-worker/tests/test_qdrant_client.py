@@ -10,6 +10,7 @@ from src.clients.qdrant_client import (
     get_celery_qdrant_client,
 )
 from src.config import Config
+from qdrant_client.models import PointStruct
 
 
 class TestCeleryQdrantClient:
@@ -78,6 +79,37 @@ class TestCeleryQdrantClient:
         result = client.get_personal_collection_name("stoicism", "user-123")
         assert result == "stoicism_user-123_personal"
 
+    def test_get_personal_collection_name_shared_layout(self):
+        """Test that the shared layout uses one collection per tradition."""
+        client = CeleryQdrantClient(personal_layout="shared")
+
+        assert client.get_personal_collection_name("stoicism", "user-123") == "stoicism_personal"
+        assert client.get_personal_collection_name("stoicism", "user-456") == "stoicism_personal"
+
+    def test_invalid_personal_layout(self):
+        """Test that unknown layouts are rejected."""
+        with pytest.raises(ValueError):
+            CeleryQdrantClient(personal_layout="sharded")
+
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_shared_personal_collection_gets_user_id_index(self, mock_qdrant_base):
+        """Test that creating the shared personal collection indexes user_id."""
+        mock_client = Mock()
+        mock_collections_response = Mock()
+        mock_collections_response.collections = []
+        mock_client.get_collections.return_value = mock_collections_response
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient(personal_layout="shared")
+        result = await client.get_or_create_personal_collection("stoicism", "user-123")
+
+        assert result == "stoicism_personal"
+        mock_client.create_payload_index.assert_called_once()
+        call_args = mock_client.create_payload_index.call_args
+        assert call_args[1]["collection_name"] == "stoicism_personal"
+        assert call_args[1]["field_name"] == "user_id"
+
     @patch("src.clients.qdrant_client.QdrantClientBase")
     @pytest.mark.asyncio
     async def test_create_collection_new_collection(self, mock_qdrant_base):
@@ -122,6 +154,61 @@ class TestCeleryQdrantClient:
         assert result is True
         mock_client.create_collection.assert_not_called()
 
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_create_collection_uses_known_collections_cache(
+        self, mock_qdrant_base
+    ):
+        """Test that repeated existence checks do not list collections again."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_collection.name = "test_collection"
+        mock_collections_response = Mock()
+        mock_collections_response.collections = [mock_collection]
+        mock_client.get_collections.return_value = mock_collections_response
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        await client._create_collection("test_collection")
+        await client._create_collection("test_collection")
+
+        mock_client.get_collections.assert_called_once()
+
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_created_collection_is_cached(self, mock_qdrant_base):
+        """Test that a newly created collection is remembered."""
+        mock_client = Mock()
+        mock_collections_response = Mock()
+        mock_collections_response.collections = []
+        mock_client.get_collections.return_value = mock_collections_response
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        await client._create_collection("test_collection")
+        await client._create_collection("test_collection")
+
+        mock_client.get_collections.assert_called_once()
+        mock_client.create_collection.assert_called_once()
+
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_delete_collection_invalidates_cache(self, mock_qdrant_base):
+        """Test that deleting a collection forces the next check to hit Qdrant."""
+        mock_client = Mock()
+        mock_collections_response = Mock()
+        mock_collections_response.collections = []
+        mock_client.get_collections.return_value = mock_collections_response
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        await client._create_collection("test_collection")
+        await client.delete_collection("test_collection")
+        await client._create_collection("test_collection")
+
+        assert mock_client.get_collections.call_count == 2
+        assert mock_client.create_collection.call_count == 2
+
     @patch("src.clients.qdrant_client.QdrantClientBase")
     @pytest.mark.asyncio
     async def test_create_collection_error(self, mock_qdrant_base):
@@ -211,6 +298,36 @@ class TestCeleryQdrantClient:
                 assert metadata["user_id"] == "user-123"
                 assert metadata["entry_id"] == "entry-123"
 
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_index_personal_documents_single_upsert(self, mock_qdrant_base):
+        """Test that several personal documents are written in one upsert."""
+        mock_client = Mock()
+        mock_client.upsert.return_value = Mock(status="completed")
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+
+        with patch.object(
+            client, "get_or_create_personal_collection", new_callable=AsyncMock
+        ) as mock_get_collection:
+            mock_get_collection.return_value = "stoicism_user-123_personal"
+
+            result = await client.index_personal_documents(
+                tradition="stoicism",
+                user_id="user-123",
+                texts=["Entry 1", "Entry 2"],
+                embeddings=[[0.1] * Config.VECTOR_SIZE, [0.2] * Config.VECTOR_SIZE],
+                metadatas=[{"entry_id": "e1"}, {"entry_id": "e2"}],
+            )
+
+        assert len(result) == 2
+        mock_client.upsert.assert_called_once()
+        points = mock_client.upsert.call_args.kwargs["points"]
+        assert [point.payload["entry_id"] for point in points] == ["e1", "e2"]
+        assert all(point.payload["user_id"] == "user-123" for point in points)
+        assert all(point.payload["source_type"] == "journal" for point in points)
+
     @patch("src.clients.qdrant_client.QdrantClientBase")
     @pytest.mark.asyncio
     async def test_index_document(self, mock_qdrant_base):
@@ -290,6 +407,25 @@ class TestCeleryQdrantClient:
             assert points[0].payload["text"] == "Text 1"
             assert points[1].payload["text"] == "Text 2"
 
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_upsert_points_waits_only_on_last_batch(self, mock_qdrant_base):
+        """Test that bulk upserts are pipelined with a final waiting batch."""
+        mock_client = Mock()
+        mock_client.upsert.return_value = Mock(status="acknowledged")
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        points = [
+            PointStruct(id=str(uuid.uuid4()), vector=[0.1], payload={"text": f"t{i}"})
+            for i in range(5)
+        ]
+        await client.upsert_points("stoicism_knowledge", points, batch_size=2)
+
+        calls = mock_client.upsert.call_args_list
+        assert [len(call.kwargs["points"]) for call in calls] == [2, 2, 1]
+        assert [call.kwargs["wait"] for call in calls] == [False, False, True]
+
     @patch("src.clients.qdrant_client.QdrantClientBase")
     @pytest.mark.asyncio
     async def test_search_knowledge_base(self, mock_qdrant_base):
@@ -374,6 +510,84 @@ class TestCeleryQdrantClient:
         }
         assert result == expected
 
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_get_indexed_sources(self, mock_qdrant_base):
+        """Test that indexed sources are mapped to their stored content hash."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_collection.name = "stoicism_knowledge"
+        mock_client.get_collections.return_value = Mock(collections=[mock_collection])
+        mock_client.scroll.side_effect = [
+            (
+                [
+                    Mock(payload={"source": "a.pdf", "content_hash": "h1"}),
+                    Mock(payload={"source": "b.pdf", "content_hash": "h2"}),
+                ],
+                "next",
+            ),
+            (
+                [
+                    Mock(payload={"source": "a.pdf", "content_hash": "h1"}),
+                    Mock(payload={"source": "b.pdf"}),
+                ],
+                None,
+            ),
+        ]
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        result = await client.get_indexed_sources("stoicism_knowledge")
+
+        # b.pdf has an unhashed chunk, so it must be re-indexed
+        assert result == {"a.pdf": "h1", "b.pdf": None}
+        assert mock_client.scroll.call_count == 2
+        assert mock_client.scroll.call_args.kwargs["with_vectors"] is False
+        assert mock_client.scroll.call_args.kwargs["scroll_filter"] is None
+
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_get_indexed_sources_filtered_by_indexer(self, mock_qdrant_base):
+        """Test that only chunks written by the given indexer are scrolled."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_collection.name = "stoicism_knowledge"
+        mock_client.get_collections.return_value = Mock(collections=[mock_collection])
+        mock_client.scroll.return_value = (
+            [Mock(payload={"source": "stoicism/a.pdf", "content_hash": "h1"})],
+            None,
+        )
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        result = await client.get_indexed_sources(
+            "stoicism_knowledge", indexed_by="celery-worker"
+        )
+
+        assert result == {"stoicism/a.pdf": "h1"}
+        condition = mock_client.scroll.call_args.kwargs["scroll_filter"].must[0]
+        assert condition.key == "indexed_by"
+        assert condition.match.value == "celery-worker"
+
+    @patch("src.clients.qdrant_client.QdrantClientBase")
+    @pytest.mark.asyncio
+    async def test_delete_points_by_source(self, mock_qdrant_base):
+        """Test deleting the chunks of removed source documents."""
+        mock_client = Mock()
+        mock_qdrant_base.return_value = mock_client
+
+        client = CeleryQdrantClient()
+        assert await client.delete_points_by_source("stoicism_knowledge", []) is True
+        mock_client.delete.assert_not_called()
+
+        result = await client.delete_points_by_source("stoicism_knowledge", ["a.pdf"])
+
+        assert result is True
+        selector = mock_client.delete.call_args.kwargs["points_selector"]
+        condition = selector.filter.must[0]
+        assert condition.key == "source"
+        assert condition.match.any == ["a.pdf"]
+
 
 class TestSearchResult:
     """Test the SearchResult class."""
@@ -7,7 +7,7 @@ import os
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from mindmirror_cli.core.builder import QdrantKnowledgeBaseBuilder
@@ -32,14 +32,29 @@ def _set_environment(env: str) -> None:
         console.print(f"[blue]Using environment: {current_env}[/blue]")
 
 
+def _embedding_progress_callback(progress: Progress):
+    """Return a builder callback that renders one progress bar per tradition."""
+    tasks = {}
+
+    def _callback(tradition: str, completed: int, total: int) -> None:
+        if tradition not in tasks:
+            tasks[tradition] = progress.add_task(f"Embedding {tradition}", total=total)
+        progress.update(tasks[tradition], completed=completed)
+
+    return _callback
+
+
 @app.command()
 def build(
     tradition: Optional[str] = typer.Option(None, "--tradition", "-t", help="Specific tradition to build"),
     source_dirs: List[str] = typer.Option(["local_gcs_bucket", "pdfs"], "--source-dirs", "-s", help="Source directories"),
     clear_existing: bool = typer.Option(False, "--clear-existing", help="Clear existing knowledge base"),
+    incremental: bool = typer.Option(False, "--incremental", help="Only embed new or changed files and remove deleted ones"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
     env: str = typer.Option(None, "--env", "-e", help="Environment (local, live)"),
     embedding_model: str = typer.Option("text-embedding-3-small", "--embedding-model", help="Embedding model to use"),
+    batch_size: Optional[int] = typer.Option(None, "--batch-size", help="Chunks per embedding request (default: EMBEDDING_BATCH_SIZE or 64)"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", help="Embedding requests in flight (default: EMBEDDING_CONCURRENCY or 4)"),
 ):
     """Build knowledge base from documents."""
     _set_environment(env)
@@ -59,8 +74,20 @@ def build(
             console.print(f"Tradition: {tradition}")
         if clear_existing:
             console.print("[yellow]Clearing existing knowledge base[/yellow]")
+        elif incremental:
+            console.print("[blue]Incremental update: unchanged files are skipped[/blue]")
 
-        builder = QdrantKnowledgeBaseBuilder()
+        embedding_progress = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+        )
+        builder = QdrantKnowledgeBaseBuilder(
+            embedding_batch_size=batch_size,
+            embedding_concurrency=concurrency,
+            progress_callback=_embedding_progress_callback(embedding_progress),
+        )
 
         # Health check
         with Progress(
@@ -76,11 +103,13 @@ def build(
 
         # Build knowledge base
         try:
-            result = await builder.build_all_traditions(
-                source_dirs=source_dirs,
-                specific_tradition=tradition,
-                clear_existing=clear_existing,
-            )
+            with embedding_progress:
+                result = await builder.build_all_traditions(
+                    source_dirs=source_dirs,
+                    specific_tradition=tradition,
+                    clear_existing=clear_existing,
+                    incremental=incremental,
+                )
 
             # Display results
             table = Table(title="Knowledge Base Build Results")
@@ -120,9 +149,12 @@ def seed(
     tradition: Optional[str] = typer.Option(None, "--tradition", "-t", help="Specific tradition to seed"),
     source_dirs: List[str] = typer.Option(["local_gcs_bucket", "pdfs"], "--source-dirs", "-s", help="Source directories"),
     clear_existing: bool = typer.Option(False, "--clear-existing", help="Clear existing knowledge base"),
+    incremental: bool = typer.Option(False, "--incremental", help="Only embed new or changed files and remove deleted ones"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
     env: str = typer.Option("live", "--env", "-e", help="Environment (local, live)"),
     embedding_model: str = typer.Option("text-embedding-3-small", "--embedding-model", help="Embedding model to use"),
+    batch_size: Optional[int] = typer.Option(None, "--batch-size", help="Chunks per embedding request (default: EMBEDDING_BATCH_SIZE or 64)"),
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", help="Embedding requests in flight (default: EMBEDDING_CONCURRENCY or 4)"),
 ):
     """Seed live knowledge base from documents."""
     _set_environment(env)
@@ -142,8 +174,20 @@ def seed(
             console.print(f"Tradition: {tradition}")
         if clear_existing:
             console.print("[yellow]Clearing existing knowledge base[/yellow]")
+        elif incremental:
+            console.print("[blue]Incremental update: unchanged files are skipped[/blue]")
 
-        builder = QdrantKnowledgeBaseBuilder()
+        embedding_progress = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+        )
+        builder = QdrantKnowledgeBaseBuilder(
+            embedding_batch_size=batch_size,
+            embedding_concurrency=concurrency,
+            progress_callback=_embedding_progress_callback(embedding_progress),
+        )
 
         # Health check
         with Progress(
@@ -159,11 +203,13 @@ def seed(
 
         # Seed knowledge base
         try:
-            result = await builder.build_all_traditions(
-                source_dirs=source_dirs,
-                specific_tradition=tradition,
-                clear_existing=clear_existing,
-            )
+            with embedding_progress:
+                result = await builder.build_all_traditions(
+                    source_dirs=source_dirs,
+                    specific_tradition=tradition,
+                    clear_existing=clear_existing,
+                    incremental=incremental,
+                )
 
             # Display results
             table = Table(title="Knowledge Base Seed Results")
@@ -407,6 +453,89 @@ def delete_collection(
     asyncio.run(_delete())
 
 
+@app.command()
+def migrate_personal(
+    tradition: Optional[str] = typer.Option(None, "--tradition", "-t", help="Only migrate this tradition"),
+    batch_size: int = typer.Option(256, "--batch-size", "-b", help="Points copied per scroll/upsert batch"),
+    delete_source: bool = typer.Option(False, "--delete-source", help="Delete per-user collections after a verified copy"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only list the collections that would be migrated"),
+    env: str = typer.Option(None, "--env", "-e", help="Environment (local, live)"),
+):
+    """Move per-user personal collections into one shared collection per tradition.
+
+    Run with QDRANT_PERSONAL_LAYOUT=shared on the agent service and celery worker
+    once the migration has completed.
+    """
+    async def _migrate():
+        _set_environment(env)
+        console.print("[bold blue]Migrating Personal Collections[/bold blue]")
+
+        qdrant_client = QdrantClient()
+
+        # Health check
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Checking Qdrant connection...", total=None)
+            if not await qdrant_client.health_check():
+                console.print("[red]❌ Qdrant connection failed[/red]")
+                raise typer.Exit(1)
+            progress.update(task, description="✅ Qdrant connected")
+
+        sources = await qdrant_client.list_per_user_personal_collections(tradition)
+        if not sources:
+            console.print("📭 No per-user personal collections found")
+            return
+
+        table = Table(title="Personal Collection Migration")
+        table.add_column("Source", style="cyan")
+        table.add_column("Target", style="green")
+        table.add_column("Points", style="blue")
+        table.add_column("Status", style="yellow")
+
+        failures = 0
+        for source in sources:
+            target = qdrant_client.get_shared_personal_collection_name(source["tradition"])
+
+            if dry_run:
+                source_count = await qdrant_client.count_points(source["collection"])
+                table.add_row(source["collection"], target, str(source_count), "🔍 Dry run")
+                continue
+
+            try:
+                await qdrant_client.get_or_create_shared_personal_collection(source["tradition"])
+                source_count = await qdrant_client.count_points(source["collection"])
+                copied = await qdrant_client.migrate_personal_collection(
+                    source["collection"], target, source["user_id"], batch_size=batch_size
+                )
+                target_count = await qdrant_client.count_points(
+                    target, {"user_id": source["user_id"]}
+                )
+
+                if target_count < source_count:
+                    failures += 1
+                    status = f"❌ Verify failed ({target_count}/{source_count})"
+                elif delete_source:
+                    deleted = await qdrant_client.delete_collection(source["collection"])
+                    status = "✅ Migrated, source deleted" if deleted else "⚠️ Migrated, delete failed"
+                else:
+                    status = "✅ Migrated"
+                table.add_row(source["collection"], target, str(copied), status)
+            except Exception as e:
+                failures += 1
+                table.add_row(source["collection"], target, "Error", f"❌ {e}")
+
+        console.print(table)
+        if failures:
+            console.print(f"[red]❌ {failures}/{len(sources)} collections failed to migrate[/red]")
+            raise typer.Exit(1)
+        console.print(f"[green]✅ Processed {len(sources)} per-user collections[/green]")
+
+    asyncio.run(_migrate())
+
+
 @app.command()
 def create_index(
     field: str = typer.Argument(..., help="Field name to create index on"),
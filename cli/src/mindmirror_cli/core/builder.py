@@ -1,23 +1,39 @@
 """Qdrant-based knowledge base builder for MindMirror CLI."""
 
 import asyncio
+import hashlib
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_core.documents import Document
 
 from mindmirror_cli.core.client import QdrantClient
-from mindmirror_cli.core.embedding import get_embedding
+from mindmirror_cli.core.embedding import (
+    DEFAULT_EMBEDDING_BATCH_SIZE,
+    DEFAULT_EMBEDDING_CONCURRENCY,
+    embed_in_batches,
+)
 from mindmirror_cli.core.tradition_loader import create_tradition_loader, TraditionLoader
 from mindmirror_cli.core.utils import get_qdrant_url, get_qdrant_api_key
 
 logger = logging.getLogger(__name__)
 
+SOURCE_FILE_PATTERNS = ("*.pdf", "*.txt")
+
+
+def compute_file_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 
 class QdrantKnowledgeBaseBuilder:
     """
@@ -27,13 +43,31 @@ class QdrantKnowledgeBaseBuilder:
     robust error handling with progress reporting.
     """
 
-    def __init__(self, qdrant_client: Optional[QdrantClient] = None, tradition_loader: TraditionLoader = None):
+    def __init__(
+        self,
+        qdrant_client: Optional[QdrantClient] = None,
+        tradition_loader: TraditionLoader = None,
+        embedding_batch_size: Optional[int] = None,
+        embedding_concurrency: Optional[int] = None,
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+    ):
         self.qdrant_client = qdrant_client or QdrantClient()
         self.tradition_loader = tradition_loader or create_tradition_loader()
         
         # Get chunking configuration from environment
         chunk_size = int(os.getenv("CHUNK_SIZE", "1000"))
         chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "200"))
+
+        # Embedding pipeline configuration: chunks per provider call and
+        # how many calls may be in flight at once
+        self.embedding_batch_size = embedding_batch_size or int(
+            os.getenv("EMBEDDING_BATCH_SIZE", str(DEFAULT_EMBEDDING_BATCH_SIZE))
+        )
+        self.embedding_concurrency = embedding_concurrency or int(
+            os.getenv("EMBEDDING_CONCURRENCY", str(DEFAULT_EMBEDDING_CONCURRENCY))
+        )
+        # Called as (tradition, embedded_chunks, total_chunks) while embedding
+        self.progress_callback = progress_callback
         
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
@@ -104,29 +138,54 @@ class QdrantKnowledgeBaseBuilder:
         
         return traditions
 
-    async def load_documents_from_directory(self, directory: Path) -> List[Document]:
+    def list_source_files(self, directory: Path) -> List[Path]:
+        """List the documents in a directory that the builder knows how to load."""
+        files: List[Path] = []
+        for pattern in SOURCE_FILE_PATTERNS:
+            files.extend(sorted(directory.glob(pattern)))
+        return files
+
+    async def load_documents_from_directory(
+        self, directory: Path, file_hashes: Optional[Dict[str, str]] = None
+    ) -> List[Document]:
         """
         Load and chunk documents from a directory.
 
         Args:
             directory: Path to directory containing documents
+            file_hashes: If given, only files named here are loaded, and the
+                hash is stored on their chunks instead of being recomputed
 
         Returns:
             List of chunked Document objects
         """
         documents = []
+        selected = [
+            f for f in self.list_source_files(directory)
+            if file_hashes is None or f.name in file_hashes
+        ]
+
+        def _content_hash(path: Path) -> str:
+            if file_hashes is not None:
+                return file_hashes[path.name]
+            return compute_file_hash(path)
 
         # Process PDF files
-        for pdf_file in directory.glob("*.pdf"):
+        for pdf_file in (f for f in selected if f.suffix == ".pdf"):
             try:
                 logger.info(f"Loading PDF: {pdf_file.name}")
+                content_hash = _content_hash(pdf_file)
                 loader = PyPDFLoader(str(pdf_file))
                 pdf_docs = loader.load_and_split(self.text_splitter)
 
                 # Add file metadata
                 for doc in pdf_docs:
                     doc.metadata.update(
-                        {"source_id": pdf_file.name, "file_type": "pdf"}
+                        {
+                            "source_id": pdf_file.name,
+                            "file_type": "pdf",
+                            "content_hash": content_hash,
+                        }
                     )
 
                 documents.extend(pdf_docs)
@@ -138,9 +197,10 @@ class QdrantKnowledgeBaseBuilder:
                 continue
 
         # Process text files
-        for txt_file in directory.glob("*.txt"):
+        for txt_file in (f for f in selected if f.suffix == ".txt"):
             try:
                 logger.info(f"Loading text file: {txt_file.name}")
+                content_hash = _content_hash(txt_file)
                 loader = TextLoader(str(txt_file), encoding="utf-8")
                 txt_docs = loader.load()
 
@@ -154,6 +214,7 @@ class QdrantKnowledgeBaseBuilder:
                             "source_id": txt_file.name,
                             "file_type": "txt",
                             "page": i + 1,  # Chunk number for text files
+                            "content_hash": content_hash,
                         }
                     )
 
@@ -165,11 +226,43 @@ class QdrantKnowledgeBaseBuilder:
                 self.stats["failed_files"] += 1
                 continue
 
-        self.stats["processed_files"] += len(
-            [f for f in directory.glob("*.pdf")]
-        ) + len([f for f in directory.glob("*.txt")])
+        self.stats["processed_files"] += len(selected)
         return documents
 
+    async def plan_incremental_update(
+        self, tradition: str, source_dirs: List[Path]
+    ) -> Dict[str, Any]:
+        """
+        Compare the files on disk with what is indexed for a tradition.
+
+        Returns a plan with the hashes of files that need (re-)embedding per
+        directory, the source ids whose chunks must be deleted (changed or
+        removed files), and the number of files that are already up to date.
+        """
+        collection_name = self.qdrant_client.get_knowledge_collection_name(tradition)
+        indexed = await self.qdrant_client.get_indexed_sources(collection_name)
+
+        to_index: Dict[Path, Dict[str, str]] = {}
+        on_disk = set()
+        unchanged = 0
+        for source_dir in source_dirs:
+            for path in self.list_source_files(source_dir):
+                on_disk.add(path.name)
+                content_hash = compute_file_hash(path)
+                if indexed.get(path.name) == content_hash:
+                    unchanged += 1
+                    continue
+                to_index.setdefault(source_dir, {})[path.name] = content_hash
+
+        changed = [name for hashes in to_index.values() for name in hashes if name in indexed]
+        removed = [name for name in indexed if name not in on_disk]
+        return {
+            "to_index": to_index,
+            "changed": changed,
+            "removed": removed,
+            "unchanged": unchanged,
+        }
+
     def prepare_metadata(self, doc: Document, tradition: str) -> Dict[str, Any]:
         """
         Prepare enhanced metadata for Qdrant storage.
@@ -200,7 +293,11 @@ class QdrantKnowledgeBaseBuilder:
         return metadata
 
     async def build_tradition_knowledge_base(
-        self, tradition: str, source_dirs: List[Path], clear_existing: bool = False
+        self,
+        tradition: str,
+        source_dirs: List[Path],
+        clear_existing: bool = False,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """
         Build knowledge base for a specific tradition.
@@ -209,12 +306,23 @@ class QdrantKnowledgeBaseBuilder:
             tradition: Tradition name
             source_dirs: List of source directories for this tradition
             clear_existing: Whether to clear existing collection
+            incremental: Only embed new or changed files and drop chunks of
+                removed ones, using the content hash stored on each chunk
 
         Returns:
             Build statistics
         """
         logger.info(f"🏗️  Building knowledge base for tradition: {tradition}")
 
+        plan = None
+        if incremental and not clear_existing:
+            plan = await self.plan_incremental_update(tradition, source_dirs)
+            logger.info(
+                f"🔁 Incremental update for '{tradition}': "
+                f"{sum(len(h) for h in plan['to_index'].values())} to index, "
+                f"{len(plan['removed'])} removed, {plan['unchanged']} unchanged"
+            )
+
         # Clear existing collection if requested
         if clear_existing:
             collection_name = self.qdrant_client.get_knowledge_collection_name(
@@ -231,10 +339,34 @@ class QdrantKnowledgeBaseBuilder:
 
         # Load documents from all source directories
         all_documents = []
-        for source_dir in source_dirs:
-            logger.info(f"📁 Processing directory: {source_dir}")
-            docs = await self.load_documents_from_directory(source_dir)
-            all_documents.extend(docs)
+        if plan is None:
+            for source_dir in source_dirs:
+                logger.info(f"📁 Processing directory: {source_dir}")
+                docs = await self.load_documents_from_directory(source_dir)
+                all_documents.extend(docs)
+        else:
+            for source_dir, file_hashes in plan["to_index"].items():
+                logger.info(f"📁 Processing {len(file_hashes)} files in: {source_dir}")
+                docs = await self.load_documents_from_directory(source_dir, file_hashes)
+                all_documents.extend(docs)
+
+            collection_name = self.qdrant_client.get_knowledge_collection_name(tradition)
+            if plan["removed"]:
+                await self.qdrant_client.delete_points_by_source(
+                    collection_name, plan["removed"]
+                )
+
+            if not all_documents:
+                logger.info(f"✅ '{tradition}' is already up to date")
+                return {
+                    "tradition": tradition,
+                    "status": "success",
+                    "processed_chunks": 0,
+                    "processed_files": self.stats["processed_files"],
+                    "failed_files": self.stats["failed_files"],
+                    "unchanged_files": plan["unchanged"],
+                    "removed_files": len(plan["removed"]),
+                }
 
         if not all_documents:
             logger.warning(f"⚠️  No documents found for tradition '{tradition}'")
@@ -247,34 +379,47 @@ class QdrantKnowledgeBaseBuilder:
 
         logger.info(f"📄 Total documents loaded: {len(all_documents)} chunks")
 
+        # Embed all chunks in batches, several batches in flight at once
+        def _report_progress(completed: int, total: int) -> None:
+            logger.info(f"🧮 Embedded {completed}/{total} chunks for '{tradition}'")
+            if self.progress_callback:
+                self.progress_callback(tradition, completed, total)
+
+        chunk_embeddings = await embed_in_batches(
+            [doc.page_content for doc in all_documents],
+            batch_size=self.embedding_batch_size,
+            concurrency=self.embedding_concurrency,
+            progress_callback=_report_progress,
+        )
+
         # Prepare for batch indexing
         texts = []
         embeddings = []
         metadatas = []
 
-        for doc in all_documents:
-            try:
-                # Generate embedding
-                embedding = await get_embedding(doc.page_content)
-                if not embedding:
-                    logger.error(f"Failed to generate embedding for chunk")
-                    continue
+        # A file with any missing chunk is stored without its hash so the
+        # next incremental run picks it up again
+        incomplete_sources = {
+            doc.metadata.get("source_id")
+            for doc, embedding in zip(all_documents, chunk_embeddings)
+            if not embedding
+        }
 
-                # Debug: Log embedding dimensions
-                logger.info(f"Generated embedding with {len(embedding)} dimensions")
-                if len(embedding) != 768 and len(embedding) != 1536:
-                    logger.warning(f"Unexpected embedding dimension: {len(embedding)}")
+        for doc, embedding in zip(all_documents, chunk_embeddings):
+            if not embedding:
+                logger.error(f"Failed to generate embedding for chunk")
+                continue
 
-                # Prepare metadata
-                metadata = self.prepare_metadata(doc, tradition)
+            if len(embedding) != 768 and len(embedding) != 1536:
+                logger.warning(f"Unexpected embedding dimension: {len(embedding)}")
 
-                texts.append(doc.page_content)
-                embeddings.append(embedding)
-                metadatas.append(metadata)
+            metadata = self.prepare_metadata(doc, tradition)
+            if metadata["source_id"] in incomplete_sources:
+                metadata.pop("content_hash", None)
 
-            except Exception as e:
-                logger.error(f"Failed to process document chunk: {e}")
-                continue
+            texts.append(doc.page_content)
+            embeddings.append(embedding)
+            metadatas.append(metadata)
 
         if not texts:
             return {
@@ -287,6 +432,13 @@ class QdrantKnowledgeBaseBuilder:
         # Batch index to Qdrant
         logger.info(f"🚀 Indexing {len(texts)} chunks to Qdrant...")
         try:
+            if plan is not None and plan["changed"]:
+                # Old chunks of changed files go only once the new ones are embedded
+                await self.qdrant_client.delete_points_by_source(
+                    self.qdrant_client.get_knowledge_collection_name(tradition),
+                    plan["changed"],
+                )
+
             point_ids = await self.qdrant_client.index_knowledge_documents(
                 tradition=tradition,
                 texts=texts,
@@ -300,13 +452,17 @@ class QdrantKnowledgeBaseBuilder:
                 f"✅ Successfully indexed {len(point_ids)} chunks for '{tradition}'"
             )
 
-            return {
+            result = {
                 "tradition": tradition,
                 "status": "success",
                 "processed_chunks": len(point_ids),
                 "processed_files": self.stats["processed_files"],
                 "failed_files": self.stats["failed_files"],
             }
+            if plan is not None:
+                result["unchanged_files"] = plan["unchanged"]
+                result["removed_files"] = len(plan["removed"])
+            return result
 
         except Exception as e:
             logger.error(f"❌ Failed to index chunks for '{tradition}': {e}")
@@ -322,6 +478,7 @@ class QdrantKnowledgeBaseBuilder:
         source_dirs: List[str] = None,
         specific_tradition: str = None,
         clear_existing: bool = False,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """
         Build knowledge bases for all discovered traditions.
@@ -330,6 +487,7 @@ class QdrantKnowledgeBaseBuilder:
             source_dirs: List of base directories to scan
             specific_tradition: Build only this tradition if specified
             clear_existing: Whether to clear existing collections
+            incremental: Only re-embed new or changed files per tradition
 
         Returns:
             Overall build statistics
@@ -378,6 +536,7 @@ class QdrantKnowledgeBaseBuilder:
                     tradition=tradition,
                     source_dirs=source_dirs_list,
                     clear_existing=clear_existing,
+                    incremental=incremental,
                 )
                 results[tradition] = result
 
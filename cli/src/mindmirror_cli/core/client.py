@@ -2,21 +2,34 @@
 
 import logging
 import os
+import re
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from qdrant_client import QdrantClient as QdrantClientBase
 from qdrant_client.http.exceptions import ResponseHandlingException
-from qdrant_client.models import (Distance, FieldCondition, Filter, MatchValue,
-                                  PointStruct, Range, SearchRequest,
-                                  VectorParams, PayloadSchemaType)
+from qdrant_client.models import (Distance, FieldCondition, Filter,
+                                  FilterSelector, KeywordIndexParams,
+                                  KeywordIndexType, MatchAny, MatchValue,
+                                  Modifier, PointStruct, Range,
+                                  SearchRequest, SparseVector,
+                                  SparseVectorParams, VectorParams,
+                                  PayloadSchemaType)
+from shared.sparse_vectors import SPARSE_VECTOR_NAME, document_sparse_vector
 
 from .utils import get_qdrant_url, get_qdrant_api_key
 
 logger = logging.getLogger(__name__)
 
+# Per-user personal collections are named {tradition}_{user_id}_personal where
+# user_id is a UUID; the shared layout uses a single {tradition}_personal.
+PER_USER_PERSONAL_COLLECTION_RE = re.compile(
+    r"^(?P<tradition>.+)_(?P<user_id>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+    r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12})_personal$"
+)
+
 
 @dataclass
 class SearchResult:
@@ -34,8 +47,12 @@ class SearchResult:
 class QdrantClient:
     """Production-ready Qdrant client for vector operations."""
 
-    def __init__(self, url: str = None, api_key: str = None):
+    def __init__(self, url: str = None, api_key: str = None, personal_layout: str = None):
         """Initialize Qdrant client."""
+        self.personal_layout = personal_layout or os.getenv("QDRANT_PERSONAL_LAYOUT", "per_user")
+        if self.personal_layout not in ("per_user", "shared"):
+            raise ValueError(f"Unsupported personal layout: {self.personal_layout}")
+
         if url:
             self.url = url
         else:
@@ -58,6 +75,13 @@ class QdrantClient:
             self.client = QdrantClientBase(url=self.url)
             logger.info("Qdrant client initialized without authentication (local mode)")
 
+        # Names of collections known to exist, so indexing skips listing
+        # every collection on the server
+        self._known_collections: Set[str] = set()
+        # Whether each collection has the BM25 sparse vector used by the
+        # agent's keyword search (older collections lack it until rebuilt)
+        self._sparse_collections: Dict[str, bool] = {}
+
     async def health_check(self) -> bool:
         """Check if Qdrant is healthy and reachable."""
         try:
@@ -78,21 +102,75 @@ class QdrantClient:
 
     def get_personal_collection_name(self, tradition: str, user_id: str) -> str:
         """Get collection name for user's personal data (journals)."""
+        if self.personal_layout == "shared":
+            return self.get_shared_personal_collection_name(tradition)
         return f"{tradition}_{user_id}_personal"
 
+    def get_shared_personal_collection_name(self, tradition: str) -> str:
+        """Get the single per-tradition collection used by the shared personal layout."""
+        return f"{tradition}_personal"
+
     async def create_knowledge_collection(self, tradition: str) -> bool:
         """Create a shared collection for tradition's knowledge base (PDFs)."""
         collection_name = self.get_knowledge_collection_name(tradition)
         return await self._create_collection(collection_name)
 
+    async def _collection_exists(self, collection_name: str) -> bool:
+        """
+        Check whether a collection exists, consulting the known-collections cache.
+
+        On a cache miss the full listing is fetched once and used to refresh
+        the cache, so repeated checks for existing collections are O(1).
+        """
+        if collection_name in self._known_collections:
+            return True
+
+        return collection_name in await self.list_collections()
+
+    def invalidate_collection_cache(self, collection_name: Optional[str] = None) -> None:
+        """Forget one cached collection name, or all of them if none is given."""
+        if collection_name is None:
+            self._known_collections.clear()
+            self._sparse_collections.clear()
+        else:
+            self._known_collections.discard(collection_name)
+            self._sparse_collections.pop(collection_name, None)
+
+    def _supports_sparse(self, collection_name: str) -> bool:
+        """Check (once per collection) whether it stores BM25 sparse vectors."""
+        if collection_name not in self._sparse_collections:
+            try:
+                info = self.client.get_collection(collection_name=collection_name)
+            except Exception as e:
+                logger.debug(f"Could not inspect collection {collection_name}: {e}")
+                return False
+            sparse_vectors = info.config.params.sparse_vectors or {}
+            self._sparse_collections[collection_name] = (
+                SPARSE_VECTOR_NAME in sparse_vectors
+            )
+        return self._sparse_collections[collection_name]
+
+    @staticmethod
+    def _point_vector(text: str, embedding: List[float], sparse: bool) -> Any:
+        """Build a point's vector, adding the BM25 sparse vector if supported."""
+        if not sparse:
+            return embedding
+        indices, values = document_sparse_vector(text)
+        return {
+            "": embedding,
+            SPARSE_VECTOR_NAME: SparseVector(indices=indices, values=values),
+        }
+
     async def _create_collection(self, collection_name: str) -> bool:
-        """Internal method to create a collection with standard configuration."""
+        """
+        Internal method to create a collection with standard configuration.
+
+        New collections get a BM25 sparse vector next to the dense one, for
+        the agent's keyword search.
+        """
         try:
             # Check if collection already exists
-            collections = self.client.get_collections()
-            existing_names = [col.name for col in collections.collections]
-
-            if collection_name in existing_names:
+            if await self._collection_exists(collection_name):
                 logger.info(f"Collection {collection_name} already exists")
                 return True
 
@@ -106,7 +184,12 @@ class QdrantClient:
                 vectors_config=VectorParams(
                     size=vector_size, distance=Distance.COSINE
                 ),
+                sparse_vectors_config={
+                    SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+                },
             )
+            self._known_collections.add(collection_name)
+            self._sparse_collections[collection_name] = True
 
             logger.info(f"Created collection: {collection_name}")
             return True
@@ -115,6 +198,180 @@ class QdrantClient:
             logger.error(f"Failed to create collection {collection_name}: {e}")
             return False
 
+    async def get_or_create_shared_personal_collection(self, tradition: str) -> str:
+        """Ensure the shared personal collection exists with a tenant index on user_id."""
+        collection_name = self.get_shared_personal_collection_name(tradition)
+        if not await self._collection_exists(collection_name):
+            await self._create_collection(collection_name)
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="user_id",
+                field_schema=KeywordIndexParams(
+                    type=KeywordIndexType.KEYWORD, is_tenant=True
+                ),
+            )
+        return collection_name
+
+    async def list_per_user_personal_collections(
+        self, tradition: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """List per-user personal collections as {collection, tradition, user_id} dicts."""
+        matches = []
+        for name in await self.list_collections():
+            match = PER_USER_PERSONAL_COLLECTION_RE.match(name)
+            if not match:
+                continue
+            if tradition and match.group("tradition") != tradition:
+                continue
+            matches.append(
+                {
+                    "collection": name,
+                    "tradition": match.group("tradition"),
+                    "user_id": match.group("user_id"),
+                }
+            )
+        return matches
+
+    async def migrate_personal_collection(
+        self,
+        source_collection: str,
+        target_collection: str,
+        user_id: str,
+        batch_size: int = 256,
+    ) -> int:
+        """
+        Copy every point of a per-user collection into the shared personal collection.
+
+        Point ids and vectors are preserved, and user_id is stamped on every
+        payload so the shared collection can be filtered per user. Re-running
+        the migration is safe because upserts overwrite by point id.
+
+        Returns:
+            Number of points copied.
+        """
+        copied = 0
+        offset = None
+        # Points from collections created before keyword search gain their
+        # BM25 sparse vector on the way over
+        sparse = self._supports_sparse(target_collection)
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=source_collection,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if records:
+                points = [
+                    PointStruct(
+                        id=record.id,
+                        vector=(
+                            self._point_vector(
+                                (record.payload or {}).get("text", ""),
+                                record.vector,
+                                sparse,
+                            )
+                            if isinstance(record.vector, list)
+                            else record.vector
+                        ),
+                        payload={**(record.payload or {}), "user_id": user_id},
+                    )
+                    for record in records
+                ]
+                self.client.upsert(
+                    collection_name=target_collection, points=points, wait=True
+                )
+                copied += len(points)
+            if offset is None:
+                break
+
+        logger.info(f"Migrated {copied} points from {source_collection} to {target_collection}")
+        return copied
+
+    async def count_points(
+        self, collection_name: str, metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Count points in a collection, optionally restricted by exact-match payload filters."""
+        count_filter = None
+        if metadata_filter:
+            count_filter = Filter(
+                must=[
+                    FieldCondition(key=key, match=MatchValue(value=value))
+                    for key, value in metadata_filter.items()
+                ]
+            )
+        result = self.client.count(
+            collection_name=collection_name, count_filter=count_filter, exact=True
+        )
+        return result.count
+
+    async def get_indexed_sources(
+        self,
+        collection_name: str,
+        source_field: str = "source_id",
+        batch_size: int = 1024,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Map each indexed source document to the content hash stored on its chunks.
+
+        Only the source and content_hash payload fields are fetched, so this
+        stays cheap even for large collections. Sources indexed before hashes
+        were recorded map to None.
+        """
+        if not await self._collection_exists(collection_name):
+            return {}
+
+        sources: Dict[str, Optional[str]] = {}
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=[source_field, "content_hash"],
+                with_vectors=False,
+            )
+            for record in records:
+                payload = record.payload or {}
+                source = payload.get(source_field)
+                if source is None:
+                    continue
+                content_hash = payload.get("content_hash")
+                # A source with any unhashed chunk must be treated as stale
+                if source in sources and sources[source] != content_hash:
+                    sources[source] = None
+                else:
+                    sources[source] = content_hash
+            if offset is None:
+                break
+        return sources
+
+    async def delete_points_by_source(
+        self,
+        collection_name: str,
+        sources: List[str],
+        source_field: str = "source_id",
+    ) -> bool:
+        """Delete every chunk belonging to the given source documents."""
+        if not sources:
+            return True
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(
+                    filter=Filter(
+                        must=[FieldCondition(key=source_field, match=MatchAny(any=list(sources)))]
+                    )
+                ),
+                wait=True,
+            )
+            logger.info(f"Deleted chunks of {len(sources)} sources from {collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete sources from {collection_name}: {e}")
+            return False
+
     async def get_or_create_knowledge_collection(self, tradition: str) -> str:
         """
         Ensures a knowledge collection exists for a tradition and returns its name.
@@ -163,7 +420,11 @@ class QdrantClient:
             
             # Create point with embedding and metadata
             point = PointStruct(
-                id=point_id, vector=embedding, payload={"text": text, **metadata}
+                id=point_id,
+                vector=self._point_vector(
+                    text, embedding, self._supports_sparse(collection_name)
+                ),
+                payload={"text": text, **metadata},
             )
 
             # Upload point to collection
@@ -173,6 +434,8 @@ class QdrantClient:
             return point_id
 
         except Exception as e:
+            # The collection may have been deleted elsewhere; re-check next time
+            self.invalidate_collection_cache(collection_name)
             logger.error(f"Failed to index document in {collection_name}: {e}")
             raise
 
@@ -232,6 +495,7 @@ class QdrantClient:
         """Delete a collection."""
         try:
             self.client.delete_collection(collection_name=collection_name)
+            self.invalidate_collection_cache(collection_name)
             logger.info(f"Deleted collection: {collection_name}")
             return True
         except Exception as e:
@@ -242,7 +506,9 @@ class QdrantClient:
         """List all collections."""
         try:
             collections = self.client.get_collections()
-            return [col.name for col in collections.collections]
+            names = [col.name for col in collections.collections]
+            self._known_collections = set(names)
+            return names
         except Exception as e:
             logger.error(f"Failed to list collections: {e}")
             return []
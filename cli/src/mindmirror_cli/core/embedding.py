@@ -1,22 +1,26 @@
 """Embedding utilities for MindMirror CLI."""
 
+import asyncio
 import logging
 import os
-from typing import List
+import time
+from functools import lru_cache
+from typing import Callable, List, Optional
 
 from langchain_ollama import OllamaEmbeddings
 from langchain_openai import OpenAIEmbeddings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMBEDDING_BATCH_SIZE = 64
+DEFAULT_EMBEDDING_CONCURRENCY = 4
+DEFAULT_EMBEDDING_MAX_RETRIES = 3
 
-def get_embedding_model():
-    """Returns the embedding model based on the provider."""
-    provider = os.getenv("EMBEDDING_PROVIDER", "ollama")
-    
+
+@lru_cache(maxsize=8)
+def _build_embedding_model(provider: str, model: str, base_url: str):
+    """Build (once per configuration) the embedding model for a provider."""
     if provider == "ollama":
-        model = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
-        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         return OllamaEmbeddings(model=model, base_url=base_url)
     else:
         # OpenAI fallback
@@ -26,6 +30,23 @@ def get_embedding_model():
         return OpenAIEmbeddings()
 
 
+def get_embedding_model():
+    """Returns the embedding model based on the provider.
+
+    Models are reused across calls for the same configuration so their HTTP
+    clients and connections are not rebuilt for every chunk.
+    """
+    provider = os.getenv("EMBEDDING_PROVIDER", "ollama")
+
+    if provider == "ollama":
+        model = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
+        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    else:
+        model = os.getenv("EMBEDDING_MODEL", "")
+        base_url = ""
+    return _build_embedding_model(provider, model, base_url)
+
+
 async def get_embedding(text: str) -> List[float]:
     """Generates an embedding for a single piece of text."""
     try:
@@ -43,4 +64,82 @@ async def get_embeddings(texts: List[str]) -> List[List[float]]:
         return await embedding_model.aembed_documents(texts)
     except Exception as e:
         logger.error(f"Failed to generate embeddings: {e}")
-        return [] 
\ No newline at end of file
+        return []
+
+
+async def embed_in_batches(
+    texts: List[str],
+    batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+    max_retries: int = DEFAULT_EMBEDDING_MAX_RETRIES,
+    retry_delay: float = 1.0,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> List[Optional[List[float]]]:
+    """
+    Embed many texts in fixed-size batches with bounded concurrency.
+
+    Each batch is one provider call and is retried with exponential backoff.
+    A batch that still fails after max_retries yields None for each of its
+    texts so callers can skip those chunks without aborting the whole build.
+
+    Args:
+        texts: Texts to embed
+        batch_size: Number of texts sent per provider call
+        concurrency: Maximum number of batches in flight at once
+        max_retries: Attempts per batch before giving up on it
+        retry_delay: Initial backoff between attempts, doubled each retry
+        progress_callback: Called as (completed_texts, total_texts) after each batch
+
+    Returns:
+        Embeddings aligned with the input texts (None where a batch failed)
+    """
+    if not texts:
+        return []
+
+    embedding_model = get_embedding_model()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    total = len(texts)
+    completed = 0
+
+    async def _embed_batch(start: int) -> None:
+        nonlocal completed
+        batch = texts[start : start + batch_size]
+
+        for attempt in range(1, max_retries + 1):
+            started_at = time.perf_counter()
+            try:
+                # Hold a concurrency slot only for the provider call, not the backoff
+                async with semaphore:
+                    vectors = await embedding_model.aembed_documents(batch)
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Expected {len(batch)} embeddings, got {len(vectors)}"
+                    )
+                results[start : start + len(batch)] = vectors
+                logger.debug(
+                    f"Embedded batch at {start} ({len(batch)} texts) in "
+                    f"{time.perf_counter() - started_at:.2f}s"
+                )
+                break
+            except Exception as e:
+                if attempt == max_retries:
+                    logger.error(
+                        f"Failed to embed batch at {start} after {attempt} attempts: {e}"
+                    )
+                    break
+                delay = retry_delay * (2 ** (attempt - 1))
+                logger.warning(
+                    f"Embedding batch at {start} failed (attempt {attempt}/{max_retries}): "
+                    f"{e}. Retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        completed += len(batch)
+        if progress_callback:
+            progress_callback(completed, total)
+
+    await asyncio.gather(
+        *(_embed_batch(start) for start in range(0, total, max(1, batch_size)))
+    )
+    return results
@@ -0,0 +1,75 @@
+"""unique indexes for ON CONFLICT event upserts
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 10:00:00
+
+Habit and lesson event upserts become single INSERT ... ON CONFLICT statements,
+which need a unique index on (user_id, template_id, date) for events without a
+program assignment. uq_habit_event_uniqueness cannot serve as the conflict target
+because NULL program_assignment_id values never conflict.
+
+Duplicates left behind by the old select-then-insert race are removed first,
+keeping the newest habit response and the most advanced lesson event.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM habits.habit_events e
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, habit_template_id, date
+                ORDER BY created_at DESC, id DESC
+            ) AS rn
+            FROM habits.habit_events
+            WHERE program_assignment_id IS NULL
+        ) d
+        WHERE e.id = d.id AND d.rn > 1
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM habits.lesson_events e
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, lesson_template_id, date
+                ORDER BY (event_type = 'completed') DESC, created_at DESC, id DESC
+            ) AS rn
+            FROM habits.lesson_events
+            WHERE program_assignment_id IS NULL
+        ) d
+        WHERE e.id = d.id AND d.rn > 1
+        """
+    )
+
+    op.create_index(
+        'uq_habit_event_unassigned',
+        'habit_events',
+        ['user_id', 'habit_template_id', 'date'],
+        unique=True,
+        schema='habits',
+        postgresql_where=sa.text('program_assignment_id IS NULL'),
+    )
+    op.create_index(
+        'uq_lesson_event_unassigned',
+        'lesson_events',
+        ['user_id', 'lesson_template_id', 'date'],
+        unique=True,
+        schema='habits',
+        postgresql_where=sa.text('program_assignment_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_lesson_event_unassigned', table_name='lesson_events', schema='habits')
+    op.drop_index('uq_habit_event_unassigned', table_name='habit_events', schema='habits')
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import Select, and_, select
+from sqlalchemy import Select, and_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from habits.app.db.tables import (
@@ -162,4 +162,121 @@ class HabitsReadRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    # --- Set-based helpers (one query per call regardless of input size) ---
+    async def get_program_steps_for_programs(self, program_template_ids: Iterable[str]) -> Dict[str, List[ProgramStepTemplate]]:
+        """Steps of several programs, grouped by program id and ordered by sequence."""
+        ids = list(dict.fromkeys(program_template_ids))
+        steps_by_program: Dict[str, List[ProgramStepTemplate]] = {pid: [] for pid in ids}
+        if not ids:
+            return steps_by_program
+        stmt: Select = (
+            select(ProgramStepTemplate)
+            .where(ProgramStepTemplate.program_template_id.in_(ids))
+            .order_by(ProgramStepTemplate.program_template_id, ProgramStepTemplate.sequence_index.asc())
+        )
+        result = await self.session.execute(stmt)
+        for step in result.scalars().all():
+            steps_by_program.setdefault(str(step.program_template_id), []).append(step)
+        return steps_by_program
+
+    async def get_program_templates(self, program_template_ids: Iterable[str]) -> List[ProgramTemplate]:
+        ids = list(dict.fromkeys(program_template_ids))
+        if not ids:
+            return []
+        stmt: Select = select(ProgramTemplate).where(ProgramTemplate.id.in_(ids))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_habit_templates(self, habit_template_ids: Iterable[str]) -> List[HabitTemplate]:
+        ids = list(dict.fromkeys(habit_template_ids))
+        if not ids:
+            return []
+        stmt: Select = select(HabitTemplate).where(HabitTemplate.id.in_(ids))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_step_daily_plans_for_days(self, step_days: Iterable[Tuple[str, int]]) -> List[StepDailyPlan]:
+        """Daily plans for several (step id, day index) pairs."""
+        pairs = list(dict.fromkeys(step_days))
+        if not pairs:
+            return []
+        stmt: Select = select(StepDailyPlan).where(
+            tuple_(StepDailyPlan.program_step_template_id, StepDailyPlan.day_index).in_(pairs)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_step_lessons_for_steps(self, step_ids: Iterable[str]) -> List[StepLessonTemplate]:
+        """Lesson mappings of several steps, ordered by step and day."""
+        ids = list(dict.fromkeys(step_ids))
+        if not ids:
+            return []
+        stmt: Select = (
+            select(StepLessonTemplate)
+            .where(StepLessonTemplate.program_step_template_id.in_(ids))
+            .order_by(StepLessonTemplate.program_step_template_id, StepLessonTemplate.day_index.asc())
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_lesson_segments(self, segment_ids: Iterable[str]) -> List[LessonSegment]:
+        ids = list(dict.fromkeys(segment_ids))
+        if not ids:
+            return []
+        stmt: Select = select(LessonSegment).where(LessonSegment.id.in_(ids))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def list_lesson_segments_by_lessons(self, lesson_template_ids: Iterable[str]) -> Dict[str, List[LessonSegment]]:
+        """Segments of several lessons, grouped by lesson id in day order."""
+        ids = list(dict.fromkeys(lesson_template_ids))
+        segments_by_lesson: Dict[str, List[LessonSegment]] = {lid: [] for lid in ids}
+        if not ids:
+            return segments_by_lesson
+        stmt: Select = (
+            select(LessonSegment)
+            .where(LessonSegment.lesson_template_id.in_(ids))
+            .order_by(LessonSegment.day_index_within_step.asc())
+        )
+        result = await self.session.execute(stmt)
+        for segment in result.scalars().all():
+            segments_by_lesson.setdefault(str(segment.lesson_template_id), []).append(segment)
+        return segments_by_lesson
+
+    async def find_habit_events_in_range(self, user_id: str, habit_template_id: str, start: date, end: date) -> List[HabitEvent]:
+        """A user's events for one habit between start and end (inclusive), oldest first."""
+        stmt: Select = (
+            select(HabitEvent)
+            .where(
+                and_(
+                    HabitEvent.user_id == user_id,
+                    HabitEvent.habit_template_id == habit_template_id,
+                    HabitEvent.date >= start,
+                    HabitEvent.date <= end,
+                )
+            )
+            .order_by(HabitEvent.date.asc(), HabitEvent.created_at.asc())
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def find_habit_events_for_user_dates(self, user_dates: Iterable[Tuple[str, date]]) -> List[HabitEvent]:
+        """All habit events for several (user id, date) pairs."""
+        pairs = list(dict.fromkeys(user_dates))
+        if not pairs:
+            return []
+        stmt: Select = select(HabitEvent).where(tuple_(HabitEvent.user_id, HabitEvent.date).in_(pairs))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def find_habit_events_for_date(self, user_id: str, habit_template_ids: Iterable[str], on_date: date) -> List[HabitEvent]:
+        ids = list(dict.fromkeys(habit_template_ids))
+        if not ids:
+            return []
+        stmt: Select = select(HabitEvent).where(
+            and_(HabitEvent.user_id == user_id, HabitEvent.habit_template_id.in_(ids), HabitEvent.date == on_date)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
 
@@ -2,18 +2,37 @@ from __future__ import annotations
 
 import uuid
 from datetime import date
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
-from sqlalchemy import and_, select
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from habits.app.db.tables import HabitEvent, LessonEvent
 
 
+# (habit_template_id, date, response) as sent by the mobile app's offline sync
+HabitResponse = Tuple[str, date, str]
+
+
 class HabitEventRepository:
+    """Habit event writes as single INSERT ... ON CONFLICT DO UPDATE statements.
+
+    The conflict target is the uq_habit_event_unassigned partial index, so concurrent taps for the
+    same habit and day update one row instead of racing into a unique-constraint error.
+    """
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def _upsert_statement(self, rows: list[dict]):
+        stmt = pg_insert(HabitEvent).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[HabitEvent.user_id, HabitEvent.habit_template_id, HabitEvent.date],
+            index_where=HabitEvent.program_assignment_id.is_(None),
+            set_={"response": stmt.excluded.response, "source": stmt.excluded.source},
+        ).returning(HabitEvent)
+
     async def upsert(
         self,
         *,
@@ -23,32 +42,48 @@ class HabitEventRepository:
         response: str,
         source: Optional[str] = None,
     ) -> HabitEvent:
-        hid = uuid.UUID(str(habit_template_id))
+        row = {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "habit_template_id": uuid.UUID(str(habit_template_id)),
+            "date": on_date,
+            "response": response,
+            "source": source,
+        }
         res = await self.session.execute(
-            select(HabitEvent).where(
-                and_(
-                    HabitEvent.user_id == user_id,
-                    HabitEvent.habit_template_id == hid,
-                    HabitEvent.date == on_date,
-                )
-            )
+            self._upsert_statement([row]), execution_options={"populate_existing": True}
         )
-        existing = res.scalars().first()
-        if existing:
-            existing.response = response
-            existing.source = source
-            await self.session.flush()
-            return existing
-        obj = HabitEvent(
-            user_id=user_id,
-            habit_template_id=hid,
-            date=on_date,
-            response=response,
-            source=source,
+        return res.scalars().one()
+
+    async def bulk_upsert(
+        self,
+        *,
+        user_id: str,
+        responses: Iterable[HabitResponse],
+        source: Optional[str] = None,
+    ) -> list[HabitEvent]:
+        """Upsert many responses in one statement.
+
+        A statement may not update the same row twice, so for repeated (habit, date) pairs only the
+        last response in the batch is written.
+        """
+        rows: dict[tuple[uuid.UUID, date], dict] = {}
+        for habit_template_id, on_date, response in responses:
+            hid = uuid.UUID(str(habit_template_id))
+            rows[(hid, on_date)] = {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "habit_template_id": hid,
+                "date": on_date,
+                "response": response,
+                "source": source,
+            }
+        if not rows:
+            return []
+        res = await self.session.execute(
+            self._upsert_statement(list(rows.values())), execution_options={"populate_existing": True}
         )
-        self.session.add(obj)
-        await self.session.flush()
-        return obj
+        return list(res.scalars().all())
 
 
 class LessonEventRepository:
@@ -63,31 +98,19 @@ class LessonEventRepository:
         on_date: date,
         event_type: str,  # opened|completed
     ) -> LessonEvent:
-        lid = uuid.UUID(str(lesson_template_id))
-        res = await self.session.execute(
-            select(LessonEvent).where(
-                and_(
-                    LessonEvent.user_id == user_id,
-                    LessonEvent.lesson_template_id == lid,
-                    LessonEvent.date == on_date,
-                )
-            )
-        )
-        existing = res.scalars().first()
-        if existing:
-            # Promote state if needed (opened -> completed), else set provided
-            if existing.event_type != "completed":
-                existing.event_type = event_type
-            await self.session.flush()
-            return existing
-        obj = LessonEvent(
+        stmt = pg_insert(LessonEvent).values(
+            id=uuid.uuid4(),
             user_id=user_id,
-            lesson_template_id=lid,
+            lesson_template_id=uuid.UUID(str(lesson_template_id)),
             date=on_date,
             event_type=event_type,
         )
-        self.session.add(obj)
-        await self.session.flush()
-        return obj
-
-
+        # Promote state if needed (opened -> completed), never demote a completed lesson
+        current = LessonEvent.__table__.c.event_type
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LessonEvent.user_id, LessonEvent.lesson_template_id, LessonEvent.date],
+            index_where=LessonEvent.program_assignment_id.is_(None),
+            set_={"event_type": case((current == "completed", current), else_=stmt.excluded.event_type)},
+        ).returning(LessonEvent)
+        res = await self.session.execute(stmt, execution_options={"populate_existing": True})
+        return res.scalars().one()
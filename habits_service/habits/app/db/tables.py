@@ -14,6 +14,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -191,6 +192,15 @@ class HabitEvent(Base):
         UniqueConstraint(
             "user_id", "habit_template_id", "date", "program_assignment_id", name="uq_habit_event_uniqueness"
         ),
+        # NULLs are distinct in the constraint above; this is the ON CONFLICT target for unassigned events
+        Index(
+            "uq_habit_event_unassigned",
+            "user_id",
+            "habit_template_id",
+            "date",
+            unique=True,
+            postgresql_where=text("program_assignment_id IS NULL"),
+        ),
     )
 
 
@@ -209,6 +219,17 @@ class LessonEvent(Base):
     event_type = Column(String, nullable=False)  # opened|completed
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index(
+            "uq_lesson_event_unassigned",
+            "user_id",
+            "lesson_template_id",
+            "date",
+            unique=True,
+            postgresql_where=text("program_assignment_id IS NULL"),
+        ),
+    )
+
 
 class JournalTaskEvent(Base):
     __tablename__ = "journal_task_events"
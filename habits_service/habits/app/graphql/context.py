@@ -4,6 +4,7 @@ from shared.auth import CurrentUser
 from shared.data_models import UserRole
 from strawberry.types import Info
 from habits.app.config import get_settings
+from habits.app.graphql.loaders import HabitsLoaders
 
 
 GraphQLContext = Dict[str, Any]
@@ -28,7 +29,7 @@ async def get_context(
             roles=[UserRole(role="user", domain="habits")],
         )
 
-    return {"current_user": user, "request": request}
+    return {"current_user": user, "request": request, "loaders": HabitsLoaders.create()}
 
 
 def get_current_user_from_context(info: Info[GraphQLContext, None]) -> CurrentUser:
@@ -38,3 +39,12 @@ def get_current_user_from_context(info: Info[GraphQLContext, None]) -> CurrentUs
     return user
 
 
+def get_loaders_from_context(info: Info[GraphQLContext, None]) -> HabitsLoaders:
+    loaders = info.context.get("loaders")
+    if loaders is None:
+        # Contexts built outside get_context (e.g. direct schema execution) get loaders on first use
+        loaders = HabitsLoaders.create()
+        info.context["loaders"] = loaders
+    return loaders
+
+
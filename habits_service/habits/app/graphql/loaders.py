@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from strawberry.dataloader import DataLoader
+
+from habits.app.db.repositories import HabitsReadRepository
+from habits.app.db.tables import HabitEvent, HabitTemplate, LessonSegment, LessonTemplate, ProgramStepTemplate
+from habits.app.db.uow import UnitOfWork
+
+
+UserDate = Tuple[str, date]
+
+
+async def _load_program_steps(program_ids: List[str]) -> List[List[ProgramStepTemplate]]:
+    async with UnitOfWork() as uow:
+        steps_by_program = await HabitsReadRepository(uow.session).get_program_steps_for_programs(program_ids)
+    return [steps_by_program.get(pid, []) for pid in program_ids]
+
+
+async def _load_habit_templates(habit_ids: List[str]) -> List[Optional[HabitTemplate]]:
+    async with UnitOfWork() as uow:
+        rows = await HabitsReadRepository(uow.session).get_habit_templates(habit_ids)
+    by_id = {str(r.id): r for r in rows}
+    return [by_id.get(hid) for hid in habit_ids]
+
+
+async def _load_lesson_templates(lesson_ids: List[str]) -> List[Optional[LessonTemplate]]:
+    async with UnitOfWork() as uow:
+        rows = await HabitsReadRepository(uow.session).get_lesson_templates(list(lesson_ids))
+    by_id = {str(r.id): r for r in rows}
+    return [by_id.get(lid) for lid in lesson_ids]
+
+
+async def _load_segments_by_lesson(lesson_ids: List[str]) -> List[List[LessonSegment]]:
+    async with UnitOfWork() as uow:
+        segments_by_lesson = await HabitsReadRepository(uow.session).list_lesson_segments_by_lessons(lesson_ids)
+    return [segments_by_lesson.get(lid, []) for lid in lesson_ids]
+
+
+async def _load_habit_events(user_dates: List[UserDate]) -> List[List[HabitEvent]]:
+    async with UnitOfWork() as uow:
+        rows = await HabitsReadRepository(uow.session).find_habit_events_for_user_dates(user_dates)
+    by_key: Dict[UserDate, List[HabitEvent]] = {}
+    for ev in rows:
+        by_key.setdefault((ev.user_id, ev.date), []).append(ev)
+    return [by_key.get(key, []) for key in user_dates]
+
+
+@dataclass
+class HabitsLoaders:
+    """Request-scoped DataLoaders.
+
+    Loads issued while resolving one GraphQL operation are coalesced into a single IN-list query
+    per loader, and repeated keys are served from the loader's cache. Each batch runs in its own
+    short UnitOfWork so loaders never share a session with the resolver that awaits them.
+    """
+
+    program_steps: DataLoader[str, List[ProgramStepTemplate]]
+    habit_templates: DataLoader[str, Optional[HabitTemplate]]
+    lesson_templates: DataLoader[str, Optional[LessonTemplate]]
+    segments_by_lesson: DataLoader[str, List[LessonSegment]]
+    habit_events: DataLoader[UserDate, List[HabitEvent]]
+
+    @classmethod
+    def create(cls) -> "HabitsLoaders":
+        return cls(
+            program_steps=DataLoader(load_fn=_load_program_steps),
+            habit_templates=DataLoader(load_fn=_load_habit_templates),
+            lesson_templates=DataLoader(load_fn=_load_lesson_templates),
+            segments_by_lesson=DataLoader(load_fn=_load_segments_by_lesson),
+            habit_events=DataLoader(load_fn=_load_habit_events),
+        )
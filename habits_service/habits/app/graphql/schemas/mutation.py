@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import strawberry
 from strawberry.types import Info
-from habits.app.graphql.context import get_current_user_from_context
+from habits.app.graphql.context import get_current_user_from_context, get_loaders_from_context
 from datetime import date
 from typing import Optional, List
 
@@ -112,6 +112,13 @@ class StepDayPlanInput:
     lessonSegmentId: Optional[str] = None
 
 
+@strawberry.input
+class HabitResponseInput:
+    habitTemplateId: str
+    onDate: date
+    response: str
+
+
 @strawberry.input
 class LessonSegmentInput:
     lessonTemplateId: str
@@ -225,8 +232,26 @@ class Mutation:
             current_user = get_current_user_from_context(info)
             await repo.upsert(user_id=str(current_user.id), habit_template_id=habitTemplateId, on_date=onDate, response=response)
             await uow.session.commit()
+            # Later fields of this operation must see the new response
+            get_loaders_from_context(info).habit_events.clear((str(current_user.id), onDate))
             return True
 
+    @strawberry.mutation
+    async def recordHabitResponses(self, responses: List[HabitResponseInput], info: Info) -> int:
+        """Record a batch of habit responses (offline sync) in one statement; returns rows written."""
+        current_user = get_current_user_from_context(info)
+        async with UnitOfWork() as uow:
+            repo = HabitEventRepository(uow.session)
+            events = await repo.bulk_upsert(
+                user_id=str(current_user.id),
+                responses=[(r.habitTemplateId, r.onDate, r.response) for r in responses or []],
+            )
+            await uow.session.commit()
+        loaders = get_loaders_from_context(info)
+        for on_date in {r.onDate for r in responses or []}:
+            loaders.habit_events.clear((str(current_user.id), on_date))
+        return len(events)
+
     @strawberry.mutation
     async def recordLessonOpened(self, lessonTemplateId: str, onDate: date, info: Info) -> bool:
         async with UnitOfWork() as uow:
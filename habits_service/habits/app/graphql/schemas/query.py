@@ -6,8 +6,9 @@ from datetime import timedelta
 
 from habits.app.db.uow import UnitOfWork
 from habits.app.db.repositories import HabitsReadRepository
+from habits.app.services.habit_stats import compute_habit_stats, load_habit_days
 from habits.app.services.planner import (
-    plan_daily_tasks,
+    plan_daily_tasks_batched,
     HabitTask as PHabitTask,
     LessonTask as PLessonTask,
     JournalTask as PJournalTask,
@@ -20,7 +21,7 @@ from .task_types import (
     TaskType as GTaskType,
     TaskStatus as GTaskStatus,
 )
-from habits.app.graphql.context import get_current_user_from_context
+from habits.app.graphql.context import get_current_user_from_context, get_loaders_from_context
 
 
 # Top-level GraphQL types to avoid unresolved nested type issues
@@ -75,9 +76,10 @@ class Query:
     @strawberry.field
     async def todaysTasks(self, info: Info, onDate: date) -> List[Task]:
         current_user = get_current_user_from_context(info)
+        loaders = get_loaders_from_context(info)
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
-            planned = await plan_daily_tasks(str(current_user.id), onDate, repo)
+            planned = await plan_daily_tasks_batched(str(current_user.id), onDate, repo, loaders=loaders)
 
             converted: List[Task] = []
             for t in planned:
@@ -98,7 +100,7 @@ class Query:
                     summary_text = t.summary
                     if not summary_text:
                         try:
-                            lt = await repo.get_lesson_template_by_id(t.lessonTemplateId)
+                            lt = await loaders.lesson_templates.load(t.lessonTemplateId)
                             if lt:
                                 base = getattr(lt, 'summary', None) or getattr(lt, 'markdown_content', '') or ''
                                 summary_text = (base[:240] + ("…" if len(base) > 240 else "")) or None
@@ -181,9 +183,10 @@ class Query:
 
     @strawberry.field
     async def lessonTemplateById(self, id: str, info: Info, onDate: Optional[date] = None) -> Optional[LessonTemplateType]:
+        loaders = get_loaders_from_context(info)
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
-            row = await repo.get_lesson_template_by_id(id)
+            row = await loaders.lesson_templates.load(id)
             if not row:
                 return None
 
@@ -199,10 +202,12 @@ class Query:
                 current_user = get_current_user_from_context(info)  # type: ignore[name-defined]
                 today = onDate or _date.today()
                 # Find an active step for any active assignment and check its daily plan
-                assignments = await repo.get_active_assignments(str(current_user.id))
+                assignments = await repo.get_active_assignments(str(current_user.id)) or []
+                steps_per_assignment = await loaders.program_steps.load_many(
+                    [str(a.program_template_id) for a in assignments]
+                )
                 found_segment = False
-                for assignment in assignments or []:
-                    steps = await repo.get_program_steps(str(assignment.program_template_id))
+                for assignment, steps in zip(assignments, steps_per_assignment):
                     if not steps:
                         continue
                     day_offset = (today - assignment.start_date).days
@@ -236,7 +241,7 @@ class Query:
                             break
                 # If no segment found for today, fall back to first available segment for this lesson
                 if not found_segment:
-                    segs = await repo.list_lesson_segments_by_lesson(str(row.id))
+                    segs = await loaders.segments_by_lesson.load(str(row.id))
                     if segs:
                         first = segs[0]
                         if first.markdown_content:
@@ -269,9 +274,12 @@ class Query:
 
     @strawberry.field
     async def programTemplateSteps(self, info: Info, programId: str) -> List[ProgramStepType]:
+        loaders = get_loaders_from_context(info)
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
-            steps = await repo.get_program_steps(programId)
+            steps = await loaders.program_steps.load(programId)
+            habit_ids = [str(s.habit_template_id) for s in steps if getattr(s, "habit_template_id", None)]
+            habits = {hid: h for hid, h in zip(habit_ids, await loaders.habit_templates.load_many(habit_ids))}
             out: List[ProgramStepType] = []
             # compute progress using user's assignment for this program, if any
             current_user = get_current_user_from_context(info)
@@ -287,7 +295,7 @@ class Query:
                 if not getattr(s, "habit_template_id", None):
                     cursor += s.duration_days
                     continue
-                habit = await repo.get_habit_template(str(s.habit_template_id))
+                habit = habits.get(str(s.habit_template_id))
                 if not habit:
                     continue
                 total_days = int(s.duration_days)
@@ -328,14 +336,15 @@ class Query:
         heroImageUrl: Optional[str]
 
     @strawberry.field
-    async def programStepLessons(self, programStepId: str) -> List[StepLessonType]:
+    async def programStepLessons(self, info: Info, programStepId: str) -> List[StepLessonType]:
+        loaders = get_loaders_from_context(info)
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
             sl = await repo.get_step_lessons(programStepId)
             if not sl:
                 return []
             lesson_ids = [str(x.lesson_template_id) for x in sl]
-            lessons = {str(l.id): l for l in await repo.get_lesson_templates(lesson_ids)}
+            lessons = {str(l.id): l for l in await loaders.lesson_templates.load_many(lesson_ids) if l}
             out: List[Query.StepLessonType] = []
             for m in sl:
                 l = lessons.get(str(m.lesson_template_id))
@@ -409,13 +418,14 @@ class Query:
     @strawberry.field
     async def recentLessonCompletions(self, info: Info, limit: int = 50) -> List[LessonCompletionType]:
         current_user = get_current_user_from_context(info)
+        loaders = get_loaders_from_context(info)
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
             events = await repo.list_recent_lesson_completions(str(current_user.id), limit)
             if not events:
                 return []
             lesson_ids = list({str(e.lesson_template_id) for e in events})
-            lessons = {str(l.id): l for l in (await repo.get_lesson_templates(lesson_ids))}
+            lessons = {str(l.id): l for l in await loaders.lesson_templates.load_many(lesson_ids) if l}
             out: List[Query.LessonCompletionType] = []
             for e in events:
                 l = lessons.get(str(e.lesson_template_id))
@@ -432,16 +442,19 @@ class Query:
     @strawberry.field
     async def lessonsForHabit(self, info: Info, habitTemplateId: str, onDate: date) -> List[LessonForHabitType]:
         current_user = get_current_user_from_context(info)
+        loaders = get_loaders_from_context(info)
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
             assignments = await repo.get_active_assignments(str(current_user.id))
+            steps_per_assignment = await loaders.program_steps.load_many(
+                [str(a.program_template_id) for a in assignments]
+            )
             lesson_ids: List[str] = []
 
-            for a in assignments:
+            for a, steps in zip(assignments, steps_per_assignment):
                 day_offset = (onDate - a.start_date).days
                 if day_offset < 0:
                     continue
-                steps = await repo.get_program_steps(str(a.program_template_id))
                 acc = 0
                 for s in steps:
                     step_len = s.duration_days
@@ -458,7 +471,7 @@ class Query:
             if not ids_set:
                 return []
 
-            lessons = await repo.get_lesson_templates(list(ids_set))
+            lessons = [l for l in await loaders.lesson_templates.load_many(list(ids_set)) if l]
             events = await repo.find_lesson_events(str(current_user.id), list(ids_set), onDate)
             completed_ids: Set[str] = {str(e.lesson_template_id) for e in events if e.event_type == 'completed'}
 
@@ -488,66 +501,15 @@ class Query:
         today = date.today()
         start_day = today - timedelta(days=lookbackDays - 1)
 
-        presented = 0
-        completed = 0
-        streak = 0
-
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
-            assignments = await repo.get_active_assignments(str(current_user.id))
-
-            # Helper to determine if habit was presented on a given day based on step mapping
-            async def is_presented(on_day: date) -> bool:
-                for a in assignments:
-                    day_offset = (on_day - a.start_date).days
-                    if day_offset < 0:
-                        continue
-                    steps = await repo.get_program_steps(str(a.program_template_id))
-                    cursor = 0
-                    for s in steps:
-                        if day_offset < cursor + s.duration_days:
-                            if str(s.habit_template_id) == habitTemplateId:
-                                return True
-                            break
-                        cursor += s.duration_days
-                return False
-
-            # Iterate range for presented/completed counts
-            d = start_day
-            while d <= today:
-                if await is_presented(d):
-                    presented += 1
-                    ev = await repo.find_habit_event(str(current_user.id), habitTemplateId, d)
-                    if ev and ev.response == "yes":
-                        completed += 1
-                d += timedelta(days=1)
-
-            # Compute current streak (consecutive completed days), allowing today's miss,
-            # and ignoring days where the habit wasn't presented.
-            d = today
-            allow_skip_today = True
-            while d >= start_day:
-                if await is_presented(d):
-                    ev = await repo.find_habit_event(str(current_user.id), habitTemplateId, d)
-                    if ev and ev.response == "yes":
-                        streak += 1
-                        d -= timedelta(days=1)
-                        continue
-                    # Presented but not completed
-                    if d == today and allow_skip_today:
-                        allow_skip_today = False
-                        d -= timedelta(days=1)
-                        continue
-                    break
-                # Not presented that day; skip back without breaking the streak window
-                d -= timedelta(days=1)
-
-            rate = (completed / presented) if presented else 0.0
+            days = await load_habit_days(repo, str(current_user.id), habitTemplateId, start_day, today)
+            stats = compute_habit_stats(days, today)
             return Query.HabitStatsType(
-                presentedCount=presented,
-                completedCount=completed,
-                adherenceRate=rate,
-                currentStreak=streak,
+                presentedCount=stats.presentedCount,
+                completedCount=stats.completedCount,
+                adherenceRate=stats.adherenceRate,
+                currentStreak=stats.currentStreak,
             )
 
     # --- Debug helpers ---
@@ -570,37 +532,15 @@ class Query:
 
         async with UnitOfWork() as uow:
             repo = HabitsReadRepository(uow.session)
-            assignments = await repo.get_active_assignments(str(current_user.id))
-
-            async def is_presented(on_day: date) -> bool:
-                for a in assignments:
-                    day_offset = (on_day - a.start_date).days
-                    if day_offset < 0:
-                        continue
-                    steps = await repo.get_program_steps(str(a.program_template_id))
-                    cursor = 0
-                    for s in steps:
-                        if day_offset < cursor + s.duration_days:
-                            if str(s.habit_template_id) == habitTemplateId:
-                                return True
-                            break
-                        cursor += s.duration_days
-                return False
-
-            out: List[Query.HabitDayDebugType] = []
-            d = start_day
-            while d <= today:
-                presented = await is_presented(d)
-                ev = await repo.find_habit_event(str(current_user.id), habitTemplateId, d) if presented else None
-                out.append(
-                    Query.HabitDayDebugType(
-                        date=d,
-                        presented=presented,
-                        completed=bool(ev and ev.response == "yes"),
-                        eventResponse=(ev.response if ev else None),
-                    )
+            days = await load_habit_days(repo, str(current_user.id), habitTemplateId, start_day, today)
+            return [
+                Query.HabitDayDebugType(
+                    date=day.date,
+                    presented=day.presented,
+                    completed=day.completed,
+                    eventResponse=day.eventResponse,
                 )
-                d += timedelta(days=1)
-            return out
+                for day in days
+            ]
 
 
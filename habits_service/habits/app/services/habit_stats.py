@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from habits.app.db.repositories import HabitsReadRepository
+from habits.app.db.tables import ProgramStepTemplate, UserProgramAssignment
+
+
+@dataclass
+class HabitDay:
+    date: date
+    presented: bool
+    completed: bool
+    eventResponse: Optional[str]
+
+
+@dataclass
+class HabitStats:
+    presentedCount: int
+    completedCount: int
+    adherenceRate: float
+    currentStreak: int
+
+
+def presented_days(
+    assignments: Iterable[UserProgramAssignment],
+    steps_by_program: Dict[str, Sequence[ProgramStepTemplate]],
+    habit_template_id: str,
+    start: date,
+    end: date,
+) -> Set[date]:
+    """Days in [start, end] on which a habit is the active step of some assignment.
+
+    Each matching step covers the date range [start_date + cursor, start_date + cursor + duration_days),
+    so presented days come from interval arithmetic instead of a per-day step walk.
+    """
+    days: Set[date] = set()
+    for assignment in assignments:
+        cursor = 0
+        for step in steps_by_program.get(str(assignment.program_template_id), []):
+            step_start = assignment.start_date + timedelta(days=cursor)
+            cursor += step.duration_days
+            if str(step.habit_template_id) != habit_template_id:
+                continue
+            first = max(step_start, start)
+            last = min(assignment.start_date + timedelta(days=cursor - 1), end)
+            days.update(first + timedelta(days=n) for n in range((last - first).days + 1))
+    return days
+
+
+async def load_habit_days(
+    repo: HabitsReadRepository, user_id: str, habit_template_id: str, start: date, end: date
+) -> List[HabitDay]:
+    """Presented/completed flags for every day in [start, end], oldest first.
+
+    Uses three queries however long the window is: active assignments, their program steps, and
+    the habit's events in the window.
+    """
+    assignments = await repo.get_active_assignments(user_id)
+    steps_by_program = await repo.get_program_steps_for_programs(str(a.program_template_id) for a in assignments)
+    presented = presented_days(assignments, steps_by_program, habit_template_id, start, end)
+
+    # With several events on a day (one per assignment), the latest response wins
+    responses: Dict[date, str] = {}
+    for ev in await repo.find_habit_events_in_range(user_id, habit_template_id, start, end):
+        responses[ev.date] = ev.response
+
+    days: List[HabitDay] = []
+    for n in range((end - start).days + 1):
+        d = start + timedelta(days=n)
+        response = responses.get(d) if d in presented else None
+        days.append(HabitDay(date=d, presented=d in presented, completed=response == "yes", eventResponse=response))
+    return days
+
+
+def compute_habit_stats(days: Sequence[HabitDay], today: date) -> HabitStats:
+    """Counts, adherence rate and current streak in one pass, newest day first.
+
+    The streak counts consecutive completed presented days ending today, ignores days the habit
+    was not presented, and tolerates an incomplete today (the day is not over yet).
+    """
+    presented = 0
+    completed = 0
+    streak = 0
+    streak_open = True
+    for day in reversed(days):
+        if not day.presented:
+            continue
+        presented += 1
+        if day.completed:
+            completed += 1
+            if streak_open:
+                streak += 1
+        elif day.date != today:
+            streak_open = False
+
+    return HabitStats(
+        presentedCount=presented,
+        completedCount=completed,
+        adherenceRate=(completed / presented) if presented else 0.0,
+        currentStreak=streak,
+    )
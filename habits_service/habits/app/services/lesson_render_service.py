@@ -1,25 +1,110 @@
 from __future__ import annotations
 
+import hashlib
 import re
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 from .lesson_loader import LessonSegment, LessonLoader
 
 
+# Parsed lessons kept in memory; lesson content only changes on import
+PARSE_CACHE_SIZE = 256
+
+
+class ParsedLesson:
+    """Markdown split once into lines and headings, with the end line of every heading's section."""
+
+    def __init__(self, markdown_content: str):
+        self.markdown_content = markdown_content
+        self.lines = markdown_content.split('\n')
+        self._sections: Dict[str, Optional[str]] = {}
+
+        # A section ends at the next heading of the same or a higher level
+        open_headings: List[int] = []
+        levels: List[Tuple[int, int]] = []
+        ends: Dict[int, int] = {}
+        for i, line in enumerate(self.lines):
+            level = LessonRenderService._get_heading_level(line)
+            if level == 0:
+                continue
+            while open_headings and levels[open_headings[-1]][1] >= level:
+                ends[open_headings.pop()] = i
+            open_headings.append(len(levels))
+            levels.append((i, level))
+        # (line index, level, section end) for each heading, in document order
+        self.headings: List[Tuple[int, int, int]] = [
+            (i, level, ends.get(n, len(self.lines))) for n, (i, level) in enumerate(levels)
+        ]
+
+    def section(self, selector: str) -> Optional[str]:
+        """Content of the section whose heading matches selector (memoized per selector)."""
+        if selector not in self._sections:
+            self._sections[selector] = self._find_section(selector)
+        return self._sections[selector]
+
+    def _find_section(self, selector: str) -> Optional[str]:
+        # Only heading lines can match a selector that starts with '#'; a match on any other
+        # line is not a heading and yields no section
+        if not selector.strip().startswith('#'):
+            return None
+        pattern = LessonRenderService._create_selector_pattern(selector)
+        for start, _level, end in self.headings:
+            if pattern.search(self.lines[start]):
+                return '\n'.join(self.lines[start:end])
+        return None
+
+
+_parsed_lessons: "OrderedDict[Tuple[Optional[str], str], ParsedLesson]" = OrderedDict()
+
+
 class LessonRenderService:
     """Service for rendering segmented lesson content from markdown."""
 
     @staticmethod
-    def extract_segments_from_markdown(markdown_content: str, segments: List[LessonSegment]) -> Dict[str, str]:
+    def parse(markdown_content: str, lesson_id: Optional[str] = None) -> ParsedLesson:
+        """Parse lesson markdown, reusing the cached parse for the same lesson id and content hash.
+
+        Args:
+            markdown_content: The full markdown content
+            lesson_id: Lesson template id, if known
+
+        Returns:
+            The parsed lesson
+        """
+        key = (lesson_id, hashlib.sha256(markdown_content.encode('utf-8')).hexdigest())
+        parsed = _parsed_lessons.get(key)
+        if parsed is not None:
+            _parsed_lessons.move_to_end(key)
+            return parsed
+
+        parsed = ParsedLesson(markdown_content)
+        _parsed_lessons[key] = parsed
+        while len(_parsed_lessons) > PARSE_CACHE_SIZE:
+            _parsed_lessons.popitem(last=False)
+        return parsed
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all parsed lessons (e.g. after a lesson import)."""
+        _parsed_lessons.clear()
+
+    @staticmethod
+    def extract_segments_from_markdown(
+        markdown_content: str, segments: List[LessonSegment], lesson_id: Optional[str] = None
+    ) -> Dict[str, str]:
         """Extract content segments from markdown based on segment selectors.
 
         Args:
             markdown_content: The full markdown content
             segments: List of segment definitions
+            lesson_id: Lesson template id, used to key the parse cache
 
         Returns:
             Dictionary mapping segment ID to extracted content
         """
         results = {}
+        parsed = None
 
         for segment in segments:
             if segment.selector == "*":
@@ -27,9 +112,8 @@ class LessonRenderService:
                 results[segment.id] = markdown_content
             else:
                 # Extract content for this segment
-                content = LessonRenderService._extract_segment_content(
-                    markdown_content, segment.selector
-                )
+                parsed = parsed or LessonRenderService.parse(markdown_content, lesson_id)
+                content = parsed.section(segment.selector)
                 if content:
                     results[segment.id] = content.strip()
 
@@ -46,45 +130,12 @@ class LessonRenderService:
         Returns:
             The extracted content, or None if not found
         """
-        lines = markdown_content.split('\n')
-        selector_pattern = LessonRenderService._create_selector_pattern(selector)
-
-        start_line = None
-        end_line = None
-
-        for i, line in enumerate(lines):
-            if selector_pattern.search(line):
-                start_line = i
-                break
-
-        if start_line is None:
-            return None
-
-        # Find the next peer heading (same level or higher)
-        current_level = LessonRenderService._get_heading_level(lines[start_line])
-        if current_level == 0:
-            return None
-
-        # Look for the next heading of the same level or higher
-        for i in range(start_line + 1, len(lines)):
-            line = lines[i]
-            if line.strip() and line.strip()[0] == '#':
-                next_level = LessonRenderService._get_heading_level(line)
-                if next_level <= current_level:
-                    end_line = i
-                    break
-
-        if end_line is None:
-            # No next heading found, take everything until the end
-            end_line = len(lines)
-
-        # Extract the content
-        content_lines = lines[start_line:end_line]
-        return '\n'.join(content_lines)
+        return LessonRenderService.parse(markdown_content).section(selector)
 
     @staticmethod
+    @lru_cache(maxsize=512)
     def _create_selector_pattern(selector: str) -> re.Pattern[str]:
-        """Create a regex pattern for matching the selector.
+        """Create a regex pattern for matching the selector (memoized).
 
         Args:
             selector: The segment selector (e.g., "## Welcome", "## Tips")
@@ -127,7 +178,8 @@ class LessonRenderService:
         markdown_content: str,
         segments: List[LessonSegment],
         segment_ids: Optional[List[str]] = None,
-        default_segment: Optional[str] = None
+        default_segment: Optional[str] = None,
+        lesson_id: Optional[str] = None,
     ) -> str:
         """Render lesson content for specified segments.
 
@@ -136,6 +188,7 @@ class LessonRenderService:
             segments: List of available segments
             segment_ids: List of segment IDs to render, or None for default
             default_segment: Default segment ID to use when none specified
+            lesson_id: Lesson template id, used to key the parse cache
 
         Returns:
             Concatenated markdown content for the requested segments
@@ -149,7 +202,7 @@ class LessonRenderService:
                 return markdown_content
 
         # Extract segment contents
-        segment_contents = LessonRenderService.extract_segments_from_markdown(markdown_content, segments)
+        segment_contents = LessonRenderService.extract_segments_from_markdown(markdown_content, segments, lesson_id)
 
         # Collect content for requested segments
         rendered_parts = []
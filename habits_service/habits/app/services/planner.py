@@ -2,14 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 from habits.app.db.repositories import HabitsReadRepository
-from habits.app.db.tables import ProgramStepTemplate
+from habits.app.db.tables import ProgramStepTemplate, StepLessonTemplate
 
 
 from habits.app.graphql.schemas.task_types import TaskType, TaskStatus
 
+if TYPE_CHECKING:
+    from habits.app.graphql.loaders import HabitsLoaders
+
 
 @dataclass
 class HabitTask:
@@ -75,6 +78,23 @@ def _strip_leading_headings_and_blank(markdown_text: Optional[str]) -> str:
     return '\n'.join(lines[idx:]).lstrip()
 
 
+def _excerpt(text: Optional[str], limit: int = 200) -> str:
+    text = text or ""
+    return text[:limit] + ("…" if len(text) > limit else "")
+
+
+def _locate_step(steps: Sequence[ProgramStepTemplate], day_offset: int) -> Optional[Tuple[ProgramStepTemplate, int]]:
+    """Map a day offset into an assignment onto (active step, day index within that step)."""
+    if day_offset < 0:
+        return None
+    cursor = 0
+    for step in steps:
+        if day_offset < cursor + step.duration_days:
+            return step, day_offset - cursor
+        cursor += step.duration_days
+    return None
+
+
 async def plan_daily_tasks(user_id: str, on_date: date, repo: HabitsReadRepository) -> List[Task]:
     tasks: List[Task] = []
     assignments = await repo.get_active_assignments(user_id)
@@ -185,7 +205,8 @@ async def plan_daily_tasks(user_id: str, on_date: date, repo: HabitsReadReposito
                             lesson_template.markdown_content or "",
                             segment_objects,
                             lesson_task.segment_ids_json,
-                            lesson_template.default_segment
+                            lesson_template.default_segment,
+                            lesson_id=str(lesson_template.id),
                         )
                         clean = _strip_leading_headings_and_blank(rendered_content)
                         summary = (clean[:200] + ("…" if len(clean) > 200 else "")) or None
@@ -272,3 +293,208 @@ async def plan_daily_tasks(user_id: str, on_date: date, repo: HabitsReadReposito
     # JournalTask now optionally emitted via StepDailyPlan.journal_prompt_text
 
     return tasks
+
+
+async def plan_daily_tasks_batched(
+    user_id: str, on_date: date, repo: HabitsReadRepository, loaders: Optional["HabitsLoaders"] = None
+) -> List[Task]:
+    """Set-based variant of plan_daily_tasks.
+
+    Loads steps, habits, daily plans, lessons, segments and same-day events for every active
+    assignment with a fixed number of IN-list queries, then assembles the tasks in memory, so the
+    query count no longer grows with enrolled programs x steps.
+
+    Explicit lesson tasks belong to the user and date rather than to an assignment, so they are
+    emitted once (with the first assignment that is active on the date) instead of per assignment.
+
+    With request-scoped loaders, lesson templates and the day's habit events go through them, so
+    other resolvers in the same operation reuse what the planner loaded.
+    """
+    from habits.app.services.lesson_loader import LessonLoader
+    from habits.app.services.lesson_render_service import LessonRenderService
+
+    tasks: List[Task] = []
+    assignments = await repo.get_active_assignments(user_id)
+    if not assignments:
+        return tasks
+
+    steps_by_program = await repo.get_program_steps_for_programs(str(a.program_template_id) for a in assignments)
+
+    # Resolve each assignment's active step for the date
+    active: List[Tuple[ProgramStepTemplate, int]] = []
+    for assignment in assignments:
+        located = _locate_step(
+            steps_by_program.get(str(assignment.program_template_id), []),
+            (on_date - assignment.start_date).days,
+        )
+        if located is not None:
+            active.append(located)
+    if not active:
+        return tasks
+
+    step_ids = [str(step.id) for step, _ in active]
+    habit_ids = [str(step.habit_template_id) for step, _ in active if getattr(step, "habit_template_id", None)]
+
+    habits = {str(h.id): h for h in await repo.get_habit_templates(habit_ids)}
+    daily_plans = {
+        (str(p.program_step_template_id), p.day_index): p
+        for p in await repo.get_step_daily_plans_for_days((str(step.id), day_index) for step, day_index in active)
+    }
+    step_lessons: Dict[str, List[StepLessonTemplate]] = {}
+    for sl in await repo.get_step_lessons_for_steps(step_ids):
+        step_lessons.setdefault(str(sl.program_step_template_id), []).append(sl)
+    programs = {str(p.id): p for p in await repo.get_program_templates(str(step.program_template_id) for step, _ in active)}
+    explicit_lesson_tasks = await repo.get_lesson_tasks_for_user_and_date(user_id, on_date)
+
+    segment_ids = [
+        str(plan.lesson_segment_id)
+        for plan in daily_plans.values()
+        if plan.lesson_segment_id and not explicit_lesson_tasks
+    ]
+    segments = {str(seg.id): seg for seg in await repo.get_lesson_segments(segment_ids)}
+
+    # Every lesson template any card may need: explicit tasks, today's step lessons and subtitle fallbacks
+    lesson_ids: List[str] = [str(lt.lesson_template_id) for lt in explicit_lesson_tasks]
+    for step_id in step_ids:
+        lesson_ids.extend(str(sl.lesson_template_id) for sl in step_lessons.get(step_id, []))
+    lesson_ids = list(dict.fromkeys(lesson_ids))
+    if loaders is not None:
+        lessons = {str(l.id): l for l in await loaders.lesson_templates.load_many(lesson_ids) if l}
+    else:
+        lessons = {str(l.id): l for l in await repo.get_lesson_templates(lesson_ids)}
+
+    segments_by_lesson = await repo.list_lesson_segments_by_lessons(
+        str(lt.lesson_template_id) for lt in explicit_lesson_tasks if lt.segment_ids_json
+    )
+    if loaders is not None:
+        day_events = [ev for ev in await loaders.habit_events.load((user_id, on_date)) if str(ev.habit_template_id) in habits]
+    else:
+        day_events = await repo.find_habit_events_for_date(user_id, habits.keys(), on_date)
+    habit_events = {str(ev.habit_template_id): ev for ev in day_events}
+    completed_lesson_ids = {
+        str(le.lesson_template_id)
+        for le in await repo.find_lesson_events(user_id, list(lessons.keys()), on_date)
+        if le.event_type == "completed"
+    }
+
+    def lesson_subtitle(mappings: List[StepLessonTemplate]) -> Optional[str]:
+        if not mappings:
+            return None
+        lesson = lessons.get(str(mappings[0].lesson_template_id))
+        if not lesson:
+            return None
+        return getattr(lesson, "subtitle", None) or lesson.summary or None
+
+    explicit_emitted = False
+    for active_step, day_index in active:
+        step_id = str(active_step.id)
+        daily_plan = daily_plans.get((step_id, day_index))
+        mapped = step_lessons.get(step_id, [])
+        todays = [sl for sl in mapped if sl.day_index == day_index]
+
+        # Habit card (welcome-only steps may have no habit)
+        habit = None
+        if getattr(active_step, "habit_template_id", None):
+            habit = habits.get(str(active_step.habit_template_id))
+        if habit:
+            # Subtitle: daily plan variant, habit description, program description, then lesson subtitle/summary
+            subtitle_text: Optional[str] = daily_plan.habit_variant_text if daily_plan else None
+            if not subtitle_text:
+                subtitle_text = habit.short_description
+            if not subtitle_text:
+                program = programs.get(str(active_step.program_template_id))
+                subtitle_text = getattr(program, "description", None) if program else None
+            if not subtitle_text:
+                subtitle_text = lesson_subtitle(todays) or lesson_subtitle(mapped)
+
+            ev = habit_events.get(str(habit.id))
+            tasks.append(
+                HabitTask(
+                    taskId=_deterministic_task_id("habits", user_id, on_date, "habit", str(habit.id)),
+                    type=TaskType.habit,
+                    habitTemplateId=str(habit.id),
+                    title=habit.title,
+                    description=habit.short_description,
+                    subtitle=subtitle_text,
+                    status=TaskStatus.completed if ev and ev.response == "yes" else TaskStatus.pending,
+                )
+            )
+
+        if explicit_lesson_tasks:
+            # Explicit LessonTask records (practices_service integration) replace program-based lessons
+            if not explicit_emitted:
+                explicit_emitted = True
+                for lesson_task in explicit_lesson_tasks:
+                    lesson_template = lessons.get(str(lesson_task.lesson_template_id))
+                    if not lesson_template:
+                        continue
+                    summary = lesson_template.summary
+                    if lesson_task.segment_ids_json:
+                        segment_objects = LessonLoader.segments_from_json(
+                            LessonLoader.segments_to_json(segments_by_lesson.get(str(lesson_template.id), []))
+                        )
+                        if segment_objects:
+                            rendered_content = LessonRenderService.render_segments(
+                                lesson_template.markdown_content or "",
+                                segment_objects,
+                                lesson_task.segment_ids_json,
+                                lesson_template.default_segment,
+                                lesson_id=str(lesson_template.id),
+                            )
+                            summary = _excerpt(_strip_leading_headings_and_blank(rendered_content)) or None
+                    tasks.append(
+                        LessonTask(
+                            taskId=_deterministic_task_id("habits", user_id, on_date, "lesson", str(lesson_template.id)),
+                            type=TaskType.lesson,
+                            lessonTemplateId=str(lesson_template.id),
+                            title=lesson_template.title,
+                            summary=summary,
+                            status=TaskStatus.pending,  # LessonTasks are always pending until completed
+                        )
+                    )
+        else:
+            seg = segments.get(str(daily_plan.lesson_segment_id)) if daily_plan and daily_plan.lesson_segment_id else None
+            if seg:
+                # Use parent lesson id for identity; title/summary from segment
+                parent_id = str(seg.lesson_template_id)
+                seg_summary = seg.summary or _excerpt(_strip_leading_headings_and_blank(seg.markdown_content or ""))
+                tasks.append(
+                    LessonTask(
+                        taskId=_deterministic_task_id("habits", user_id, on_date, "lesson", parent_id),
+                        type=TaskType.lesson,
+                        lessonTemplateId=parent_id,
+                        title=seg.title,
+                        summary=seg_summary or None,
+                        status=TaskStatus.pending,
+                    )
+                )
+            else:
+                for sl in todays:
+                    lesson = lessons.get(str(sl.lesson_template_id))
+                    if not lesson:
+                        continue
+                    tasks.append(
+                        LessonTask(
+                            taskId=_deterministic_task_id("habits", user_id, on_date, "lesson", str(lesson.id)),
+                            type=TaskType.lesson,
+                            lessonTemplateId=str(lesson.id),
+                            title=lesson.title,
+                            summary=lesson.summary or _excerpt(lesson.markdown_content) or None,
+                            status=TaskStatus.completed if str(lesson.id) in completed_lesson_ids else TaskStatus.pending,
+                        )
+                    )
+
+        # Journal prompt from daily plan -> JournalTask
+        if daily_plan and daily_plan.journal_prompt_text:
+            tasks.append(
+                JournalTask(
+                    taskId=_deterministic_task_id("habits", user_id, on_date, "journal", step_id),
+                    type=TaskType.journal,
+                    title="Daily Journal",
+                    description=daily_plan.journal_prompt_text,
+                    status=TaskStatus.pending,
+                    habitTemplateId=str(habit.id) if habit else None,
+                )
+            )
+
+    return tasks
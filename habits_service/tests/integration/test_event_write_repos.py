@@ -42,3 +42,48 @@ async def test_habit_and_lesson_event_upserts(db_session):
     assert l2.event_type == "completed"
 
 
+
+
+@pytest.mark.asyncio
+async def test_habit_event_bulk_upsert(db_session):
+    ht_repo = HabitTemplateRepository(db_session)
+    he_repo = HabitEventRepository(db_session)
+
+    import uuid
+    habit = await ht_repo.create(slug=f"bulk-habit-{uuid.uuid4().hex[:8]}", title="Bulk Habit")
+    await db_session.commit()
+    hid = str(habit.id)
+
+    await he_repo.upsert(user_id="u1", habit_template_id=hid, on_date=date(2025, 8, 1), response="no")
+    await db_session.commit()
+
+    # Offline batch: updates day 1, inserts day 2 and keeps the last response for a repeated day
+    events = await he_repo.bulk_upsert(
+        user_id="u1",
+        responses=[
+            (hid, date(2025, 8, 1), "yes"),
+            (hid, date(2025, 8, 2), "no"),
+            (hid, date(2025, 8, 2), "yes"),
+        ],
+    )
+    await db_session.commit()
+
+    by_date = {e.date: e.response for e in events}
+    assert by_date == {date(2025, 8, 1): "yes", date(2025, 8, 2): "yes"}
+    assert await he_repo.bulk_upsert(user_id="u1", responses=[]) == []
+
+
+@pytest.mark.asyncio
+async def test_lesson_event_upsert_never_demotes_completed(db_session):
+    lt_repo = LessonTemplateRepository(db_session)
+    le_repo = LessonEventRepository(db_session)
+
+    import uuid
+    lesson = await lt_repo.create(slug=f"demote-{uuid.uuid4().hex[:8]}", title="Demote", markdown_content="# md")
+    await db_session.commit()
+
+    await le_repo.upsert(user_id="u1", lesson_template_id=str(lesson.id), on_date=date(2025, 8, 1), event_type="completed")
+    await db_session.commit()
+    again = await le_repo.upsert(user_id="u1", lesson_template_id=str(lesson.id), on_date=date(2025, 8, 1), event_type="opened")
+    await db_session.commit()
+    assert again.event_type == "completed"
@@ -14,7 +14,7 @@ from habits_service.habits_service.app.db.repositories.write_structural import (
     UserProgramAssignmentRepository,
 )
 from habits_service.habits_service.app.db.repositories.read import HabitsReadRepository
-from habits_service.habits_service.app.services.planner import plan_daily_tasks
+from habits_service.habits_service.app.services.planner import plan_daily_tasks, plan_daily_tasks_batched
 
 
 @pytest.mark.asyncio
@@ -79,3 +79,7 @@ async def test_structural_repos_flow(db_session):
     tasks = await plan_daily_tasks("u-test", date(2025, 8, 3), rrepo)
     lesson_titles = [getattr(t, "title", None) for t in tasks]
     assert "How much?" in lesson_titles
+
+    # The set-based planner yields the same tasks
+    batched = await plan_daily_tasks_batched("u-test", date(2025, 8, 3), rrepo)
+    assert batched == tasks
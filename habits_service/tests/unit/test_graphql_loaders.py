@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+import pytest
+
+from habits_service.habits_service.app.graphql import loaders as loaders_module
+from habits_service.habits_service.app.graphql.loaders import HabitsLoaders
+
+
+class Obj:
+    pass
+
+
+class StubUnitOfWork:
+    session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class StubReadRepository:
+    calls = []
+    lessons = {}
+    events = []
+
+    def __init__(self, session):
+        pass
+
+    async def get_lesson_templates(self, lesson_ids):
+        StubReadRepository.calls.append(("lessons", list(lesson_ids)))
+        return [self.lessons[_id] for _id in lesson_ids if _id in self.lessons]
+
+    async def find_habit_events_for_user_dates(self, user_dates):
+        StubReadRepository.calls.append(("events", list(user_dates)))
+        return [e for e in self.events if (e.user_id, e.date) in user_dates]
+
+
+@pytest.fixture
+def stub_repo(monkeypatch):
+    monkeypatch.setattr(loaders_module, "UnitOfWork", StubUnitOfWork)
+    monkeypatch.setattr(loaders_module, "HabitsReadRepository", StubReadRepository)
+    StubReadRepository.calls = []
+    StubReadRepository.lessons = {}
+    StubReadRepository.events = []
+    return StubReadRepository
+
+
+@pytest.mark.asyncio
+async def test_lesson_template_loads_are_coalesced_and_deduplicated(stub_repo):
+    for lesson_id in ("l1", "l2"):
+        lesson = Obj(); lesson.id = lesson_id
+        stub_repo.lessons[lesson_id] = lesson
+
+    loaders = HabitsLoaders.create()
+    first, second, again, missing = await asyncio.gather(
+        loaders.lesson_templates.load("l1"),
+        loaders.lesson_templates.load("l2"),
+        loaders.lesson_templates.load("l1"),
+        loaders.lesson_templates.load("nope"),
+    )
+
+    assert first.id == "l1" and second.id == "l2" and again is first
+    assert missing is None
+    assert stub_repo.calls == [("lessons", ["l1", "l2", "nope"])]
+
+    # Served from the request cache afterwards
+    await loaders.lesson_templates.load("l2")
+    assert len(stub_repo.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_habit_events_grouped_by_user_and_date(stub_repo):
+    day = date(2025, 8, 1)
+    for habit_id in ("h1", "h2"):
+        ev = Obj(); ev.user_id = "u1"; ev.date = day; ev.habit_template_id = habit_id; ev.response = "yes"
+        stub_repo.events.append(ev)
+
+    loaders = HabitsLoaders.create()
+    today, other_day = await asyncio.gather(
+        loaders.habit_events.load(("u1", day)),
+        loaders.habit_events.load(("u1", date(2025, 8, 2))),
+    )
+
+    assert sorted(e.habit_template_id for e in today) == ["h1", "h2"]
+    assert other_day == []
+    assert len(stub_repo.calls) == 1
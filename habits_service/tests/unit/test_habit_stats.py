@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+import pytest
+
+from habits_service.habits_service.app.services.habit_stats import (
+    HabitDay,
+    compute_habit_stats,
+    load_habit_days,
+    presented_days,
+)
+
+
+class Obj:
+    pass
+
+
+def make_step(habit_id: str, duration_days: int):
+    step = Obj(); step.habit_template_id = habit_id; step.duration_days = duration_days
+    return step
+
+
+def make_assignment(program_id: str, start_date: date):
+    a = Obj(); a.program_template_id = program_id; a.start_date = start_date; a.user_id = "u1"; a.status = "active"
+    return a
+
+
+class StubRepo:
+    def __init__(self, assignments, steps_by_program, events):
+        self.assignments = assignments
+        self.steps_by_program = steps_by_program
+        self.events = events
+        self.calls = 0
+
+    async def get_active_assignments(self, user_id: str):
+        self.calls += 1
+        return self.assignments
+
+    async def get_program_steps_for_programs(self, program_template_ids):
+        self.calls += 1
+        return {pid: self.steps_by_program.get(pid, []) for pid in program_template_ids}
+
+    async def find_habit_events_in_range(self, user_id, habit_template_id, start, end):
+        self.calls += 1
+        return [e for e in self.events if str(e.habit_template_id) == habit_template_id and start <= e.date <= end]
+
+
+def test_presented_days_follow_step_durations():
+    # h1 for 3 days, h2 for 2 days, h1 again for 2 days
+    steps = {"p1": [make_step("h1", 3), make_step("h2", 2), make_step("h1", 2)]}
+    start = date(2025, 8, 1)
+    days = presented_days([make_assignment("p1", start)], steps, "h1", start - timedelta(days=5), start + timedelta(days=30))
+    assert sorted(days) == [start + timedelta(days=n) for n in (0, 1, 2, 5, 6)]
+
+
+def test_presented_days_clipped_to_window():
+    steps = {"p1": [make_step("h1", 10)]}
+    start = date(2025, 8, 1)
+    days = presented_days([make_assignment("p1", start)], steps, "h1", date(2025, 8, 8), date(2025, 8, 20))
+    assert sorted(days) == [date(2025, 8, 8), date(2025, 8, 9), date(2025, 8, 10)]
+
+
+def test_streak_allows_incomplete_today_and_skips_unpresented_days():
+    today = date(2025, 8, 10)
+    flags = [
+        # (days ago, presented, completed)
+        (5, True, False),
+        (4, True, True),
+        (3, False, False),
+        (2, True, True),
+        (1, True, True),
+        (0, True, False),
+    ]
+    days = [
+        HabitDay(date=today - timedelta(days=ago), presented=p, completed=c, eventResponse="yes" if c else None)
+        for ago, p, c in flags
+    ]
+    stats = compute_habit_stats(days, today)
+    assert stats.presentedCount == 5
+    assert stats.completedCount == 3
+    assert stats.adherenceRate == pytest.approx(0.6)
+    assert stats.currentStreak == 3
+
+
+@pytest.mark.asyncio
+async def test_load_habit_days_uses_constant_queries():
+    start = date(2025, 1, 1)
+    steps = {"p1": [make_step("h1", 400)]}
+    events = []
+    for n in range(0, 365, 2):
+        ev = Obj(); ev.habit_template_id = "h1"; ev.date = start + timedelta(days=n); ev.response = "yes"
+        events.append(ev)
+    repo = StubRepo([make_assignment("p1", start)], steps, events)
+
+    end = start + timedelta(days=364)
+    days = await load_habit_days(repo, "u1", "h1", start, end)
+
+    assert len(days) == 365
+    assert all(d.presented for d in days)
+    assert sum(d.completed for d in days) == 183
+    assert repo.calls == 3
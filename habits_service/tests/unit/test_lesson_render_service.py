@@ -174,3 +174,28 @@ This is the end.
         assert LessonRenderService._create_segment_id("Tips for Success") == "tips-for-success"
         assert LessonRenderService._create_segment_id("Getting Started (Day 1)") == "getting-started-day-1"
         assert LessonRenderService._create_segment_id("  Special  Heading  ") == "special-heading"
+
+    def test_nested_section_ends_at_peer_heading(self):
+        """Test that a section keeps its sub-headings and stops at the next peer."""
+        markdown = "# Title\n\n## Tips\n\nTip.\n\n### Sub-tip\n\nMore.\n\n## Next\n\nDone."
+
+        content = LessonRenderService._extract_segment_content(markdown, "## tips")
+
+        assert content == "## Tips\n\nTip.\n\n### Sub-tip\n\nMore.\n"
+        assert LessonRenderService._extract_segment_content(markdown, "## Missing") is None
+
+    def test_parse_is_cached_per_lesson_and_content(self):
+        """Test that repeated renders reuse one parse of the markdown."""
+        LessonRenderService.clear_cache()
+        markdown = "# Title\n\n## Intro\n\nHello.\n\n## Tips\n\nTip."
+        segments = [
+            LessonSegment(id="intro", label="Intro", selector="## Intro"),
+            LessonSegment(id="tips", label="Tips", selector="## Tips"),
+        ]
+
+        first = LessonRenderService.parse(markdown, lesson_id="l1")
+        rendered = LessonRenderService.render_segments(markdown, segments, ["intro", "tips"], lesson_id="l1")
+
+        assert LessonRenderService.parse(markdown, lesson_id="l1") is first
+        assert LessonRenderService.parse(markdown + "\n\nEdited.", lesson_id="l1") is not first
+        assert rendered == "## Intro\n\nHello.\n\n## Tips\n\nTip."
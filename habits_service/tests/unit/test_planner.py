@@ -4,7 +4,7 @@ import uuid
 from datetime import date, timedelta
 import pytest
 
-from habits_service.habits_service.app.services.planner import plan_daily_tasks
+from habits_service.habits_service.app.services.planner import plan_daily_tasks, plan_daily_tasks_batched
 from habits_service.habits_service.app.graphql.schemas.task_types import TaskType, TaskStatus
 
 
@@ -125,3 +125,86 @@ async def test_habit_yes_marks_completed():
     assert ht.status == TaskStatus.completed
 
 
+class BatchedStubRepo(StubRepo):
+    """StubRepo with the set-based lookups, counting calls per method."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def get_program_steps_for_programs(self, program_template_ids):
+        self._count("steps")
+        return {pid: self.steps_by_program.get(pid, []) for pid in program_template_ids}
+
+    async def get_habit_templates(self, habit_template_ids):
+        self._count("habits")
+        return [self.habits[_id] for _id in habit_template_ids if _id in self.habits]
+
+    async def get_step_daily_plans_for_days(self, step_days):
+        self._count("daily_plans")
+        return []
+
+    async def get_step_lessons_for_steps(self, step_ids):
+        self._count("step_lessons")
+        return [sl for step_id in step_ids for sl in self.step_lessons.get(step_id, [])]
+
+    async def get_program_templates(self, program_template_ids):
+        self._count("programs")
+        return []
+
+    async def get_lesson_tasks_for_user_and_date(self, user_id, date):
+        self._count("lesson_tasks")
+        return []
+
+    async def get_lesson_segments(self, segment_ids):
+        self._count("segments")
+        return []
+
+    async def list_lesson_segments_by_lessons(self, lesson_template_ids):
+        self._count("segments_by_lesson")
+        return {}
+
+    async def find_habit_events_for_date(self, user_id, habit_template_ids, on_date):
+        self._count("habit_events")
+        return [self.habit_events[(user_id, _id, on_date)] for _id in habit_template_ids if (user_id, _id, on_date) in self.habit_events]
+
+
+@pytest.mark.asyncio
+async def test_batched_planner_query_count_is_independent_of_assignments():
+    repo = BatchedStubRepo()
+    titles = []
+    for n in range(3):
+        program_id = make_uuid()
+        step = Obj(); step.id = make_uuid(); step.program_template_id = program_id; step.sequence_index = 0; step.habit_template_id = make_uuid(); step.duration_days = 7
+        repo.steps_by_program[program_id] = [step]
+
+        habit = Obj(); habit.id = step.habit_template_id; habit.title = f"Habit {n}"; habit.short_description = "desc"
+        repo.habits[str(habit.id)] = habit
+        titles.append(habit.title)
+
+        lesson_id = make_uuid()
+        sl = Obj(); sl.id = make_uuid(); sl.program_step_template_id = step.id; sl.day_index = 1; sl.lesson_template_id = lesson_id
+        repo.step_lessons[step.id] = [sl]
+        lesson = Obj(); lesson.id = lesson_id; lesson.title = f"Lesson {n}"; lesson.summary = "s"; lesson.markdown_content = "# md"
+        repo.lessons[lesson_id] = lesson
+
+        assign = Obj(); assign.id = make_uuid(); assign.user_id = "u1"; assign.program_template_id = program_id; assign.start_date = date(2025, 8, 1); assign.status = "active"
+        repo.assignments.append(assign)
+
+    # Habit event yes for the first program only
+    first_habit = repo.steps_by_program[repo.assignments[0].program_template_id][0].habit_template_id
+    ev = Obj(); ev.user_id = "u1"; ev.habit_template_id = first_habit; ev.date = date(2025, 8, 2); ev.response = "yes"
+    repo.habit_events[("u1", first_habit, date(2025, 8, 2))] = ev
+
+    tasks = await plan_daily_tasks_batched("u1", date(2025, 8, 2), repo)
+
+    habit_tasks = [t for t in tasks if t.type == TaskType.habit]
+    lesson_tasks = [t for t in tasks if t.type == TaskType.lesson]
+    assert [t.title for t in habit_tasks] == titles
+    assert [t.status for t in habit_tasks] == [TaskStatus.completed, TaskStatus.pending, TaskStatus.pending]
+    assert len(lesson_tasks) == 3
+    # One call per lookup no matter how many programs the user is enrolled in
+    assert all(count == 1 for count in repo.calls.values())
@@ -26,6 +26,16 @@ target_metadata = Base.metadata
 
 DATABASE_SCHEMA = "journal"
 
+# Tables in the journal schema whose models live in other services
+# (agent_conversations: agent service SQL conversation store)
+EXTERNAL_TABLES = {"agent_conversations"}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Keep autogenerate from dropping tables owned by other services."""
+    table = obj if type_ == "table" else getattr(obj, "table", None)
+    return getattr(table, "name", None) not in EXTERNAL_TABLES
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -37,6 +47,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         include_schemas=True,
+        include_object=include_object,
         version_table_schema=DATABASE_SCHEMA,
         compare_type=True,
     )
@@ -72,6 +83,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             include_schemas=True,
+            include_object=include_object,
             version_table_schema=DATABASE_SCHEMA,
             compare_type=True,
         )
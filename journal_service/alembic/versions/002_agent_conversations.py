@@ -0,0 +1,44 @@
+"""agent conversations table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 12:00:00
+
+The agent service's SQL conversation store keeps chat conversations in the
+journal schema. It only creates the table itself in local/test environments,
+so production and staging get it from this migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+SCHEMA = 'journal'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'agent_conversations',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('tradition_id', sa.String(), nullable=True),
+        sa.Column('messages', postgresql.JSONB(), nullable=False),
+        sa.Column('state_metadata', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        schema=SCHEMA,
+    )
+
+    op.create_index('ix_journal_agent_conversations_user_id', 'agent_conversations', ['user_id'], schema=SCHEMA)
+    op.create_index('ix_journal_agent_conversations_updated_at', 'agent_conversations', ['updated_at'], schema=SCHEMA)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_journal_agent_conversations_updated_at', table_name='agent_conversations', schema=SCHEMA)
+    op.drop_index('ix_journal_agent_conversations_user_id', table_name='agent_conversations', schema=SCHEMA)
+    op.drop_table('agent_conversations', schema=SCHEMA)
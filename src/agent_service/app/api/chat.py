@@ -5,13 +5,20 @@ This module provides FastAPI endpoints for chat/ask operations
 using LangGraph workflows with RAG capabilities.
 """
 
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from shared.auth import CurrentUser, get_current_user
 
+from agent_service.app.services.conversation_store import (
+    ConversationStore,
+    get_conversation_store,
+    new_conversation_id,
+)
 from agent_service.langgraph_.graphs.chat_graph import ChatGraphFactory
 from agent_service.langgraph_.state import RAGAgentState, StateManager
 
@@ -62,14 +69,85 @@ class ConversationHistory(BaseModel):
     updated_at: str = Field(..., description="Last update timestamp")
 
 
-# In-memory conversation storage (in production, use a proper database)
-_conversations: Dict[str, RAGAgentState] = {}
+async def _get_owned_conversation(
+    store: ConversationStore, conversation_id: str, current_user: CurrentUser
+) -> RAGAgentState:
+    """Load a conversation, raising 404/403 if it is missing or not the user's."""
+    state = await store.get(conversation_id)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
+        )
+
+    # Check if user owns this conversation
+    if state.get("user_id") != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this conversation",
+        )
+
+    return state
+
+
+def _to_conversation_history(
+    conversation_id: str, state: RAGAgentState
+) -> ConversationHistory:
+    """Convert stored conversation state to its API representation."""
+    messages = [
+        ChatMessage(content=msg.get("content", ""), role=msg.get("role", "user"))
+        for msg in state.get("messages", [])
+    ]
+
+    # Get timestamps (use first and last message timestamps)
+    timestamps = [msg.get("timestamp", "") for msg in state.get("messages", [])]
+    created_at = timestamps[0] if timestamps else ""
+    updated_at = timestamps[-1] if timestamps else ""
+
+    return ConversationHistory(
+        conversation_id=conversation_id,
+        messages=messages,
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+
+
+async def _get_or_create_conversation(
+    store: ConversationStore, request: ChatRequest, current_user: CurrentUser
+) -> Tuple[str, RAGAgentState]:
+    """Return the conversation id and its state with the new user message added."""
+    conversation_id = request.conversation_id or new_conversation_id()
+
+    state = await store.get(conversation_id)
+    if state is not None:
+        if state.get("user_id") != str(current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied to this conversation",
+            )
+        # Continue existing conversation
+        state = StateManager.add_user_message(state, request.message)
+    else:
+        # Create new conversation
+        state = StateManager.create_initial_state(
+            user_id=str(current_user.id),
+            tradition_id=request.tradition_id,
+            initial_message=request.message,
+        )
+
+    await store.save(conversation_id, state)
+    return conversation_id, state
+
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 @router.post("/ask", response_model=ChatResponse)
 async def ask_question(
     request: ChatRequest,
     current_user: CurrentUser = Depends(get_current_user),
+    store: ConversationStore = Depends(get_conversation_store),
 ) -> ChatResponse:
     """
     Ask a question using RAG with LangGraph.
@@ -85,23 +163,10 @@ async def ask_question(
         logger.info(f"Processing chat request for user {current_user.id}")
 
         # Get or create conversation state
-        conversation_id = (
-            request.conversation_id or f"conv_{current_user.id}_{len(_conversations)}"
+        conversation_id, state = await _get_or_create_conversation(
+            store, request, current_user
         )
 
-        if conversation_id in _conversations:
-            # Continue existing conversation
-            state = _conversations[conversation_id]
-            state = StateManager.add_user_message(state, request.message)
-        else:
-            # Create new conversation
-            state = StateManager.create_initial_state(
-                user_id=str(current_user.id),
-                tradition_id=request.tradition_id,
-                initial_message=request.message,
-            )
-            _conversations[conversation_id] = state
-
         # Create chat graph
         chat_graph_builder = ChatGraphFactory.create_default_chat_graph(
             provider="openai",  # Could be configurable
@@ -109,10 +174,10 @@ async def ask_question(
 
         # Build and execute the graph
         chat_graph = chat_graph_builder.get_chat_graph()
-        updated_state = chat_graph.invoke(state)
+        updated_state = await chat_graph.ainvoke(state)
 
         # Update conversation storage
-        _conversations[conversation_id] = updated_state
+        await store.save(conversation_id, updated_state)
 
         # Extract response
         response = updated_state.get(
@@ -129,6 +194,11 @@ async def ask_question(
             "has_error": updated_state.get("error") is not None,
         }
 
+        context_stats = (updated_state.get("metadata") or {}).get("context")
+        if context_stats:
+            metadata["context_tokens"] = context_stats.get("tokens_used")
+            metadata["context"] = context_stats
+
         if updated_state.get("error"):
             metadata["error"] = updated_state["error"]
 
@@ -141,6 +211,8 @@ async def ask_question(
             metadata=metadata,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in chat request: {e}")
         raise HTTPException(
@@ -149,10 +221,64 @@ async def ask_question(
         )
 
 
+@router.post("/ask/stream")
+async def ask_question_stream(
+    request: ChatRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    store: ConversationStore = Depends(get_conversation_store),
+) -> StreamingResponse:
+    """
+    Ask a question and stream the answer as server-sent events.
+
+    Events, in order:
+        documents: {"conversation_id", "documents"} with retrieved-document metadata
+        token: {"content"} for each chunk generated by the LLM
+        done: {"conversation_id", "response", "context"} once generation
+            completes; context summarizes the prompt context and its tokens
+    An error event {"message"} replaces the rest of the stream on failure.
+
+    Args:
+        request: Chat request with message and context
+        current_user: Authenticated user
+
+    Returns:
+        A text/event-stream response
+    """
+    logger.info(f"Processing streaming chat request for user {current_user.id}")
+
+    conversation_id, state = await _get_or_create_conversation(
+        store, request, current_user
+    )
+    chat_graph_builder = ChatGraphFactory.create_default_chat_graph(
+        provider="openai",  # Could be configurable
+    )
+
+    async def _events() -> AsyncIterator[str]:
+        try:
+            async for event in chat_graph_builder.astream_answer(state):
+                event_type = event.pop("type")
+                if event_type in ("documents", "done"):
+                    event["conversation_id"] = conversation_id
+                yield _format_sse(event_type, event)
+        except Exception as e:
+            logger.error(f"Error in streaming chat request: {e}")
+            yield _format_sse("error", {"message": str(e)})
+        finally:
+            # Keep the conversation, including the streamed answer
+            await store.save(conversation_id, state)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/conversations", response_model=List[ConversationHistory])
 async def get_conversations(
     current_user: CurrentUser = Depends(get_current_user),
     limit: int = 10,
+    store: ConversationStore = Depends(get_conversation_store),
 ) -> List[ConversationHistory]:
     """
     Get user's conversation history.
@@ -162,41 +288,13 @@ async def get_conversations(
         limit: Maximum number of conversations to return
 
     Returns:
-        List of conversation histories
+        List of conversation histories, most recently updated first
     """
     try:
-        user_conversations = []
-
-        for conv_id, state in _conversations.items():
-            if state.get("user_id") == str(current_user.id):
-                # Convert state to conversation history
-                messages = []
-                for msg in state.get("messages", []):
-                    messages.append(
-                        ChatMessage(
-                            content=msg.get("content", ""), role=msg.get("role", "user")
-                        )
-                    )
-
-                # Get timestamps (use first and last message timestamps)
-                timestamps = [
-                    msg.get("timestamp", "") for msg in state.get("messages", [])
-                ]
-                created_at = timestamps[0] if timestamps else ""
-                updated_at = timestamps[-1] if timestamps else ""
-
-                user_conversations.append(
-                    ConversationHistory(
-                        conversation_id=conv_id,
-                        messages=messages,
-                        created_at=created_at,
-                        updated_at=updated_at,
-                    )
-                )
-
-        # Sort by updated_at (most recent first) and limit
-        user_conversations.sort(key=lambda x: x.updated_at, reverse=True)
-        return user_conversations[:limit]
+        conversations = await store.list_for_user(str(current_user.id), limit=limit)
+        return [
+            _to_conversation_history(conv_id, state) for conv_id, state in conversations
+        ]
 
     except Exception as e:
         logger.error(f"Error getting conversations: {e}")
@@ -210,6 +308,7 @@ async def get_conversations(
 async def get_conversation(
     conversation_id: str,
     current_user: CurrentUser = Depends(get_current_user),
+    store: ConversationStore = Depends(get_conversation_store),
 ) -> ConversationHistory:
     """
     Get a specific conversation.
@@ -222,40 +321,8 @@ async def get_conversation(
         Conversation history
     """
     try:
-        if conversation_id not in _conversations:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
-            )
-
-        state = _conversations[conversation_id]
-
-        # Check if user owns this conversation
-        if state.get("user_id") != str(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied to this conversation",
-            )
-
-        # Convert state to conversation history
-        messages = []
-        for msg in state.get("messages", []):
-            messages.append(
-                ChatMessage(
-                    content=msg.get("content", ""), role=msg.get("role", "user")
-                )
-            )
-
-        # Get timestamps
-        timestamps = [msg.get("timestamp", "") for msg in state.get("messages", [])]
-        created_at = timestamps[0] if timestamps else ""
-        updated_at = timestamps[-1] if timestamps else ""
-
-        return ConversationHistory(
-            conversation_id=conversation_id,
-            messages=messages,
-            created_at=created_at,
-            updated_at=updated_at,
-        )
+        state = await _get_owned_conversation(store, conversation_id, current_user)
+        return _to_conversation_history(conversation_id, state)
 
     except HTTPException:
         raise
@@ -271,6 +338,7 @@ async def get_conversation(
 async def delete_conversation(
     conversation_id: str,
     current_user: CurrentUser = Depends(get_current_user),
+    store: ConversationStore = Depends(get_conversation_store),
 ) -> Dict[str, str]:
     """
     Delete a conversation.
@@ -283,22 +351,10 @@ async def delete_conversation(
         Success message
     """
     try:
-        if conversation_id not in _conversations:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
-            )
-
-        state = _conversations[conversation_id]
-
-        # Check if user owns this conversation
-        if state.get("user_id") != str(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied to this conversation",
-            )
+        await _get_owned_conversation(store, conversation_id, current_user)
 
         # Delete conversation
-        del _conversations[conversation_id]
+        await store.delete(conversation_id)
 
         logger.info(
             f"Deleted conversation {conversation_id} for user {current_user.id}"
@@ -320,6 +376,7 @@ async def delete_conversation(
 async def clear_conversation(
     conversation_id: str,
     current_user: CurrentUser = Depends(get_current_user),
+    store: ConversationStore = Depends(get_conversation_store),
 ) -> Dict[str, str]:
     """
     Clear a conversation (remove all messages but keep the conversation).
@@ -332,19 +389,7 @@ async def clear_conversation(
         Success message
     """
     try:
-        if conversation_id not in _conversations:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
-            )
-
-        state = _conversations[conversation_id]
-
-        # Check if user owns this conversation
-        if state.get("user_id") != str(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied to this conversation",
-            )
+        state = await _get_owned_conversation(store, conversation_id, current_user)
 
         # Clear messages but keep conversation
         state["messages"] = []
@@ -353,6 +398,7 @@ async def clear_conversation(
         state["retrieved_documents"] = []
         state["error"] = None
         state["error_type"] = None
+        await store.save(conversation_id, state)
 
         logger.info(
             f"Cleared conversation {conversation_id} for user {current_user.id}"
@@ -3,6 +3,7 @@ import os
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 
+from agent_service.app.services.answer_cache import get_answer_cache
 from agent_service.clients.task_client import TaskClient
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,12 @@ async def trigger_reindex(tradition: str):
     try:
         secret = os.getenv("REINDEX_SECRET_KEY")
         result = await task_client.queue_tradition_reindex(tradition, secret)
+
+        # Answers for this tradition may be grounded in outdated documents
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            answer_cache.invalidate_tradition(tradition)
+
         return {
             "message": f"Accepted re-indexing task for tradition: {tradition}",
             "task_id": result.get("task_id"),
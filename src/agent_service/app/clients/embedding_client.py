@@ -2,17 +2,162 @@
 Embedding client for HTTP communication with embedding service.
 
 This client provides a clean interface for getting embeddings
-from the embedding service via HTTP.
+from the embedding service via HTTP, backed by a process-wide
+query-embedding cache.
 """
 
 import asyncio
 import logging
-from typing import List, Optional
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Approximate in-memory cost of one cached float (a Python float object plus
+# its slot in the tuple that holds the vector).
+_BYTES_PER_FLOAT = sys.getsizeof(0.0) + 8
+
+EmbeddingCacheKey = Tuple[str, str, str]
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Normalize text so trivially different queries share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU cache for query embeddings.
+
+    Entries are keyed by (provider, model, normalized text), bounded by an
+    approximate memory budget rather than an entry count, and expire after
+    a TTL. Hit/miss/eviction counters are kept for observability.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached vectors and keys
+            ttl: Seconds an entry stays valid (0 disables expiry)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (vector, stored_at, approximate size in bytes)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, text: str) -> EmbeddingCacheKey:
+        """Build the cache key for a provider/model/text combination."""
+        return (provider, model, normalize_embedding_text(text))
+
+    @staticmethod
+    def _entry_size(key: EmbeddingCacheKey, vector: Tuple[float, ...]) -> int:
+        """Approximate memory used by one entry."""
+        return len(vector) * _BYTES_PER_FLOAT + sum(sys.getsizeof(part) for part in key)
+
+    def get(self, key: EmbeddingCacheKey) -> Optional[List[float]]:
+        """Get a cached embedding, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, stored_at, _ = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(vector)
+
+    def put(self, key: EmbeddingCacheKey, embedding: List[float]) -> None:
+        """Store an embedding, evicting least recently used entries if needed."""
+        vector = tuple(embedding)
+        size = self._entry_size(key, vector)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (vector, time.monotonic(), size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: EmbeddingCacheKey) -> None:
+        """Remove an entry. Caller must hold the lock."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        """Clear all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached embeddings."""
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Global cache instance shared by every EmbeddingClient in the process
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get or create the process-wide embedding cache (None if disabled)."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        from agent_service.app.config import get_settings
+
+        settings = get_settings()
+        if not settings.embedding_cache_enabled:
+            return None
+        _embedding_cache = EmbeddingCache(
+            max_bytes=settings.embedding_cache_max_bytes,
+            ttl=settings.embedding_cache_ttl_seconds,
+        )
+    return _embedding_cache
+
 
 class EmbeddingClient:
     """
@@ -22,12 +167,19 @@ class EmbeddingClient:
     via HTTP requests.
     """
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        use_cache: bool = True,
+    ):
         """
         Initialize the embedding client.
 
         Args:
             base_url: Base URL for the embedding service (uses config if None)
+            cache: Optional cache instance (uses the process-wide cache if None)
+            use_cache: Whether to cache query embeddings at all
         """
         if base_url is None:
             # Get base URL from configuration
@@ -37,6 +189,10 @@ class EmbeddingClient:
             base_url = settings.embedding_base_url
 
         self.base_url = base_url
+        if use_cache:
+            self.cache = cache if cache is not None else get_embedding_cache()
+        else:
+            self.cache = None
         self.client = httpx.AsyncClient(timeout=30.0)
         self.logger = logging.getLogger(f"{__name__}.EmbeddingClient")
 
@@ -60,6 +216,14 @@ class EmbeddingClient:
             model = settings.embedding_model_name
             provider = settings.embedding_provider
 
+            cache_key = None
+            if self.cache is not None:
+                cache_key = EmbeddingCache.make_key(provider, model, text)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self.logger.debug("Embedding cache hit")
+                    return cached
+
             if provider == "openai":
                 # Use OpenAI's embedding API
                 headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
@@ -99,6 +263,8 @@ class EmbeddingClient:
                 return None
 
             self.logger.debug(f"Received embedding of length {len(embedding)}")
+            if cache_key is not None and embedding:
+                self.cache.put(cache_key, embedding)
             return embedding
 
         except httpx.HTTPStatusError as e:
@@ -148,6 +314,17 @@ class EmbeddingClient:
             self.logger.error(f"Failed to get embeddings: {e}")
             return [None] * len(texts)
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query-embedding cache statistics.
+
+        Returns:
+            Cache statistics, or {"enabled": False} if caching is off
+        """
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.get_stats()}
+
     async def health_check(self) -> bool:
         """
         Check if the embedding service is healthy.
@@ -1,25 +1,58 @@
+import asyncio
 import logging
 import os
 import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
 
+from qdrant_client import AsyncQdrantClient as AsyncQdrantClientBase
 from qdrant_client import QdrantClient as QdrantClientBase
 from qdrant_client.http.exceptions import ResponseHandlingException
 from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    KeywordIndexParams,
+    KeywordIndexType,
     MatchValue,
+    Modifier,
+    NamedSparseVector,
     PointStruct,
     Range,
     SearchRequest,
+    SparseVector,
+    SparseVectorParams,
     VectorParams,
 )
 
+from agent_service.app.services.reranking import hybrid_rank_scores
+from shared.sparse_vectors import (
+    SPARSE_VECTOR_NAME,
+    document_sparse_vector,
+    query_sparse_vector,
+)
+
 logger = logging.getLogger(__name__)
 
+# Storage layouts for personal journal vectors:
+# - per_user: one collection per user per tradition ({tradition}_{user_id}_personal)
+# - shared: one collection per tradition ({tradition}_personal) with an indexed
+#   user_id payload field; every personal search filters on user_id
+PERSONAL_LAYOUT_PER_USER = "per_user"
+PERSONAL_LAYOUT_SHARED = "shared"
+PERSONAL_LAYOUTS = (PERSONAL_LAYOUT_PER_USER, PERSONAL_LAYOUT_SHARED)
+
+# Payload fields read by the search paths (result text, QdrantService's
+# document metadata and hybrid ranking); searches request only these
+SEARCH_PAYLOAD_FIELDS = [
+    "text",
+    "source_id",
+    "source_type",
+    "document_type",
+    "timestamp",
+]
+
 
 @dataclass
 class SearchResult:
@@ -28,6 +61,7 @@ class SearchResult:
     text: str
     score: float
     metadata: Dict[str, Any]
+    id: Optional[str] = None
 
     def is_personal_content(self) -> bool:
         """Check if this result is from personal journal content."""
@@ -37,8 +71,33 @@ class SearchResult:
 class QdrantClient:
     """Production-ready Qdrant client for vector operations."""
 
-    def __init__(self, url: str = None, api_key: str = None):
-        """Initialize Qdrant client."""
+    def __init__(
+        self,
+        url: str = None,
+        api_key: str = None,
+        personal_layout: str = None,
+        on_disk_payload: Optional[bool] = None,
+    ):
+        """
+        Initialize Qdrant client.
+
+        With on_disk_payload (or QDRANT_ON_DISK_PAYLOAD=true), new collections
+        keep payloads, including the chunk text, on disk instead of in RAM.
+        """
+        if on_disk_payload is None:
+            on_disk_payload = (
+                os.getenv("QDRANT_ON_DISK_PAYLOAD", "false").lower() == "true"
+            )
+        self.on_disk_payload = on_disk_payload
+
+        self.personal_layout = personal_layout or os.getenv(
+            "QDRANT_PERSONAL_LAYOUT", PERSONAL_LAYOUT_PER_USER
+        )
+        if self.personal_layout not in PERSONAL_LAYOUTS:
+            raise ValueError(
+                f"Personal layout must be one of {PERSONAL_LAYOUTS}, got: {self.personal_layout}"
+            )
+
         if url:
             self.url = url
         else:
@@ -57,14 +116,27 @@ class QdrantClient:
 
         logger.info(f"Qdrant client initialized with URL: {self.url}")
         
-        # Initialize client with API key if provided
+        # Initialize clients with API key if provided. The sync client serves
+        # sync callers; every async method goes through the async client so
+        # searches never block the event loop.
         if self.api_key:
             self.client = QdrantClientBase(url=self.url, api_key=self.api_key)
+            self.async_client = AsyncQdrantClientBase(
+                url=self.url, api_key=self.api_key
+            )
             logger.info("Qdrant client initialized with API key authentication")
         else:
             self.client = QdrantClientBase(url=self.url)
+            self.async_client = AsyncQdrantClientBase(url=self.url)
             logger.info("Qdrant client initialized without authentication (local mode)")
 
+        # Names of collections known to exist, so hot paths skip listing
+        # every collection on the server
+        self._known_collections: Set[str] = set()
+        # Whether each collection has the BM25 sparse vector; collections
+        # created before lexical search was added lack it until rebuilt
+        self._sparse_collections: Dict[str, bool] = {}
+
     def _is_docker_environment(self) -> bool:
         """Check if running inside Docker container."""
         return (
@@ -77,7 +149,7 @@ class QdrantClient:
         """Check if Qdrant is healthy and reachable."""
         try:
             # Get collections info as a health check
-            collections = self.client.get_collections()
+            collections = await self.async_client.get_collections()
             return collections is not None
         except Exception as e:
             logger.error(f"Qdrant health check failed: {e}")
@@ -93,8 +165,15 @@ class QdrantClient:
         """Get collection name for shared knowledge base (PDFs)."""
         return f"{tradition}_knowledge"
 
+    @property
+    def uses_shared_personal_layout(self) -> bool:
+        """Whether personal vectors live in one shared, user_id-filtered collection."""
+        return self.personal_layout == PERSONAL_LAYOUT_SHARED
+
     def _get_personal_collection_name(self, tradition: str, user_id: str) -> str:
         """Get collection name for user's personal data (journals)."""
+        if self.uses_shared_personal_layout:
+            return f"{tradition}_personal"
         return f"{tradition}_{user_id}_personal"
 
     async def create_knowledge_collection(self, tradition: str) -> bool:
@@ -105,17 +184,83 @@ class QdrantClient:
     async def create_personal_collection(self, tradition: str, user_id: str) -> bool:
         """Create a personal collection for user's journal entries."""
         collection_name = self._get_personal_collection_name(tradition, user_id)
-        return await self._create_collection(collection_name)
+        tenant_field = "user_id" if self.uses_shared_personal_layout else None
+        return await self._create_collection(collection_name, tenant_field=tenant_field)
+
+    async def _collection_exists(self, collection_name: str) -> bool:
+        """
+        Check whether a collection exists, consulting the known-collections cache.
+
+        On a cache miss the full listing is fetched once and used to refresh
+        the cache, so repeated checks for existing collections are O(1).
+        """
+        if collection_name in self._known_collections:
+            return True
+
+        collections = await self.async_client.get_collections()
+        self._known_collections = {col.name for col in collections.collections}
+        return collection_name in self._known_collections
+
+    def invalidate_collection_cache(self, collection_name: Optional[str] = None) -> None:
+        """Forget one cached collection name, or all of them if none is given."""
+        if collection_name is None:
+            self._known_collections.clear()
+            self._sparse_collections.clear()
+        else:
+            self._known_collections.discard(collection_name)
+            self._sparse_collections.pop(collection_name, None)
+
+    async def _supports_sparse(self, collection_name: str) -> bool:
+        """Check (once per collection) whether it stores BM25 sparse vectors."""
+        if collection_name in self._sparse_collections:
+            return self._sparse_collections[collection_name]
 
-    async def _create_collection(self, collection_name: str) -> bool:
-        """Internal method to create a collection with standard configuration."""
         try:
-            # Check if collection already exists
-            collections = self.client.get_collections()
-            existing_names = [col.name for col in collections.collections]
+            info = await self.async_client.get_collection(
+                collection_name=collection_name
+            )
+        except Exception as e:
+            logger.debug(f"Could not inspect collection {collection_name}: {e}")
+            return False
+
+        sparse_vectors = info.config.params.sparse_vectors or {}
+        supported = SPARSE_VECTOR_NAME in sparse_vectors
+        if not supported:
+            logger.info(
+                f"Collection {collection_name} has no '{SPARSE_VECTOR_NAME}' sparse "
+                f"vector; rebuild it to enable keyword search"
+            )
+        self._sparse_collections[collection_name] = supported
+        return supported
+
+    @staticmethod
+    def _point_vector(text: str, embedding: List[float], sparse: bool) -> Any:
+        """Build a point's vector, adding the BM25 sparse vector if supported."""
+        if not sparse:
+            return embedding
+        indices, values = document_sparse_vector(text)
+        return {
+            "": embedding,
+            SPARSE_VECTOR_NAME: SparseVector(indices=indices, values=values),
+        }
+
+    async def _create_collection(
+        self, collection_name: str, tenant_field: Optional[str] = None
+    ) -> bool:
+        """
+        Internal method to create a collection with standard configuration.
+
+        If tenant_field is given, a new collection also gets a keyword payload
+        index on that field, marked as the tenant key so Qdrant co-locates each
+        tenant's points and filtered searches stay cheap.
 
-            if collection_name in existing_names:
-                logger.info(f"Collection {collection_name} already exists")
+        New collections also get a BM25 sparse vector for keyword search;
+        Qdrant's IDF modifier supplies the inverse document frequency.
+        """
+        try:
+            # Check if collection already exists
+            if await self._collection_exists(collection_name):
+                logger.debug(f"Collection {collection_name} already exists")
                 return True
 
             # Get vector size from configuration
@@ -125,12 +270,26 @@ class QdrantClient:
             logger.info(f"Creating collection '{collection_name}' with expected vector size: {vector_size}")
 
             # Create new collection with vector configuration
-            self.client.create_collection(
+            await self.async_client.create_collection(
                 collection_name=collection_name,
                 vectors_config=VectorParams(
                     size=vector_size, distance=Distance.COSINE
                 ),
+                sparse_vectors_config={
+                    SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+                },
+                on_disk_payload=self.on_disk_payload,
             )
+            if tenant_field:
+                await self.async_client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=tenant_field,
+                    field_schema=KeywordIndexParams(
+                        type=KeywordIndexType.KEYWORD, is_tenant=True
+                    ),
+                )
+            self._known_collections.add(collection_name)
+            self._sparse_collections[collection_name] = True
 
             logger.info(f"Created collection: {collection_name}")
             return True
@@ -212,17 +371,24 @@ class QdrantClient:
                 raise ValueError(f"Embedding vector size mismatch: expected {expected_size}, got {len(embedding)}")
 
             # Create point with embedding and metadata
+            sparse = await self._supports_sparse(collection_name)
             point = PointStruct(
-                id=point_id, vector=embedding, payload={"text": text, **metadata}
+                id=point_id,
+                vector=self._point_vector(text, embedding, sparse),
+                payload={"text": text, **metadata},
             )
 
             # Upload point to collection
-            self.client.upsert(collection_name=collection_name, points=[point])
+            await self.async_client.upsert(
+                collection_name=collection_name, points=[point]
+            )
 
             logger.debug(f"Indexed document {point_id} in collection {collection_name}")
             return point_id
 
         except Exception as e:
+            # The collection may have been deleted elsewhere; re-check next time
+            self.invalidate_collection_cache(collection_name)
             logger.error(f"Failed to index document in {collection_name}: {e}")
             raise
 
@@ -232,8 +398,21 @@ class QdrantClient:
         query_embedding: List[float],
         limit: int = 10,
         metadata_filter: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        payload_fields: Optional[List[str]] = None,
     ) -> List[SearchResult]:
-        """Search for similar documents in a collection."""
+        """
+        Search for similar documents in a collection.
+
+        Args:
+            collection_name: Collection to search
+            query_embedding: Query vector
+            limit: Maximum number of results
+            metadata_filter: Exact-match payload filters
+            score_threshold: Minimum similarity, applied by Qdrant
+            payload_fields: Payload fields to return ("text" is always
+                included); None returns the whole payload
+        """
         try:
             # Validate embedding vector size
             from agent_service.app.config import get_settings
@@ -248,33 +427,18 @@ class QdrantClient:
                 )
                 return []
 
-            # Build filter if metadata filtering is requested
-            search_filter = None
-            if metadata_filter:
-                conditions = []
-                for key, value in metadata_filter.items():
-                    conditions.append(
-                        FieldCondition(key=key, match=MatchValue(value=value))
-                    )
-                search_filter = Filter(must=conditions)
-
             # Perform search
-            search_results = self.client.search(
+            search_results = await self.async_client.search(
                 collection_name=collection_name,
                 query_vector=query_embedding,
-                query_filter=search_filter,
+                query_filter=self._match_filter(metadata_filter),
                 limit=limit,
-                with_payload=True,
+                score_threshold=score_threshold,
+                with_payload=self._payload_selector(payload_fields),
             )
 
             # Convert to SearchResult objects
-            results = []
-            for hit in search_results:
-                payload = hit.payload or {}
-                text = payload.pop("text", "")
-
-                result = SearchResult(text=text, score=hit.score, metadata=payload)
-                results.append(result)
+            results = [self._to_search_result(hit) for hit in search_results]
 
             logger.debug(
                 f"Found {len(results)} results in collection {collection_name}"
@@ -285,6 +449,79 @@ class QdrantClient:
             logger.error(f"Failed to search in collection {collection_name}: {e}")
             return []
 
+    async def sparse_search(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 10,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        payload_fields: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """
+        Keyword (BM25) search against a collection's sparse vectors.
+
+        Returns [] for collections without the sparse vector and for
+        queries that contain only stopwords.
+        """
+        indices, values = query_sparse_vector(query)
+        if not indices:
+            return []
+
+        try:
+            if not await self._supports_sparse(collection_name):
+                return []
+
+            search_results = await self.async_client.search(
+                collection_name=collection_name,
+                query_vector=NamedSparseVector(
+                    name=SPARSE_VECTOR_NAME,
+                    vector=SparseVector(indices=indices, values=values),
+                ),
+                query_filter=self._match_filter(metadata_filter),
+                limit=limit,
+                with_payload=self._payload_selector(payload_fields),
+            )
+
+            results = [self._to_search_result(hit) for hit in search_results]
+            logger.debug(
+                f"Found {len(results)} keyword results in collection {collection_name}"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed keyword search in collection {collection_name}: {e}")
+            return []
+
+    @staticmethod
+    def _match_filter(metadata_filter: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        """Build an exact-match payload filter (None if there is nothing to match)."""
+        if not metadata_filter:
+            return None
+        return Filter(
+            must=[
+                FieldCondition(key=key, match=MatchValue(value=value))
+                for key, value in metadata_filter.items()
+            ]
+        )
+
+    @staticmethod
+    def _payload_selector(payload_fields: Optional[List[str]]) -> Any:
+        """Build the with_payload argument for a search."""
+        if payload_fields is None:
+            return True
+        if "text" in payload_fields:
+            return list(payload_fields)
+        return ["text", *payload_fields]
+
+    @staticmethod
+    def _to_search_result(hit: Any) -> SearchResult:
+        """Convert a scored point to a SearchResult."""
+        payload = hit.payload or {}
+        text = payload.pop("text", "")
+        return SearchResult(
+            text=text, score=hit.score, metadata=payload, id=str(hit.id)
+        )
+
     async def search_personal_documents_by_date(
         self,
         user_id: str,
@@ -301,21 +538,24 @@ class QdrantClient:
         )
 
         # Build a filter for the date range
-        date_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="created_at",
-                    range=Range(
-                        gte=start_date.timestamp(),
-                        lte=end_date.timestamp(),
-                    ),
-                )
-            ]
-        )
+        conditions = [
+            FieldCondition(
+                key="created_at",
+                range=Range(
+                    gte=start_date.timestamp(),
+                    lte=end_date.timestamp(),
+                ),
+            )
+        ]
+        if self.uses_shared_personal_layout:
+            conditions.append(
+                FieldCondition(key="user_id", match=MatchValue(value=user_id))
+            )
+        date_filter = Filter(must=conditions)
 
         try:
             # Perform search with the date filter
-            search_results = self.client.search(
+            search_results = await self.async_client.search(
                 collection_name=collection_name,
                 query_vector=query_embedding,
                 query_filter=date_filter,
@@ -362,6 +602,8 @@ class QdrantClient:
         date_range: Optional[tuple] = None,
         entry_types: Optional[List[str]] = None,
         limit: int = 10,
+        score_threshold: Optional[float] = None,
+        payload_fields: Optional[List[str]] = None,
     ) -> List[SearchResult]:
         """
         Perform hybrid search across knowledge base and/or personal content.
@@ -376,53 +618,161 @@ class QdrantClient:
             date_range: Optional tuple of (start_date, end_date) for filtering
             entry_types: Optional list of entry types to filter by
             limit: Maximum number of results to return
+            score_threshold: Minimum raw similarity, applied by Qdrant in each
+                channel before hybrid ranking
+            payload_fields: Payload fields to return (None for all)
 
         Returns:
             List of SearchResult objects ranked by relevance
         """
-        all_results = []
+        searches = []
 
         # Search shared knowledge base
         if include_knowledge:
-            knowledge_collection = await self.get_or_create_knowledge_collection(
-                tradition
-            )
-            knowledge_filter = {"source_type": "pdf"}
-
-            knowledge_results = await self.search_documents(
-                collection_name=knowledge_collection,
-                query_embedding=query_embedding,
-                limit=limit,
-                metadata_filter=knowledge_filter,
+            searches.append(
+                self._search_knowledge_channel(
+                    tradition, query_embedding, limit, score_threshold, payload_fields
+                )
             )
-            all_results.extend(knowledge_results)
 
         # Search personal content
         if include_personal:
-            personal_collection = await self.get_or_create_personal_collection(
-                tradition, user_id
+            searches.append(
+                self._search_personal_channel(
+                    tradition,
+                    user_id,
+                    query_embedding,
+                    entry_types,
+                    limit,
+                    score_threshold,
+                    payload_fields,
+                )
             )
-            personal_filter = {"source_type": "journal"}
 
-            if entry_types:
-                personal_filter["document_type"] = entry_types[0]  # Simplified for now
-
-            personal_results = await self.search_documents(
-                collection_name=personal_collection,
-                query_embedding=query_embedding,
-                limit=limit,
-                metadata_filter=personal_filter,
-            )
-            all_results.extend(personal_results)
+        # Fan both searches out at once; each channel returns [] on failure
+        channel_results = await asyncio.gather(*searches)
+        all_results = [result for results in channel_results for result in results]
 
         # Apply hybrid ranking and return top results
         ranked_results = self._apply_hybrid_ranking(all_results, query)
         return ranked_results[:limit]
 
+    async def _search_knowledge_channel(
+        self,
+        tradition: str,
+        query_embedding: List[float],
+        limit: int,
+        score_threshold: Optional[float] = None,
+        payload_fields: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """Search a tradition's shared knowledge collection."""
+        knowledge_collection = await self.get_or_create_knowledge_collection(tradition)
+
+        return await self.search_documents(
+            collection_name=knowledge_collection,
+            query_embedding=query_embedding,
+            limit=limit,
+            metadata_filter={"source_type": "pdf"},
+            score_threshold=score_threshold,
+            payload_fields=payload_fields,
+        )
+
+    async def _search_personal_channel(
+        self,
+        tradition: str,
+        user_id: str,
+        query_embedding: List[float],
+        entry_types: Optional[List[str]],
+        limit: int,
+        score_threshold: Optional[float] = None,
+        payload_fields: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """Search a user's personal journal collection."""
+        personal_collection = await self.get_or_create_personal_collection(
+            tradition, user_id
+        )
+
+        return await self.search_documents(
+            collection_name=personal_collection,
+            query_embedding=query_embedding,
+            limit=limit,
+            metadata_filter=self._personal_filter(user_id, entry_types),
+            score_threshold=score_threshold,
+            payload_fields=payload_fields,
+        )
+
+    def _personal_filter(
+        self, user_id: str, entry_types: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Payload filter selecting a user's journal points."""
+        personal_filter = {"source_type": "journal"}
+        if self.uses_shared_personal_layout:
+            personal_filter["user_id"] = user_id
+
+        if entry_types:
+            personal_filter["document_type"] = entry_types[0]  # Simplified for now
+        return personal_filter
+
+    async def lexical_search(
+        self,
+        query: str,
+        tradition: str,
+        user_id: Optional[str] = None,
+        include_personal: bool = True,
+        include_knowledge: bool = True,
+        entry_types: Optional[List[str]] = None,
+        limit: int = 10,
+        payload_fields: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """
+        Keyword (BM25) search across knowledge base and/or personal content.
+
+        The channels are queried concurrently and merged by BM25 score.
+        Personal content is only searched when a user_id is given.
+
+        Returns:
+            List of SearchResult objects, best keyword match first
+        """
+        searches = []
+
+        if include_knowledge:
+            knowledge_collection = await self.get_or_create_knowledge_collection(
+                tradition
+            )
+            searches.append(
+                self.sparse_search(
+                    collection_name=knowledge_collection,
+                    query=query,
+                    limit=limit,
+                    metadata_filter={"source_type": "pdf"},
+                    payload_fields=payload_fields,
+                )
+            )
+
+        if include_personal and user_id:
+            personal_collection = await self.get_or_create_personal_collection(
+                tradition, user_id
+            )
+            searches.append(
+                self.sparse_search(
+                    collection_name=personal_collection,
+                    query=query,
+                    limit=limit,
+                    metadata_filter=self._personal_filter(user_id, entry_types),
+                    payload_fields=payload_fields,
+                )
+            )
+
+        channel_results = await asyncio.gather(*searches)
+        all_results = [result for results in channel_results for result in results]
+        all_results.sort(key=lambda r: r.score, reverse=True)
+        return all_results[:limit]
+
     async def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection and all its documents."""
         try:
-            self.client.delete_collection(collection_name=collection_name)
+            await self.async_client.delete_collection(collection_name=collection_name)
+            self.invalidate_collection_cache(collection_name)
             logger.info(f"Deleted collection: {collection_name}")
             return True
         except Exception as e:
@@ -434,7 +784,7 @@ class QdrantClient:
     ) -> Optional[Dict[str, Any]]:
         """Get information about a collection."""
         try:
-            collection_info = self.client.get_collection(
+            collection_info = await self.async_client.get_collection(
                 collection_name=collection_name
             )
             return {
@@ -457,28 +807,19 @@ class QdrantClient:
         - Semantic similarity: 0.7
         - Recency bonus: 0.2 (for journal entries)
         - Personal relevance: 0.1
-        """
-        for result in results:
-            base_score = result.score
-
-            # Recency bonus for journal entries
-            recency_bonus = 0.0
-            if result.is_personal_content():
-                try:
-                    timestamp = datetime.fromisoformat(
-                        result.metadata.get("timestamp", "")
-                    )
-                    days_ago = (datetime.now(timezone.utc) - timestamp).days
-                    # Decay bonus over time (max 0.2 bonus for today, 0.1 for week old, 0 for month old)
-                    recency_bonus = max(0, 0.2 * (1 - days_ago / 30))
-                except (ValueError, TypeError):
-                    recency_bonus = 0.0
 
-            # Personal relevance bonus
-            personal_bonus = 0.1 if result.is_personal_content() else 0.0
+        Scores are computed for all results at once (see hybrid_rank_scores).
+        """
+        if not results:
+            return []
 
-            # Combine scores
-            result.score = (0.7 * base_score) + recency_bonus + personal_bonus
+        scores = hybrid_rank_scores(
+            [result.score for result in results],
+            [result.is_personal_content() for result in results],
+            [result.metadata.get("timestamp") for result in results],
+        )
+        for result, score in zip(results, scores.tolist()):
+            result.score = score
 
         # Sort by final score
         return sorted(results, key=lambda r: r.score, reverse=True)
@@ -509,10 +850,11 @@ class QdrantClient:
             A list of the point IDs for the indexed documents.
         """
         collection_name = self.get_knowledge_collection_name(tradition)
+        sparse = await self._supports_sparse(collection_name)
         points = [
             PointStruct(
                 id=str(uuid.uuid4()),
-                vector=embedding,
+                vector=self._point_vector(text, embedding, sparse),
                 payload={**metadata, "text": text},
             )
             for text, embedding, metadata in zip(texts, embeddings, metadatas)
@@ -521,7 +863,7 @@ class QdrantClient:
         if not points:
             return []
 
-        operation_info = self.client.upsert(
+        operation_info = await self.async_client.upsert(
             collection_name=collection_name, wait=True, points=points
         )
         logger.info(
@@ -583,6 +925,33 @@ class QdrantClient:
             )
             return []
 
+    async def asearch_knowledge_base(
+        self,
+        tradition: str,
+        query_embedding: List[float],
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        payload_fields: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """
+        Async search in knowledge base only.
+        Used by async callers so the search does not block the event loop.
+        """
+        collection_name = self.get_knowledge_collection_name(tradition)
+        return await self.search_documents(
+            collection_name=collection_name,
+            query_embedding=query_embedding,
+            limit=limit,
+            metadata_filter={"source_type": "pdf"},
+            score_threshold=score_threshold,
+            payload_fields=payload_fields,
+        )
+
+    async def close(self) -> None:
+        """Close the underlying Qdrant clients."""
+        await self.async_client.close()
+        self.client.close()
+
 
 # Global client instance
 _qdrant_client = None
@@ -18,6 +18,55 @@ from agent_service.app.services.qdrant_service import QdrantService
 
 logger = logging.getLogger(__name__)
 
+# Rank constant for reciprocal-rank fusion; 60 is the usual choice and
+# keeps a single top-ranked hit from dominating documents found by both channels
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Document]], k: int = RRF_K, limit: Optional[int] = None
+) -> List[Document]:
+    """
+    Fuse ranked document lists with reciprocal-rank fusion.
+
+    Each document scores sum(1 / (k + rank)) over the lists it appears in,
+    so only ranks matter and dense similarities and BM25 scores never
+    need to be put on the same scale. Documents are matched by their "id"
+    metadata, falling back to the page content.
+
+    Args:
+        rankings: Ranked document lists, best first
+        k: Rank constant
+        limit: Maximum number of documents to return
+
+    Returns:
+        Fused documents, best first, with the fused score in "rrf_score"
+    """
+    fused: Dict[str, Document] = {}
+    scores: Dict[str, float] = {}
+
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = str(document.metadata.get("id") or document.page_content)
+            if key not in fused:
+                fused[key] = Document(
+                    page_content=document.page_content,
+                    metadata=dict(document.metadata),
+                )
+                scores[key] = 0.0
+            scores[key] += 1.0 / (k + rank)
+
+    ordered = sorted(fused, key=lambda key: scores[key], reverse=True)
+    if limit is not None:
+        ordered = ordered[:limit]
+
+    documents = []
+    for key in ordered:
+        document = fused[key]
+        document.metadata["rrf_score"] = scores[key]
+        documents.append(document)
+    return documents
+
 
 class QdrantRetriever(BaseRetriever):
     """
@@ -36,6 +85,8 @@ class QdrantRetriever(BaseRetriever):
     search_type: str = Field(default="hybrid")
     k: int = Field(default=5)
     score_threshold: Optional[float] = Field(default=None)
+    reranker: Optional[Any] = Field(default=None)
+    candidate_multiplier: int = Field(default=1)
 
     class Config:
         """Pydantic configuration."""
@@ -52,6 +103,8 @@ class QdrantRetriever(BaseRetriever):
         search_type: str = "hybrid",
         k: int = 5,
         score_threshold: Optional[float] = None,
+        reranker: Optional[Any] = None,
+        candidate_multiplier: int = 1,
         **kwargs,
     ):
         """
@@ -66,6 +119,10 @@ class QdrantRetriever(BaseRetriever):
             search_type: Type of search ('vector', 'keyword', 'hybrid')
             k: Number of documents to retrieve
             score_threshold: Optional minimum score threshold
+            reranker: Optional re-ranking stage (see app.services.reranking)
+                applied to the retrieved candidates
+            candidate_multiplier: With a reranker, retrieve k times this many
+                candidates for it to choose from
         """
         super().__init__(
             qdrant_service=qdrant_service,
@@ -76,6 +133,8 @@ class QdrantRetriever(BaseRetriever):
             search_type=search_type,
             k=k,
             score_threshold=score_threshold,
+            reranker=reranker,
+            candidate_multiplier=candidate_multiplier,
             **kwargs,
         )
 
@@ -88,6 +147,13 @@ class QdrantRetriever(BaseRetriever):
             f"with search_type='{search_type}', k={k}"
         )
 
+    @property
+    def candidate_k(self) -> int:
+        """Number of documents each search channel retrieves."""
+        if self.reranker is None:
+            return self.k
+        return self.k * max(self.candidate_multiplier, 1)
+
     async def _aget_relevant_documents(self, query: str) -> List[Document]:
         """
         Async version of get_relevant_documents.
@@ -106,13 +172,28 @@ class QdrantRetriever(BaseRetriever):
                 f"QdrantRetriever: Using tradition '{tradition}' for query '{query[:50]}...'"
             )
 
+            # Embed the query once and share the vector with every dense
+            # search path; keyword search needs no embedding
+            query_embedding = None
+            if self.search_type != "keyword":
+                query_embedding = await self.embedding_service.get_embedding(query)
+
             # Perform search based on type
             if self.search_type == "vector":
-                documents = await self._async_vector_search(query, tradition)
+                documents = await self._async_vector_search(
+                    query, tradition, query_embedding
+                )
             elif self.search_type == "keyword":
-                documents = await self._async_keyword_search(query, tradition)
+                documents = await self._async_keyword_search(
+                    query, tradition, query_embedding
+                )
             else:  # hybrid
-                documents = await self._async_hybrid_search(query, tradition)
+                documents = await self._async_hybrid_search(
+                    query, tradition, query_embedding
+                )
+
+            if self.reranker is not None:
+                documents = await self.reranker.rerank(query, documents, self.k)
 
             logger.info(
                 f"Retrieved {len(documents)} documents for query: {query[:100]}..."
@@ -127,6 +208,10 @@ class QdrantRetriever(BaseRetriever):
         """
         Retrieve relevant documents for a query (sync version).
 
+        Inside a running event loop this has to run the search on a helper
+        thread with its own loop; async callers should use ainvoke instead,
+        which goes straight to _aget_relevant_documents.
+
         Args:
             query: Search query
 
@@ -152,13 +237,19 @@ class QdrantRetriever(BaseRetriever):
             # No event loop running, create a new one
             return asyncio.run(self._aget_relevant_documents(query))
 
-    async def _async_vector_search(self, query: str, tradition: str) -> List[Document]:
+    async def _async_vector_search(
+        self,
+        query: str,
+        tradition: str,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
         """
         Perform async vector search.
 
         Args:
             query: Search query
             tradition: Tradition to search in
+            query_embedding: Optional precomputed embedding for the query
 
         Returns:
             List of search results
@@ -167,49 +258,83 @@ class QdrantRetriever(BaseRetriever):
         return await self.qdrant_service.search_knowledge_base(
             query=query,
             tradition=tradition,
-            limit=self.k,
+            limit=self.candidate_k,
             score_threshold=self.score_threshold or 0.0,
+            query_embedding=query_embedding,
         )
 
-    async def _async_keyword_search(self, query: str, tradition: str) -> List[Document]:
+    async def _async_keyword_search(
+        self,
+        query: str,
+        tradition: str,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
         """
-        Perform async keyword search.
+        Perform async keyword (BM25) search.
+
+        Searches the knowledge base, plus the user's journal entries when
+        a user is set. Dense score thresholds do not apply to BM25 scores.
 
         Args:
             query: Search query
             tradition: Tradition to search in
+            query_embedding: Unused; keyword search needs no embedding
 
         Returns:
             List of search results
         """
-        # For now, use the same as vector search
-        return await self._async_vector_search(query, tradition)
+        return await self.qdrant_service.keyword_search(
+            query=query,
+            tradition=tradition,
+            user_id=self.user_id,
+            include_personal=bool(self.user_id),
+            include_knowledge=True,
+            limit=self.candidate_k,
+        )
 
-    async def _async_hybrid_search(self, query: str, tradition: str) -> List[Document]:
+    async def _async_hybrid_search(
+        self,
+        query: str,
+        tradition: str,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
         """
         Perform async hybrid search.
 
+        Dense and keyword channels are queried concurrently and fused with
+        reciprocal-rank fusion, so exact terms (e.g. exercise names) that
+        embed poorly are still recalled.
+
         Args:
             query: Search query
             tradition: Tradition to search in
+            query_embedding: Optional precomputed embedding for the query
 
         Returns:
             List of search results
         """
         if self.user_id:
             # Use the proper hybrid search that includes both knowledge and personal data
-            return await self.qdrant_service.hybrid_search(
+            dense_search = self.qdrant_service.hybrid_search(
                 query=query,
                 user_id=self.user_id,
                 tradition=tradition,
                 include_personal=True,
                 include_knowledge=True,
-                limit=self.k,
+                limit=self.candidate_k,
                 score_threshold=self.score_threshold or 0.0,
+                query_embedding=query_embedding,
             )
         else:
             # Just use knowledge base search if no user_id
-            return await self._async_vector_search(query, tradition)
+            dense_search = self._async_vector_search(query, tradition, query_embedding)
+
+        dense_documents, keyword_documents = await asyncio.gather(
+            dense_search, self._async_keyword_search(query, tradition)
+        )
+        return reciprocal_rank_fusion(
+            [dense_documents, keyword_documents], limit=self.candidate_k
+        )
 
     def _build_search_filters(self) -> Dict[str, Any]:
         """
@@ -461,8 +586,8 @@ class QdrantRetrieverFactory:
         Returns:
             Configured QdrantRetriever
         """
-        qdrant_service = QdrantService()
         embedding_service = EmbeddingService()
+        qdrant_service = QdrantService(embedding_service=embedding_service)
 
         return QdrantRetriever(
             qdrant_service=qdrant_service,
@@ -493,8 +618,8 @@ class QdrantRetrieverFactory:
         Returns:
             Configured QdrantRetriever for vector search
         """
-        qdrant_service = QdrantService()
         embedding_service = EmbeddingService()
+        qdrant_service = QdrantService(embedding_service=embedding_service)
 
         return QdrantRetriever(
             qdrant_service=qdrant_service,
@@ -523,8 +648,8 @@ class QdrantRetrieverFactory:
         Returns:
             Configured QdrantRetriever for high precision
         """
-        qdrant_service = QdrantService()
         embedding_service = EmbeddingService()
+        qdrant_service = QdrantService(embedding_service=embedding_service)
 
         return QdrantRetriever(
             qdrant_service=qdrant_service,
@@ -63,6 +63,10 @@ class Settings(BaseSettings):
     llm_temperature: float = Field(default=0.7, env="LLM_TEMPERATURE")
     llm_max_tokens: int = Field(default=1000, env="LLM_MAX_TOKENS")
     llm_streaming: bool = Field(default=False, env="LLM_STREAMING")
+    llm_model_pool_size: int = Field(default=32, env="LLM_MODEL_POOL_SIZE")
+    llm_health_cache_ttl_seconds: float = Field(
+        default=60.0, env="LLM_HEALTH_CACHE_TTL_SECONDS"
+    )
 
     # Provider-specific settings - loaded as-is from env
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
@@ -86,6 +90,61 @@ class Settings(BaseSettings):
     # Embedding vector size - REQUIRED
     embedding_vector_size: int = Field(env="EMBEDDING_VECTOR_SIZE")
 
+    # Query-embedding cache
+    embedding_cache_enabled: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, env="EMBEDDING_CACHE_MAX_BYTES"
+    )
+    embedding_cache_ttl_seconds: float = Field(
+        default=3600.0, env="EMBEDDING_CACHE_TTL_SECONDS"
+    )
+
+    # RAG answer cache
+    answer_cache_enabled: bool = Field(default=False, env="ANSWER_CACHE_ENABLED")
+    answer_cache_max_entries: int = Field(default=1024, env="ANSWER_CACHE_MAX_ENTRIES")
+    answer_cache_ttl_seconds: float = Field(
+        default=3600.0, env="ANSWER_CACHE_TTL_SECONDS"
+    )
+    answer_cache_similarity_threshold: Optional[float] = Field(
+        default=None, env="ANSWER_CACHE_SIMILARITY_THRESHOLD"
+    )
+
+    # Re-ranking of retrieved documents
+    rerank_enabled: bool = Field(default=True, env="RERANK_ENABLED")
+    rerank_candidate_multiplier: int = Field(
+        default=2, env="RERANK_CANDIDATE_MULTIPLIER"
+    )
+    rerank_mmr_lambda: float = Field(default=0.7, env="RERANK_MMR_LAMBDA")
+    rerank_duplicate_threshold: float = Field(
+        default=0.9, env="RERANK_DUPLICATE_THRESHOLD"
+    )
+    rerank_cross_encoder_model: Optional[str] = Field(
+        default=None, env="RERANK_CROSS_ENCODER_MODEL"
+    )
+    rerank_batch_size: int = Field(default=16, env="RERANK_BATCH_SIZE")
+    rerank_latency_budget_ms: float = Field(
+        default=250.0, env="RERANK_LATENCY_BUDGET_MS"
+    )
+
+    # RAG prompt context
+    rag_context_token_budget: int = Field(
+        default=3000, env="RAG_CONTEXT_TOKEN_BUDGET"
+    )
+
+    # Chat conversation store
+    conversation_store_backend: str = Field(
+        default="memory", env="CONVERSATION_STORE_BACKEND"
+    )
+    conversation_store_max_size: int = Field(
+        default=1000, env="CONVERSATION_STORE_MAX_SIZE"
+    )
+    conversation_store_ttl_seconds: float = Field(
+        default=24 * 3600.0, env="CONVERSATION_STORE_TTL_SECONDS"
+    )
+    conversation_history_max_messages: int = Field(
+        default=20, env="CONVERSATION_HISTORY_MAX_MESSAGES"
+    )
+
     # Data directory
     data_dir: str = Field(default="./data", env="DATA_DIR")
 
@@ -160,6 +219,16 @@ class Settings(BaseSettings):
             raise ValueError(f"LLM provider must be one of {supported}, got: {v}")
         return v
 
+    @validator("conversation_store_backend")
+    def validate_conversation_store_backend(cls, v):
+        """Validate conversation store backend is supported."""
+        supported = ["memory", "sql"]
+        if v not in supported:
+            raise ValueError(
+                f"Conversation store backend must be one of {supported}, got: {v}"
+            )
+        return v
+
     @validator("embedding_provider")
     def validate_embedding_provider(cls, v):
         """Validate embedding provider is supported."""
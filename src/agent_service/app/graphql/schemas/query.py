@@ -76,7 +76,7 @@ class Query:
 
             # Build and execute the graph
             chat_graph = chat_graph_builder.get_chat_graph()
-            updated_state = chat_graph.invoke(state)
+            updated_state = await chat_graph.ainvoke(state)
 
             # Extract response
             response = updated_state.get(
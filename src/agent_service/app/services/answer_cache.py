@@ -0,0 +1,250 @@
+"""
+Answer cache for the RAG chain.
+
+Caches generated answers keyed by the retrieval context they were
+produced from, so repeated questions against the same documents skip
+the LLM completion. An optional embedding-similarity lookup also
+serves near-duplicate phrasings of a cached question.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from agent_service.app.clients.embedding_client import normalize_embedding_text
+
+logger = logging.getLogger(__name__)
+
+# (tradition, include_personal, user scope, sorted document ids)
+AnswerContextKey = Tuple[str, bool, Optional[str], Tuple[str, ...]]
+# context key + normalized question
+AnswerCacheKey = Tuple[str, bool, Optional[str], Tuple[str, ...], str]
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings share an entry."""
+    return normalize_embedding_text(question).lower().rstrip("?!. ")
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity between two vectors (0.0 if either is zero)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU cache for generated RAG answers.
+
+    Entries are keyed by tradition, the personal-context flag, the user
+    (only when personal context is included, so journal-grounded answers
+    are never shared), the retrieved document ids and the normalized
+    question. Entries expire after a TTL.
+
+    When similarity_threshold is set, a miss falls back to the cached
+    question with the same retrieval context whose embedding is at least
+    that similar to the new question.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        similarity_threshold: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl: Seconds an answer stays valid (0 disables expiry)
+            similarity_threshold: Minimum cosine similarity for a
+                near-duplicate hit (None disables similarity lookups)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        # key -> (answer, question embedding or None, stored_at)
+        self._entries: OrderedDict = OrderedDict()
+        # context key -> keys cached for that retrieval context
+        self._by_context: Dict[AnswerContextKey, Set[AnswerCacheKey]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        tradition: str,
+        include_personal: bool,
+        user_id: Optional[str],
+        document_ids: Iterable[Any],
+        question: str,
+    ) -> AnswerCacheKey:
+        """Build the cache key for a question and its retrieval context."""
+        return (
+            tradition,
+            include_personal,
+            user_id if include_personal else None,
+            tuple(sorted(str(doc_id) for doc_id in document_ids)),
+            normalize_question(question),
+        )
+
+    def _is_expired(self, stored_at: float) -> bool:
+        """Check whether an entry has outlived the TTL."""
+        return bool(self.ttl) and time.monotonic() - stored_at > self.ttl
+
+    def get(
+        self, key: AnswerCacheKey, embedding: Optional[List[float]] = None
+    ) -> Optional[str]:
+        """
+        Get a cached answer.
+
+        Args:
+            key: Key from make_key
+            embedding: Question embedding, enables the similarity fallback
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                answer, _, stored_at = entry
+                if not self._is_expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return answer
+                self._remove(key)
+
+            if embedding is not None and self.similarity_threshold is not None:
+                similar_key = self._find_similar(key, embedding)
+                if similar_key is not None:
+                    self._entries.move_to_end(similar_key)
+                    self.similar_hits += 1
+                    return self._entries[similar_key][0]
+
+            self.misses += 1
+            return None
+
+    def _find_similar(
+        self, key: AnswerCacheKey, embedding: List[float]
+    ) -> Optional[AnswerCacheKey]:
+        """
+        Find the most similar live question with the same retrieval context.
+
+        Caller must hold the lock.
+        """
+        best_key, best_score = None, self.similarity_threshold
+        for candidate in list(self._by_context.get(key[:4], ())):
+            _, candidate_embedding, stored_at = self._entries[candidate]
+            if self._is_expired(stored_at):
+                self._remove(candidate)
+                continue
+            if candidate_embedding is None:
+                continue
+
+            score = _cosine_similarity(embedding, candidate_embedding)
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        return best_key
+
+    def put(
+        self,
+        key: AnswerCacheKey,
+        answer: str,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        """Store an answer, evicting least recently used entries if needed."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (answer, embedding, time.monotonic())
+            self._by_context.setdefault(key[:4], set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: AnswerCacheKey) -> None:
+        """Remove an entry. Caller must hold the lock."""
+        self._entries.pop(key)
+        keys = self._by_context.get(key[:4])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_context[key[:4]]
+
+    def invalidate_tradition(self, tradition: str) -> int:
+        """
+        Drop every answer generated for a tradition.
+
+        Returns:
+            The number of entries removed
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == tradition]
+            for key in stale:
+                self._remove(key)
+
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached answers for '{tradition}'")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Clear all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._by_context.clear()
+            self.hits = 0
+            self.similar_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        """Get the number of cached answers."""
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            hits = self.hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "similarity_threshold": self.similarity_threshold,
+                "hits": self.hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+
+# Global cache instance shared by every RAG node in the process
+_answer_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """Get or create the process-wide answer cache (None if disabled)."""
+    global _answer_cache
+    if _answer_cache is None:
+        from agent_service.app.config import get_settings
+
+        settings = get_settings()
+        if not settings.answer_cache_enabled:
+            return None
+        _answer_cache = AnswerCache(
+            max_entries=settings.answer_cache_max_entries,
+            ttl=settings.answer_cache_ttl_seconds,
+            similarity_threshold=settings.answer_cache_similarity_threshold,
+        )
+    return _answer_cache
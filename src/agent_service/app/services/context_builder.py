@@ -0,0 +1,239 @@
+"""
+Token-budgeted context assembly for the RAG prompt.
+
+Retrieved chunks arrive best first. The builder merges overlapping chunks
+of the same source (the splitter's chunk_overlap repeats text between
+neighbours), then packs sections into a token budget counted with the
+tokenizer of the configured provider and model.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Characters per token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+NO_DOCUMENTS_CONTEXT = "No relevant documents found."
+
+
+@lru_cache(maxsize=32)
+def _load_encoding(provider: Optional[str], model: Optional[str]) -> Any:
+    """
+    Load the tiktoken encoding for a provider/model (None if unavailable).
+
+    OpenAI models use their own encoding. Ollama and Gemini tokenizers are
+    not available locally, so cl100k_base serves as a close approximation.
+    """
+    try:
+        import tiktoken
+
+        if provider == "openai" and model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding("o200k_base")
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(
+            f"No tokenizer for {provider}/{model}, estimating token counts: {e}"
+        )
+        return None
+
+
+class TokenCounter:
+    """Count and truncate text in tokens of a provider's model."""
+
+    def __init__(self, provider: Optional[str] = None, model: Optional[str] = None):
+        """
+        Initialize the counter.
+
+        Args:
+            provider: LLM provider ("openai", "ollama", "gemini")
+            model: Model name, used to pick the OpenAI encoding
+        """
+        self.provider = provider
+        self.model = model
+        self._encoding = _load_encoding(provider, model)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        if self._encoding is None:
+            return math.ceil(len(text) / CHARS_PER_TOKEN)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text down to at most max_tokens tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is None:
+            return text[: max_tokens * CHARS_PER_TOKEN]
+        tokens = self._encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self._encoding.decode(tokens[:max_tokens])
+
+
+@dataclass
+class BuiltContext:
+    """Prompt context assembled by ContextBuilder."""
+
+    text: str
+    tokens_used: int
+    token_budget: int
+    documents_used: int
+    documents_total: int
+    truncated: bool
+
+    def as_metadata(self) -> Dict[str, Any]:
+        """Summary for response metadata."""
+        return {
+            "tokens_used": self.tokens_used,
+            "token_budget": self.token_budget,
+            "documents_used": self.documents_used,
+            "documents_total": self.documents_total,
+            "truncated": self.truncated,
+        }
+
+
+@dataclass
+class _Section:
+    """One or more merged chunks of a single source."""
+
+    source: str
+    text: str
+    documents: int = 1
+
+
+def _merge_overlap(first: str, second: str, min_overlap: int) -> Optional[str]:
+    """
+    Join two chunks if the end of first repeats as the start of second.
+
+    Returns:
+        The merged text, or None if the chunks do not overlap
+    """
+    if len(second) < min_overlap:
+        return None
+    start = first.find(second[:min_overlap], max(len(first) - len(second), 0))
+    while start != -1:
+        if second.startswith(first[start:]):
+            return first + second[len(first) - start :]
+        start = first.find(second[:min_overlap], start + 1)
+    return None
+
+
+class ContextBuilder:
+    """
+    Pack retrieved documents into a token budget.
+
+    Documents are taken in retrieval order, so the highest-ranked chunks
+    are kept first. A section that does not fit is trimmed if at least
+    min_section_tokens remain, otherwise skipped in favour of smaller
+    sections further down.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 3000,
+        token_counter: Optional[TokenCounter] = None,
+        min_section_tokens: int = 64,
+        min_overlap_chars: int = 50,
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            token_budget: Maximum context tokens (0 or less means unlimited)
+            token_counter: Counter for the target model
+            min_section_tokens: Smallest trimmed section worth including
+            min_overlap_chars: Shortest shared text that marks two chunks
+                of a source as neighbours
+        """
+        self.token_budget = token_budget
+        self.token_counter = token_counter or TokenCounter()
+        self.min_section_tokens = min_section_tokens
+        self.min_overlap_chars = min_overlap_chars
+
+    def merge_adjacent(self, documents: List[Document]) -> List[_Section]:
+        """
+        Merge overlapping chunks of the same source.
+
+        A merged section takes the place of its highest-ranked chunk.
+        """
+        sections: List[_Section] = []
+        for document in documents:
+            source = str(document.metadata.get("source", "Unknown"))
+            text = document.page_content
+            for section in sections:
+                if section.source != source:
+                    continue
+                merged = _merge_overlap(
+                    section.text, text, self.min_overlap_chars
+                ) or _merge_overlap(text, section.text, self.min_overlap_chars)
+                if merged is not None:
+                    section.text = merged
+                    section.documents += 1
+                    break
+            else:
+                sections.append(_Section(source=source, text=text))
+        return sections
+
+    @staticmethod
+    def _format_section(index: int, source: str, text: str) -> str:
+        """Format a section the way the RAG prompt expects."""
+        return f"Document {index} (Source: {source}):\n{text}\n"
+
+    def build(self, documents: List[Document]) -> BuiltContext:
+        """
+        Assemble the prompt context for retrieved documents.
+
+        Returns:
+            The context text with its token count and packing summary
+        """
+        counter = self.token_counter
+        unlimited = self.token_budget <= 0
+        parts: List[str] = []
+        used = 0
+        documents_used = 0
+        truncated = False
+
+        for section in self.merge_adjacent(documents):
+            part = self._format_section(len(parts) + 1, section.source, section.text)
+            # The trailing newline accounts for the separator between parts
+            cost = counter.count(part + "\n")
+            remaining = self.token_budget - used
+
+            if unlimited or cost <= remaining:
+                parts.append(part)
+                used += cost
+                documents_used += section.documents
+                continue
+
+            truncated = True
+            if remaining < self.min_section_tokens:
+                continue
+
+            header = self._format_section(len(parts) + 1, section.source, "")
+            room = remaining - counter.count(header + "\n") - 1
+            text = counter.truncate(section.text, room)
+            if text:
+                part = self._format_section(len(parts) + 1, section.source, text)
+                parts.append(part)
+                used += counter.count(part + "\n")
+                documents_used += section.documents
+
+        context = "\n".join(parts) if parts else NO_DOCUMENTS_CONTEXT
+        return BuiltContext(
+            text=context,
+            tokens_used=counter.count(context),
+            token_budget=self.token_budget,
+            documents_used=documents_used,
+            documents_total=len(documents),
+            truncated=truncated,
+        )
@@ -0,0 +1,365 @@
+"""
+Conversation storage for the chat API.
+
+This module provides pluggable stores for chat conversation state:
+a bounded in-memory LRU store with a TTL, and a SQL-backed store
+that persists conversations through the service's unit of work.
+Both keep only a window of recent messages per conversation.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from agent_service.langgraph_.state import RAGAgentState
+from shared.secrets import should_auto_create_schema
+
+logger = logging.getLogger(__name__)
+
+
+def new_conversation_id() -> str:
+    """Generate a new, globally unique conversation id."""
+    return f"conv_{uuid.uuid4().hex}"
+
+
+def truncate_history(
+    messages: List[Dict[str, Any]], max_messages: int
+) -> List[Dict[str, Any]]:
+    """
+    Keep only the most recent messages of a conversation.
+
+    Args:
+        messages: Conversation messages, oldest first
+        max_messages: Window size (0 or less keeps everything)
+
+    Returns:
+        The last max_messages messages
+    """
+    if max_messages <= 0 or len(messages) <= max_messages:
+        return list(messages)
+    return list(messages[-max_messages:])
+
+
+def compact_state(state: RAGAgentState, max_messages: int) -> RAGAgentState:
+    """
+    Build the state that is worth keeping between turns.
+
+    Retrieved documents and errors belong to a single turn, so they are
+    dropped, and the message history is cut to the configured window.
+    """
+    messages = truncate_history(state.get("messages") or [], max_messages)
+    return RAGAgentState(
+        user_id=state.get("user_id"),
+        tradition_id=state.get("tradition_id"),
+        messages=messages,
+        query=state.get("query"),
+        last_response=state.get("last_response"),
+        retrieved_documents=[],
+        metadata=dict(state.get("metadata") or {}),
+        error=None,
+        error_type=None,
+    )
+
+
+def _copy_state(state: RAGAgentState) -> RAGAgentState:
+    """Copy a stored state so callers can mutate it freely."""
+    copied = state.copy()
+    copied["messages"] = list(state.get("messages") or [])
+    copied["retrieved_documents"] = list(state.get("retrieved_documents") or [])
+    copied["metadata"] = dict(state.get("metadata") or {})
+    return copied
+
+
+class ConversationStore(Protocol):
+    """
+    Protocol for conversation storage backends.
+
+    Stores are keyed by conversation id and hold compacted
+    RAGAgentState values (see compact_state).
+    """
+
+    async def get(self, conversation_id: str) -> Optional[RAGAgentState]:
+        """Get a conversation's state, or None if it does not exist."""
+        ...
+
+    async def save(self, conversation_id: str, state: RAGAgentState) -> None:
+        """Create or replace a conversation's state."""
+        ...
+
+    async def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation. Returns False if it did not exist."""
+        ...
+
+    async def list_for_user(
+        self, user_id: str, limit: int = 10
+    ) -> List[Tuple[str, RAGAgentState]]:
+        """List a user's conversations, most recently updated first."""
+        ...
+
+
+class InMemoryConversationStore:
+    """
+    Bounded in-memory conversation store.
+
+    Conversations are evicted least recently used first once max_size is
+    reached, and expire ttl seconds after their last update. Suitable for
+    development and single-instance deployments.
+    """
+
+    def __init__(
+        self, max_size: int = 1000, ttl: float = 24 * 3600.0, max_messages: int = 20
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_size: Maximum number of conversations kept
+            ttl: Seconds a conversation lives after its last update (0 disables expiry)
+            max_messages: Message history window kept per conversation
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_messages = max_messages
+        # conversation_id -> (state, updated_at)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _is_expired(self, updated_at: float) -> bool:
+        """Check whether an entry has outlived the TTL."""
+        return bool(self.ttl) and time.monotonic() - updated_at > self.ttl
+
+    async def get(self, conversation_id: str) -> Optional[RAGAgentState]:
+        """Get a conversation's state, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is None:
+                return None
+
+            state, updated_at = entry
+            if self._is_expired(updated_at):
+                del self._entries[conversation_id]
+                return None
+
+            self._entries.move_to_end(conversation_id)
+            return _copy_state(state)
+
+    async def save(self, conversation_id: str, state: RAGAgentState) -> None:
+        """Store a conversation, evicting the least recently used if full."""
+        compacted = compact_state(state, self.max_messages)
+        with self._lock:
+            self._entries.pop(conversation_id, None)
+            self._entries[conversation_id] = (compacted, time.monotonic())
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation."""
+        with self._lock:
+            return self._entries.pop(conversation_id, None) is not None
+
+    async def list_for_user(
+        self, user_id: str, limit: int = 10
+    ) -> List[Tuple[str, RAGAgentState]]:
+        """List a user's live conversations, most recently updated first."""
+        with self._lock:
+            expired = [
+                conversation_id
+                for conversation_id, (_, updated_at) in self._entries.items()
+                if self._is_expired(updated_at)
+            ]
+            for conversation_id in expired:
+                del self._entries[conversation_id]
+
+            user_entries = [
+                (conversation_id, state, updated_at)
+                for conversation_id, (state, updated_at) in reversed(
+                    self._entries.items()
+                )
+                if state.get("user_id") == user_id
+            ]
+
+        user_entries.sort(key=lambda entry: entry[2], reverse=True)
+        return [
+            (conversation_id, _copy_state(state))
+            for conversation_id, state, _ in user_entries[:limit]
+        ]
+
+    def clear(self) -> None:
+        """Remove all conversations."""
+        with self._lock:
+            self._entries.clear()
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        """Get the number of stored conversations."""
+        return len(self._entries)
+
+
+class SqlConversationStore:
+    """
+    Conversation store backed by the agent service database.
+
+    Each operation runs in its own UnitOfWork, so conversations survive
+    restarts and are shared between instances. In local and test
+    environments the conversation table is created on first use; elsewhere
+    it comes from the journal service's Alembic migrations.
+    """
+
+    def __init__(self, session_factory=None, max_messages: int = 20):
+        """
+        Initialize the store.
+
+        Args:
+            session_factory: Optional async session factory (defaults to the global one)
+            max_messages: Message history window kept per conversation
+        """
+        self.session_factory = session_factory
+        self.max_messages = max_messages
+        self._table_ready = False
+
+    def _uow(self):
+        """Create a unit of work for one store operation."""
+        # Imported lazily so the in-memory backend never creates the engine
+        from agent_service.app.db.uow import UnitOfWork
+
+        return UnitOfWork(session_factory=self.session_factory)
+
+    async def _ensure_table(self, uow) -> None:
+        """Create the conversation table once per store if needed."""
+        if self._table_ready:
+            return
+        # In production/staging, the table is managed by Alembic
+        if not should_auto_create_schema():
+            self._table_ready = True
+            return
+
+        from agent_service.models.sql.conversation import ConversationModel
+
+        connection = await uow.session.connection()
+        await connection.run_sync(
+            lambda sync_conn: ConversationModel.__table__.create(
+                sync_conn, checkfirst=True
+            )
+        )
+        self._table_ready = True
+
+    @staticmethod
+    def _to_state(row) -> RAGAgentState:
+        """Rebuild agent state from a stored conversation row."""
+        messages = list(row.messages or [])
+        last_user = next(
+            (msg for msg in reversed(messages) if msg.get("role") == "user"), None
+        )
+        last_assistant = next(
+            (msg for msg in reversed(messages) if msg.get("role") == "assistant"),
+            None,
+        )
+        return RAGAgentState(
+            user_id=row.user_id,
+            tradition_id=row.tradition_id,
+            messages=messages,
+            query=last_user.get("content") if last_user else None,
+            last_response=last_assistant.get("content") if last_assistant else None,
+            retrieved_documents=[],
+            metadata=dict(row.state_metadata or {}),
+            error=None,
+            error_type=None,
+        )
+
+    async def get(self, conversation_id: str) -> Optional[RAGAgentState]:
+        """Get a conversation's state, or None if it does not exist."""
+        from agent_service.models.sql.conversation import ConversationModel
+
+        async with self._uow() as uow:
+            await self._ensure_table(uow)
+            row = await uow.session.get(ConversationModel, conversation_id)
+            return self._to_state(row) if row is not None else None
+
+    async def save(self, conversation_id: str, state: RAGAgentState) -> None:
+        """Create or replace a conversation's state."""
+        from agent_service.models.sql.conversation import ConversationModel
+
+        compacted = compact_state(state, self.max_messages)
+        async with self._uow() as uow:
+            await self._ensure_table(uow)
+            row = await uow.session.get(ConversationModel, conversation_id)
+            if row is None:
+                row = ConversationModel(
+                    id=conversation_id, user_id=str(compacted["user_id"])
+                )
+                uow.session.add(row)
+
+            row.tradition_id = compacted.get("tradition_id")
+            row.messages = compacted["messages"]
+            row.state_metadata = compacted["metadata"]
+            row.updated_at = datetime.utcnow()
+
+    async def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation."""
+        from agent_service.models.sql.conversation import ConversationModel
+
+        async with self._uow() as uow:
+            await self._ensure_table(uow)
+            row = await uow.session.get(ConversationModel, conversation_id)
+            if row is None:
+                return False
+            await uow.session.delete(row)
+            return True
+
+    async def list_for_user(
+        self, user_id: str, limit: int = 10
+    ) -> List[Tuple[str, RAGAgentState]]:
+        """List a user's conversations, most recently updated first."""
+        from sqlalchemy import select
+
+        from agent_service.models.sql.conversation import ConversationModel
+
+        async with self._uow() as uow:
+            await self._ensure_table(uow)
+            result = await uow.session.execute(
+                select(ConversationModel)
+                .where(ConversationModel.user_id == user_id)
+                .order_by(ConversationModel.updated_at.desc())
+                .limit(limit)
+            )
+            return [(row.id, self._to_state(row)) for row in result.scalars().all()]
+
+
+# Global conversation store instance
+_conversation_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create the process-wide conversation store from settings."""
+    global _conversation_store
+    if _conversation_store is None:
+        from agent_service.app.config import get_settings
+
+        settings = get_settings()
+        if settings.conversation_store_backend == "sql":
+            _conversation_store = SqlConversationStore(
+                max_messages=settings.conversation_history_max_messages,
+            )
+        else:
+            _conversation_store = InMemoryConversationStore(
+                max_size=settings.conversation_store_max_size,
+                ttl=settings.conversation_store_ttl_seconds,
+                max_messages=settings.conversation_history_max_messages,
+            )
+        logger.info(
+            f"Using {settings.conversation_store_backend} conversation store"
+        )
+    return _conversation_store
+
+
+def set_conversation_store(store: Optional[ConversationStore]) -> None:
+    """Replace the process-wide conversation store (None resets it)."""
+    global _conversation_store
+    _conversation_store = store
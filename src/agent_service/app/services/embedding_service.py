@@ -6,7 +6,7 @@ abstracting away the underlying embedding client implementation.
 """
 
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from agent_service.app.clients.embedding_client import EmbeddingClient
 
@@ -113,6 +113,15 @@ class EmbeddingService:
             self.logger.warning(f"Using zero vector for text: {text[:100]}...")
             return [0.0] * 1536  # Default embedding size
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query-embedding cache statistics.
+
+        Returns:
+            Hit/miss/size statistics from the underlying embedding client
+        """
+        return self.embedding_client.get_cache_stats()
+
     def validate_embedding(self, embedding: List[float]) -> bool:
         """
         Validate that an embedding vector is properly formatted.
@@ -823,6 +823,7 @@ class LLMService:
                 "missing_prompts": missing_prompts,
                 "provider_status": provider_status,
                 "working_providers": working_providers,
+                "model_pool": self.provider_manager.get_pool_stats(),
                 "tool_registry": tool_registry_health,
                 "llm_configured": self.llm is not None,  # DEPRECATED
             }
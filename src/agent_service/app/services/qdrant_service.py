@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional
 
 from langchain_core.documents import Document
 
-from agent_service.app.clients.qdrant_client import QdrantClient
+from agent_service.app.clients.qdrant_client import SEARCH_PAYLOAD_FIELDS, QdrantClient
 
 logger = logging.getLogger(__name__)
 
@@ -23,18 +23,54 @@ class QdrantService:
     search, indexing, and collection management.
     """
 
-    def __init__(self, qdrant_client: Optional[QdrantClient] = None):
+    def __init__(
+        self,
+        qdrant_client: Optional[QdrantClient] = None,
+        embedding_service=None,
+    ):
         """
         Initialize the Qdrant service.
 
         Args:
             qdrant_client: Optional Qdrant client instance
+            embedding_service: Optional embedding service used when callers
+                do not pass a precomputed query embedding
         """
         self.qdrant_client = qdrant_client or QdrantClient()
+        self.embedding_service = embedding_service
         self.logger = logging.getLogger(f"{__name__}.QdrantService")
 
+    async def _resolve_query_embedding(
+        self, query: str, query_embedding: Optional[List[float]] = None
+    ) -> Optional[List[float]]:
+        """
+        Return the caller's precomputed embedding, or embed the query once.
+
+        Args:
+            query: Search query
+            query_embedding: Optional precomputed embedding for the query
+
+        Returns:
+            Embedding vector or None if embedding failed
+        """
+        if query_embedding:
+            return query_embedding
+
+        if self.embedding_service is None:
+            # Imported lazily to avoid a circular import with the embedding service
+            from agent_service.app.services.embedding_service import EmbeddingService
+
+            self.embedding_service = EmbeddingService()
+
+        return await self.embedding_service.get_embedding(query)
+
     async def search_knowledge_base(
-        self, query: str, tradition: str, limit: int = 10, score_threshold: float = 0.7
+        self,
+        query: str,
+        tradition: str,
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Document]:
         """
         Search knowledge base using Qdrant.
@@ -44,6 +80,7 @@ class QdrantService:
             tradition: Tradition to search in
             limit: Maximum number of results
             score_threshold: Minimum similarity score
+            query_embedding: Optional precomputed embedding for the query
 
         Returns:
             List of relevant documents
@@ -51,33 +88,30 @@ class QdrantService:
         try:
             self.logger.debug(f"Searching knowledge base for query: {query[:100]}...")
 
-            # Get query embedding first
-            from agent_service.app.services.embedding_service import EmbeddingService
-
-            embedding_service = EmbeddingService()
-
-            # Get embedding for the query
-            query_embedding = await embedding_service.get_embedding(query)
+            query_embedding = await self._resolve_query_embedding(
+                query, query_embedding
+            )
             if not query_embedding:
                 self.logger.warning("Failed to get query embedding")
                 return []
 
-            results = self.qdrant_client.search_knowledge_base(
+            # Qdrant applies the score threshold and returns only the
+            # payload fields needed below
+            results = await self.qdrant_client.asearch_knowledge_base(
                 tradition=tradition,
                 query_embedding=query_embedding,
                 limit=limit,
+                score_threshold=score_threshold if score_threshold > 0 else None,
+                payload_fields=SEARCH_PAYLOAD_FIELDS,
             )
 
-            # Filter results by score threshold if specified
-            if score_threshold > 0:
-                results = [r for r in results if r.score >= score_threshold]
-
             # Convert to LangChain documents
             documents = []
             for result in results:
                 doc = Document(
                     page_content=result.text,
                     metadata={
+                        "id": result.id,
                         "source": result.metadata.get("source_id", "unknown"),
                         "score": result.score,
                         "tradition": tradition,
@@ -157,6 +191,7 @@ class QdrantService:
         entry_types: Optional[List[str]] = None,
         limit: int = 10,
         score_threshold: float = 0.7,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Document]:
         """
         Combined search across knowledge and personal data.
@@ -170,6 +205,7 @@ class QdrantService:
             entry_types: Types of entries to include
             limit: Maximum number of results
             score_threshold: Minimum similarity score
+            query_embedding: Optional precomputed embedding for the query
 
         Returns:
             List of relevant documents
@@ -177,13 +213,9 @@ class QdrantService:
         try:
             self.logger.debug(f"Performing hybrid search for user {user_id}")
 
-            # Get query embedding first
-            from agent_service.app.services.embedding_service import EmbeddingService
-
-            embedding_service = EmbeddingService()
-
-            # Get embedding for the query
-            query_embedding = await embedding_service.get_embedding(query)
+            query_embedding = await self._resolve_query_embedding(
+                query, query_embedding
+            )
             if not query_embedding:
                 self.logger.warning("Failed to get query embedding")
                 return []
@@ -197,18 +229,17 @@ class QdrantService:
                 include_knowledge=include_knowledge,
                 entry_types=entry_types,
                 limit=limit,
+                score_threshold=score_threshold if score_threshold > 0 else None,
+                payload_fields=SEARCH_PAYLOAD_FIELDS,
             )
 
-            # Filter results by score threshold if specified
-            if score_threshold > 0:
-                results = [r for r in results if r.score >= score_threshold]
-
             # Convert to LangChain documents
             documents = []
             for result in results:
                 doc = Document(
                     page_content=result.text,
                     metadata={
+                        "id": result.id,
                         "source": result.metadata.get("source_id", "unknown"),
                         "score": result.score,
                         "tradition": tradition,
@@ -227,6 +258,71 @@ class QdrantService:
             self.logger.error(f"Failed to perform hybrid search: {e}")
             return []
 
+    async def keyword_search(
+        self,
+        query: str,
+        tradition: str,
+        user_id: Optional[str] = None,
+        include_personal: bool = True,
+        include_knowledge: bool = True,
+        entry_types: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> List[Document]:
+        """
+        Keyword (BM25) search across knowledge and personal data.
+
+        Needs no query embedding. Personal entries are only searched when
+        a user_id is given.
+
+        Args:
+            query: Search query
+            tradition: Tradition to search in
+            user_id: Optional user ID for personal entries
+            include_personal: Whether to include personal entries
+            include_knowledge: Whether to include knowledge base
+            entry_types: Types of entries to include
+            limit: Maximum number of results
+
+        Returns:
+            List of relevant documents, best keyword match first
+        """
+        try:
+            self.logger.debug(f"Performing keyword search for query: {query[:100]}...")
+
+            results = await self.qdrant_client.lexical_search(
+                query=query,
+                tradition=tradition,
+                user_id=user_id,
+                include_personal=include_personal,
+                include_knowledge=include_knowledge,
+                entry_types=entry_types,
+                limit=limit,
+                payload_fields=SEARCH_PAYLOAD_FIELDS,
+            )
+
+            documents = []
+            for result in results:
+                metadata = {
+                    "id": result.id,
+                    "source": result.metadata.get("source_id", "unknown"),
+                    "score": result.score,
+                    "tradition": tradition,
+                    "document_type": result.metadata.get(
+                        "document_type",
+                        "personal" if result.is_personal_content() else "knowledge",
+                    ),
+                }
+                if user_id:
+                    metadata["user_id"] = user_id
+                documents.append(Document(page_content=result.text, metadata=metadata))
+
+            self.logger.debug(f"Found {len(documents)} documents in keyword search")
+            return documents
+
+        except Exception as e:
+            self.logger.error(f"Failed to perform keyword search: {e}")
+            return []
+
     async def index_knowledge_documents(
         self,
         tradition: str,
@@ -0,0 +1,389 @@
+"""
+Re-ranking of retrieved documents.
+
+This module provides the re-ranking stage that runs between retrieval and
+prompt construction:
+
+- hybrid_rank_scores: vectorized similarity/recency/personal scoring used
+  by QdrantClient's hybrid ranking
+- CrossEncoderReranker: optional local CPU cross-encoder, scored in
+  batches within a latency budget
+- MMRReranker: maximal marginal relevance, which drops near-duplicate
+  chunks (e.g. from overlapping splits) and diversifies the rest
+
+Rerankers share an async rerank(query, documents, limit) interface and are
+chained with RerankingPipeline.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+
+from shared.sparse_vectors import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Hybrid ranking weights
+SIMILARITY_WEIGHT = 0.7
+RECENCY_WEIGHT = 0.2  # Full bonus for today's journal entries
+RECENCY_WINDOW_DAYS = 30  # Bonus decays to zero over this many days
+PERSONAL_WEIGHT = 0.1
+
+# Metadata keys tried, in order, for a document's relevance in MMR
+RELEVANCE_KEYS = ("rerank_score", "rrf_score", "score")
+
+_SECONDS_PER_DAY = 86400.0
+
+
+@lru_cache(maxsize=4096)
+def _timestamp_seconds(value: Any) -> float:
+    """
+    Convert a payload timestamp to epoch seconds (NaN if unparseable).
+
+    Memoized, since the same journal entries come back query after query.
+    Naive ISO timestamps are taken as UTC.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def hybrid_rank_scores(
+    similarities: Sequence[float],
+    is_personal: Sequence[bool],
+    timestamps: Sequence[Any],
+    now: Optional[datetime] = None,
+) -> np.ndarray:
+    """
+    Combine semantic similarity, recency and personal relevance.
+
+    score = 0.7 * similarity + recency bonus + personal bonus, where journal
+    entries get a 0.1 personal bonus and a recency bonus decaying linearly
+    from 0.2 today to 0 after 30 days.
+
+    Args:
+        similarities: Raw similarity scores
+        is_personal: Whether each result is personal (journal) content
+        timestamps: ISO strings or epoch seconds (None if unknown)
+        now: Reference time, defaults to the current UTC time
+
+    Returns:
+        Array of combined scores, in input order
+    """
+    similarity = np.asarray(similarities, dtype=float)
+    personal = np.asarray(is_personal, dtype=bool)
+    reference = (now or datetime.now(timezone.utc)).timestamp()
+
+    def _seconds(value: Any) -> float:
+        try:
+            return _timestamp_seconds(value)
+        except TypeError:  # Unhashable payload value
+            return math.nan
+
+    created = np.fromiter(
+        (_seconds(value) for value in timestamps), dtype=float, count=len(similarity)
+    )
+    days_ago = np.floor((reference - created) / _SECONDS_PER_DAY)
+    recency = np.maximum(RECENCY_WEIGHT * (1 - days_ago / RECENCY_WINDOW_DAYS), 0.0)
+    recency = np.where(personal & np.isfinite(recency), recency, 0.0)
+
+    return SIMILARITY_WEIGHT * similarity + recency + PERSONAL_WEIGHT * personal
+
+
+class Reranker(Protocol):
+    """Protocol for re-ranking stages."""
+
+    async def rerank(
+        self, query: str, documents: List[Document], limit: int
+    ) -> List[Document]:
+        """Return at most limit documents, best first."""
+        ...
+
+
+# Loaded cross-encoder models, shared by every reranker in the process
+_cross_encoders: Dict[str, Any] = {}
+_cross_encoder_lock = threading.Lock()
+
+
+class CrossEncoderReranker:
+    """
+    Re-rank documents with a local cross-encoder on CPU.
+
+    Requires the optional sentence-transformers package; without it (or if
+    the model fails to load) documents pass through unchanged. Candidates
+    are scored in batches until the latency budget is spent; documents
+    left unscored keep their retrieval order after the scored ones.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 16,
+        latency_budget_ms: float = 250.0,
+    ):
+        """
+        Initialize the reranker.
+
+        Args:
+            model_name: Cross-encoder model to load
+            batch_size: Query/document pairs scored per model call
+            latency_budget_ms: Time after which no further batch is started
+                (0 disables the budget)
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.latency_budget_ms = latency_budget_ms
+
+    def _get_model(self) -> Optional[Any]:
+        """Load the model once per process (None if unavailable)."""
+        with _cross_encoder_lock:
+            if self.model_name not in _cross_encoders:
+                try:
+                    from sentence_transformers import CrossEncoder
+
+                    _cross_encoders[self.model_name] = CrossEncoder(
+                        self.model_name, device="cpu"
+                    )
+                    logger.info(f"Loaded cross-encoder '{self.model_name}'")
+                except ImportError:
+                    logger.warning(
+                        "sentence-transformers is not installed; "
+                        "cross-encoder re-ranking is disabled"
+                    )
+                    _cross_encoders[self.model_name] = None
+                except Exception as e:
+                    logger.error(
+                        f"Failed to load cross-encoder '{self.model_name}': {e}"
+                    )
+                    _cross_encoders[self.model_name] = None
+            return _cross_encoders[self.model_name]
+
+    def score_batch(self, query: str, texts: List[str]) -> List[float]:
+        """Score query/text pairs in a single model call."""
+        model = self._get_model()
+        if model is None or not texts:
+            return []
+        scores = model.predict(
+            [(query, text) for text in texts],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        )
+        return [float(score) for score in scores]
+
+    def _score_within_budget(self, query: str, texts: List[str]) -> List[float]:
+        """
+        Score texts batch by batch until the latency budget is spent.
+
+        Returns:
+            Scores for a prefix of texts (all of them if within budget)
+        """
+        if self._get_model() is None:
+            return []
+
+        scores: List[float] = []
+        started = time.monotonic()
+        for start in range(0, len(texts), self.batch_size):
+            elapsed_ms = (time.monotonic() - started) * 1000
+            over_budget = bool(self.latency_budget_ms) and (
+                elapsed_ms >= self.latency_budget_ms
+            )
+            if scores and over_budget:
+                logger.info(
+                    f"Cross-encoder budget of {self.latency_budget_ms}ms spent after "
+                    f"{len(scores)}/{len(texts)} documents"
+                )
+                break
+            scores.extend(
+                self.score_batch(query, texts[start : start + self.batch_size])
+            )
+        return scores
+
+    async def rerank(
+        self, query: str, documents: List[Document], limit: int
+    ) -> List[Document]:
+        """Order documents by cross-encoder score, scoring off the event loop."""
+        if not documents:
+            return []
+
+        scores = await asyncio.to_thread(
+            self._score_within_budget,
+            query,
+            [document.page_content for document in documents],
+        )
+        scored = list(zip(documents, scores))
+        for document, score in scored:
+            document.metadata["rerank_score"] = score
+
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        ranked = [document for document, _ in scored] + documents[len(scores) :]
+        return ranked[:limit]
+
+
+def _relevance(documents: List[Document]) -> np.ndarray:
+    """
+    Relevance of each document in [0, 1] for MMR.
+
+    Uses the first score in RELEVANCE_KEYS that every document carries,
+    min-max normalized; falls back to the retrieval order.
+    """
+    for key in RELEVANCE_KEYS:
+        values = [document.metadata.get(key) for document in documents]
+        if all(isinstance(value, (int, float)) for value in values):
+            scores = np.asarray(values, dtype=float)
+            spread = scores.max() - scores.min()
+            if spread > 0:
+                return (scores - scores.min()) / spread
+            return np.ones(len(documents))
+    return 1.0 / (1.0 + np.arange(len(documents)))
+
+
+def _term_vectors(texts: List[str]) -> np.ndarray:
+    """L2-normalized term-frequency rows, one per text."""
+    counts = [Counter(tokenize(text)) for text in texts]
+    vocabulary: Dict[str, int] = {}
+    for text_counts in counts:
+        for token in text_counts:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    matrix = np.zeros((len(texts), max(len(vocabulary), 1)))
+    for row, text_counts in enumerate(counts):
+        for token, count in text_counts.items():
+            matrix[row, vocabulary[token]] = count
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class MMRReranker:
+    """
+    Maximal marginal relevance selection.
+
+    Repeatedly picks the document maximizing
+    lambda_mult * relevance - (1 - lambda_mult) * max similarity to the
+    documents already picked. Similarity is the cosine between term
+    vectors, so no document embeddings are needed; documents at least
+    duplicate_threshold similar to a picked one are dropped outright.
+    """
+
+    def __init__(self, lambda_mult: float = 0.7, duplicate_threshold: float = 0.9):
+        """
+        Initialize the reranker.
+
+        Args:
+            lambda_mult: Relevance/diversity trade-off (1.0 is pure relevance)
+            duplicate_threshold: Similarity at which a document is a duplicate
+        """
+        self.lambda_mult = lambda_mult
+        self.duplicate_threshold = duplicate_threshold
+
+    def select(self, documents: List[Document], limit: int) -> List[Document]:
+        """Pick up to limit relevant, mutually dissimilar documents."""
+        if not documents:
+            return []
+
+        relevance = _relevance(documents)
+        vectors = _term_vectors([document.page_content for document in documents])
+        similarity = vectors @ vectors.T
+
+        selected: List[int] = []
+        remaining = np.ones(len(documents), dtype=bool)
+        max_similarity = np.zeros(len(documents))
+
+        while remaining.any() and len(selected) < limit:
+            mmr = (
+                self.lambda_mult * relevance
+                - (1 - self.lambda_mult) * max_similarity
+            )
+            best = int(np.argmax(np.where(remaining, mmr, -np.inf)))
+            remaining[best] = False
+
+            if selected and max_similarity[best] >= self.duplicate_threshold:
+                continue
+            selected.append(best)
+            max_similarity = np.maximum(max_similarity, similarity[best])
+
+        return [documents[index] for index in selected]
+
+    async def rerank(
+        self, query: str, documents: List[Document], limit: int
+    ) -> List[Document]:
+        """Select diverse documents (the query is already in the scores)."""
+        return self.select(documents, limit)
+
+
+class RerankingPipeline:
+    """
+    Run rerankers in sequence.
+
+    Every stage but the last sees all candidates; the last one cuts the
+    list down to the requested number of documents.
+    """
+
+    def __init__(self, stages: List[Reranker]):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Rerankers to apply, in order
+        """
+        self.stages = stages
+
+    async def rerank(
+        self, query: str, documents: List[Document], limit: int
+    ) -> List[Document]:
+        """Apply every stage and return at most limit documents."""
+        for position, stage in enumerate(self.stages):
+            is_last = position == len(self.stages) - 1
+            documents = await stage.rerank(
+                query, documents, limit if is_last else len(documents)
+            )
+        return documents[:limit]
+
+
+# Global reranker instance
+_reranker: Optional[RerankingPipeline] = None
+
+
+def get_reranker() -> Optional[RerankingPipeline]:
+    """Get or create the process-wide reranking pipeline (None if disabled)."""
+    global _reranker
+    if _reranker is None:
+        from agent_service.app.config import get_settings
+
+        settings = get_settings()
+        if not settings.rerank_enabled:
+            return None
+
+        stages: List[Reranker] = []
+        if settings.rerank_cross_encoder_model:
+            stages.append(
+                CrossEncoderReranker(
+                    model_name=settings.rerank_cross_encoder_model,
+                    batch_size=settings.rerank_batch_size,
+                    latency_budget_ms=settings.rerank_latency_budget_ms,
+                )
+            )
+        stages.append(
+            MMRReranker(
+                lambda_mult=settings.rerank_mmr_lambda,
+                duplicate_threshold=settings.rerank_duplicate_threshold,
+            )
+        )
+        _reranker = RerankingPipeline(stages)
+    return _reranker
@@ -36,8 +36,10 @@ class SearchService:
             qdrant_service: Optional Qdrant service instance
             embedding_service: Optional embedding service instance
         """
-        self.qdrant_service = qdrant_service or QdrantService()
         self.embedding_service = embedding_service or EmbeddingService()
+        self.qdrant_service = qdrant_service or QdrantService(
+            embedding_service=self.embedding_service
+        )
         self.logger = logging.getLogger(f"{__name__}.SearchService")
 
     async def semantic_search(
@@ -78,7 +80,7 @@ class SearchService:
                 self.logger.warning("Failed to generate query embedding")
                 return []
 
-            # Perform hybrid search
+            # Perform hybrid search, reusing the query embedding computed above
             documents = await self.qdrant_service.hybrid_search(
                 query=query,
                 user_id=user_id,
@@ -88,6 +90,7 @@ class SearchService:
                 entry_types=entry_types,
                 limit=limit,
                 score_threshold=score_threshold,
+                query_embedding=query_embedding,
             )
 
             # Convert to result format
@@ -243,11 +246,28 @@ class SearchService:
                 self.logger.error("Invalid embedding vector provided")
                 return []
 
-            # Use Qdrant service to search by embedding
-            # Note: This would require extending QdrantService to support embedding-based search
-            # For now, we'll return empty results
-            self.logger.warning("Embedding-based search not yet implemented")
-            return []
+            documents = await self.qdrant_service.hybrid_search(
+                query="",
+                user_id=user_id,
+                tradition=tradition,
+                include_personal=include_personal,
+                include_knowledge=include_knowledge,
+                limit=limit,
+                score_threshold=score_threshold,
+                query_embedding=embedding,
+            )
+
+            return [
+                {
+                    "text": doc.page_content,
+                    "score": doc.metadata.get("score", 0.0),
+                    "source": doc.metadata.get("source", "unknown"),
+                    "tradition": doc.metadata.get("tradition", tradition),
+                    "document_type": doc.metadata.get("document_type", "unknown"),
+                    "user_id": doc.metadata.get("user_id", user_id),
+                }
+                for doc in documents
+            ]
 
         except Exception as e:
             self.logger.error(f"Embedding-based search failed: {e}")
@@ -333,6 +353,8 @@ class SearchService:
             include_knowledge: Whether to include knowledge base documents in search
         """
         from agent_service.app.clients.qdrant_retriever import QdrantRetriever
+        from agent_service.app.config import get_settings
+        from agent_service.app.services.reranking import get_reranker
 
         return QdrantRetriever(
             qdrant_service=self.qdrant_service,
@@ -344,4 +366,6 @@ class SearchService:
             include_personal=include_personal,
             include_knowledge=include_knowledge,
             k=5,
+            reranker=get_reranker(),
+            candidate_multiplier=get_settings().rerank_candidate_multiplier,
         )
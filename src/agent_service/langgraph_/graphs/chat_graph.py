@@ -6,9 +6,10 @@ that use RAG with Qdrant for document retrieval.
 """
 
 import logging
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, AsyncIterator, Dict, Optional
 
-from langchain_core.runnables import Runnable
+from langchain_core.runnables import Runnable, RunnableLambda
 from langgraph.graph import END, StateGraph
 
 from .base import BaseGraphBuilder
@@ -17,6 +18,11 @@ from ..state import RAGAgentState
 
 logger = logging.getLogger(__name__)
 
+# Builders keyed by graph name, provider and overrides. Each compiles its graph
+# once, so requests share the RAG node, its services and its LLM.
+_chat_graph_builders: Dict[str, "ChatGraphBuilder"] = {}
+_chat_graph_builders_lock = threading.Lock()
+
 
 class ChatGraphBuilder(BaseGraphBuilder[RAGAgentState]):
     """
@@ -45,6 +51,8 @@ class ChatGraphBuilder(BaseGraphBuilder[RAGAgentState]):
         super().__init__(name, description)
         self.provider = provider
         self.overrides = overrides or {}
+        self._compiled_graph: Optional[Runnable] = None
+        self._compile_lock = threading.Lock()
 
     def build(self) -> StateGraph:
         """
@@ -66,8 +74,8 @@ class ChatGraphBuilder(BaseGraphBuilder[RAGAgentState]):
         # Create the state graph
         self.graph = StateGraph(RAGAgentState)
 
-        # Add nodes to the graph
-        self.graph.add_node("rag", rag_node)
+        # Add nodes to the graph; graph.ainvoke uses the node's async path
+        self.graph.add_node("rag", RunnableLambda(rag_node, afunc=rag_node.ainvoke))
 
         # Define the workflow: rag -> END
         self.graph.set_entry_point("rag")
@@ -83,21 +91,81 @@ class ChatGraphBuilder(BaseGraphBuilder[RAGAgentState]):
         """
         Get a compiled graph for chat operations.
 
+        The graph is built and compiled on first use and reused afterwards;
+        per-request context travels in the graph state.
+
         Returns:
             Compiled graph runnable
         """
-        if not self.graph:
-            self.build()
+        if self._compiled_graph is not None:
+            return self._compiled_graph
+
+        with self._compile_lock:
+            if self._compiled_graph is None:
+                compiled_graph = self.build()
 
-        if not self.validate_graph():
-            raise ValueError("Graph validation failed")
+                if not self.validate_graph():
+                    raise ValueError("Graph validation failed")
 
-        return self.graph.compile()
+                self._compiled_graph = compiled_graph
+
+        return self._compiled_graph
+
+    async def astream_answer(
+        self, state: RAGAgentState
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the answer for the latest message in the state.
+
+        Runs the graph's RAG node directly so retrieved-document metadata
+        and LLM tokens can be emitted as soon as they are available; see
+        RAGNode.astream for the event format.
+        """
+        self.get_chat_graph()
+        async for event in self.get_node("rag").astream(state):
+            yield event
+
+    def reset(self) -> None:
+        """
+        Reset the graph builder state, including the compiled graph.
+        """
+        super().reset()
+        self._compiled_graph = None
+
+
+def _get_or_create_builder(
+    name: str,
+    description: str,
+    provider: Optional[str],
+    overrides: Optional[Dict[str, Any]],
+) -> ChatGraphBuilder:
+    """Return the shared builder for this configuration, creating it once."""
+    cache_key = f"{name}:{provider}:{sorted((overrides or {}).items())}"
+
+    with _chat_graph_builders_lock:
+        if cache_key not in _chat_graph_builders:
+            _chat_graph_builders[cache_key] = ChatGraphBuilder(
+                name=name,
+                description=description,
+                provider=provider,
+                overrides=overrides,
+            )
+        return _chat_graph_builders[cache_key]
+
+
+def clear_chat_graph_cache() -> None:
+    """Drop all cached chat graphs, e.g. after provider configuration changes."""
+    with _chat_graph_builders_lock:
+        _chat_graph_builders.clear()
+    logger.info("Chat graph cache cleared")
 
 
 class ChatGraphFactory:
     """
     Factory for creating chat graphs with different configurations.
+
+    Builders are cached per configuration, so repeated calls return the
+    same builder and the same compiled graph.
     """
 
     @staticmethod
@@ -115,7 +183,7 @@ class ChatGraphFactory:
         Returns:
             Configured ChatGraphBuilder
         """
-        return ChatGraphBuilder(
+        return _get_or_create_builder(
             name="default_chat",
             description="Default chat graph for ask operations",
             provider=provider,
@@ -137,7 +205,7 @@ class ChatGraphFactory:
         Returns:
             Configured ChatGraphBuilder
         """
-        return ChatGraphBuilder(
+        return _get_or_create_builder(
             name="knowledge_chat",
             description="Knowledge-focused chat graph",
             provider=provider,
@@ -159,7 +227,7 @@ class ChatGraphFactory:
         Returns:
             Configured ChatGraphBuilder
         """
-        return ChatGraphBuilder(
+        return _get_or_create_builder(
             name="personal_chat",
             description="Personal-focused chat graph",
             provider=provider,
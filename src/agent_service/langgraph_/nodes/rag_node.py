@@ -6,15 +6,18 @@ generation for chat operations using Qdrant for document retrieval.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain_core.documents import Document
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langgraph.prebuilt import ToolNode
 
+from ...app.config import get_settings
+from ...app.services.answer_cache import AnswerCache, AnswerCacheKey, get_answer_cache
+from ...app.services.context_builder import ContextBuilder, TokenCounter
 from ...app.services.embedding_service import EmbeddingService
 from ...app.services.qdrant_service import QdrantService
 from ...app.services.search_service import SearchService
@@ -31,6 +34,17 @@ class RAGNode:
     This node handles retrieval-augmented generation by:
     1. Retrieving relevant documents from Qdrant
     2. Generating responses using the retrieved context
+
+    A node is shared by every invocation of a compiled chat graph, so the
+    user, tradition and journal flag are read from the graph state on each
+    call and the retriever built from them is never stored on the node.
+
+    When the answer cache is enabled, answers are reused for questions
+    that retrieve the same documents in the same tradition and context.
+
+    Retrieved documents are packed into a token budget (see
+    ContextBuilder); the packing summary is stored in the state metadata
+    under "context".
     """
 
     def __init__(
@@ -43,7 +57,8 @@ class RAGNode:
         Initialize the RAG node.
 
         Args:
-            retriever: QdrantRetriever instance (set dynamically)
+            retriever: Optional fixed retriever; when None one is built per
+                invocation from the user context in the state
             provider: Optional LLM provider to use
             overrides: Optional configuration overrides
         """
@@ -53,14 +68,16 @@ class RAGNode:
 
         # Initialize services
         self.embedding_service = EmbeddingService()
-        self.qdrant_service = QdrantService()
+        self.qdrant_service = QdrantService(embedding_service=self.embedding_service)
         self.search_service = SearchService(
             embedding_service=self.embedding_service,
             qdrant_service=self.qdrant_service,
         )
+        self.answer_cache: Optional[AnswerCache] = get_answer_cache()
 
         # Set up the RAG chain
         self._setup_rag_chain()
+        self.context_builder = self._create_context_builder()
 
     def _setup_rag_chain(self):
         """Set up the RAG chain with prompt and LLM."""
@@ -81,15 +98,31 @@ Answer:"""
         # Get the LLM (will be set dynamically based on provider)
         self.llm = self._get_llm()
 
-        # Create the RAG chain - fix to use proper callable
-        self.rag_chain = (
-            {
-                "context": lambda x: self._retrieve_documents(x),
-                "question": RunnablePassthrough(),
-            }
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
+        # Prompt -> LLM -> text, fed with a ready context (used for streaming)
+        self.answer_chain = self.prompt | self.llm | StrOutputParser()
+
+        # Create the RAG chain; its input carries the per-invocation retriever
+        # and answer-cache scope. Retrieval and generation have native async
+        # paths so ainvoke never blocks the loop.
+        self.rag_chain = RunnablePassthrough.assign(
+            retrieval=RunnableLambda(self._retrieve, afunc=self._aretrieve)
+        ) | RunnableLambda(self._generate, afunc=self._agenerate)
+
+    def _create_context_builder(self) -> ContextBuilder:
+        """Create the context builder for this node's provider and model."""
+        settings = get_settings()
+        model = self.overrides.get("model")
+        if not model:
+            # LangChain chat models name the model differently per provider
+            model = getattr(self.llm, "model_name", None) or getattr(
+                self.llm, "model", None
+            )
+        return ContextBuilder(
+            token_budget=settings.rag_context_token_budget,
+            token_counter=TokenCounter(
+                provider=self.provider or settings.llm_provider,
+                model=model if isinstance(model, str) else None,
+            ),
         )
 
     def _get_llm(self) -> BaseLanguageModel:
@@ -123,53 +156,206 @@ Answer:"""
             provider_manager = get_provider_manager()
             return provider_manager.create_model_with_fallback()
 
-    def _retrieve_documents(self, query: str) -> str:
+    def _retrieve(
+        self, inputs: Dict[str, Any]
+    ) -> Tuple[Optional[List[Document]], str]:
         """
-        Retrieve relevant documents for the query.
-
-        Args:
-            query: The query string to search for
+        Retrieval step of the RAG chain.
 
         Returns:
-            Formatted context string from retrieved documents
+            (documents, context); documents is None when retrieval did not
+            run or failed, in which case the answer is never cached
         """
+        query = inputs["question"]
         try:
             if not query:
-                return "No query provided."
+                return None, "No query provided."
+
+            retriever = inputs.get("retriever") or self.retriever
 
             # Use search service if no retriever is set
-            if not self.retriever:
-                logger.warning(
-                    "No retriever set, using search service with default parameters"
-                )
-                # For now, return a placeholder context
-                return f"Context for query: {query}\n[Note: Retriever not properly configured]"
+            if not retriever:
+                return None, self._missing_retriever_context(query)
 
             # Retrieve documents using the retriever with modern interface
-            documents = self.retriever.invoke(query)
-
-            # Format context
-            context_parts = []
-            for i, doc in enumerate(documents, 1):
-                content = doc.page_content
-                metadata = doc.metadata
-                source = metadata.get("source", "Unknown")
-                context_parts.append(f"Document {i} (Source: {source}):\n{content}\n")
-
-            context = (
-                "\n".join(context_parts)
-                if context_parts
-                else "No relevant documents found."
+            documents = retriever.invoke(query)
+            return documents, self._format_context(
+                query, documents, inputs.get("context_stats")
             )
 
-            logger.info(
-                f"Retrieved {len(documents)} documents for query: {query[:100]}..."
+        except Exception as e:
+            logger.error(f"Error retrieving documents: {e}")
+            return None, f"Error retrieving documents: {str(e)}"
+
+    async def _aretrieve(
+        self, inputs: Dict[str, Any]
+    ) -> Tuple[Optional[List[Document]], str]:
+        """
+        Async version of _retrieve.
+
+        Awaits the retriever's ainvoke, so retrieval runs on the caller's
+        event loop instead of a thread with its own loop.
+        """
+        query = inputs["question"]
+        try:
+            if not query:
+                return None, "No query provided."
+
+            retriever = inputs.get("retriever") or self.retriever
+
+            if not retriever:
+                return None, self._missing_retriever_context(query)
+
+            documents = await retriever.ainvoke(query)
+            return documents, self._format_context(
+                query, documents, inputs.get("context_stats")
             )
-            return context
 
         except Exception as e:
             logger.error(f"Error retrieving documents: {e}")
-            return f"Error retrieving documents: {str(e)}"
+            return None, f"Error retrieving documents: {str(e)}"
+
+    def _retrieve_documents(self, query: str, retriever=None) -> str:
+        """
+        Retrieve relevant documents for the query.
+
+        Args:
+            query: The query string to search for
+            retriever: Retriever for this invocation, defaults to self.retriever
+
+        Returns:
+            Formatted context string from retrieved documents
+        """
+        return self._retrieve({"question": query, "retriever": retriever})[1]
+
+    async def _aretrieve_documents(self, query: str, retriever=None) -> str:
+        """Async version of _retrieve_documents."""
+        _, context = await self._aretrieve({"question": query, "retriever": retriever})
+        return context
+
+    def _generate(self, inputs: Dict[str, Any]) -> str:
+        """Generation step of the RAG chain, served from the cache when possible."""
+        documents, context = inputs["retrieval"]
+        key = self._answer_cache_key(
+            inputs.get("cache_scope"), documents, inputs["question"]
+        )
+        if key is not None:
+            cached = self.answer_cache.get(key)
+            if cached is not None:
+                return cached
+
+        answer = self.answer_chain.invoke(
+            {"context": context, "question": inputs["question"]}
+        )
+        if key is not None and answer:
+            self.answer_cache.put(key, answer)
+        return answer
+
+    async def _agenerate(self, inputs: Dict[str, Any]) -> str:
+        """Async version of _generate, with the near-duplicate lookup."""
+        documents, context = inputs["retrieval"]
+        key, embedding, cached = await self._alookup_answer(
+            inputs.get("cache_scope"), documents, inputs["question"]
+        )
+        if cached is not None:
+            return cached
+
+        answer = await self.answer_chain.ainvoke(
+            {"context": context, "question": inputs["question"]}
+        )
+        if key is not None and answer:
+            self.answer_cache.put(key, answer, embedding)
+        return answer
+
+    def _cache_scope(
+        self, state: RAGAgentState
+    ) -> Optional[Tuple[str, bool, Optional[str]]]:
+        """Return (tradition, include_journal, user_id) for the answer cache."""
+        tradition_id = state.get("tradition_id")
+        if self.answer_cache is None or not tradition_id:
+            return None
+
+        metadata = state.get("metadata", {})
+        include_journal = bool(metadata.get("include_journal_context", False))
+        return (tradition_id, include_journal, state.get("user_id"))
+
+    def _answer_cache_key(
+        self,
+        cache_scope: Optional[Tuple[str, bool, Optional[str]]],
+        documents: Optional[List[Document]],
+        question: str,
+    ) -> Optional[AnswerCacheKey]:
+        """Build the answer-cache key, or None if this answer must not be cached."""
+        if self.answer_cache is None or cache_scope is None or documents is None:
+            return None
+
+        tradition, include_journal, user_id = cache_scope
+        document_ids = [doc.metadata.get("id") or doc.page_content for doc in documents]
+        return AnswerCache.make_key(
+            tradition, include_journal, user_id, document_ids, question
+        )
+
+    async def _alookup_answer(
+        self,
+        cache_scope: Optional[Tuple[str, bool, Optional[str]]],
+        documents: Optional[List[Document]],
+        question: str,
+    ) -> Tuple[Optional[AnswerCacheKey], Optional[List[float]], Optional[str]]:
+        """
+        Look up a cached answer.
+
+        Returns:
+            (key, question embedding, cached answer); the embedding is only
+            computed when near-duplicate lookups are enabled
+        """
+        key = self._answer_cache_key(cache_scope, documents, question)
+        if key is None:
+            return None, None, None
+
+        embedding = None
+        if self.answer_cache.similarity_threshold is not None:
+            try:
+                # Served by the query-embedding cache after retrieval
+                embedding = await self.embedding_service.get_embedding(question)
+            except Exception as e:
+                logger.warning(f"Failed to embed question for answer cache: {e}")
+
+        return key, embedding, self.answer_cache.get(key, embedding)
+
+    def _missing_retriever_context(self, query: str) -> str:
+        """Placeholder context used when no retriever could be set up."""
+        logger.warning(
+            "No retriever set, using search service with default parameters"
+        )
+        # For now, return a placeholder context
+        return f"Context for query: {query}\n[Note: Retriever not properly configured]"
+
+    def _format_context(
+        self,
+        query: str,
+        documents: List[Document],
+        context_stats: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Format retrieved documents into the prompt context.
+
+        Args:
+            query: The query the documents were retrieved for
+            documents: Retrieved documents, best first
+            context_stats: Optional dict that receives the packing summary
+
+        Returns:
+            Context text within the configured token budget
+        """
+        built = self.context_builder.build(documents)
+        if context_stats is not None:
+            context_stats.update(built.as_metadata())
+
+        logger.info(
+            f"Retrieved {len(documents)} documents for query: {query[:100]}... "
+            f"(context: {built.documents_used} documents, {built.tokens_used} tokens)"
+        )
+        return built.text
 
     def __call__(self, state: RAGAgentState) -> RAGAgentState:
         """
@@ -182,84 +368,204 @@ Answer:"""
             Updated state with generated response
         """
         try:
-            # Get the latest message
-            messages = state.get("messages", [])
-            if not messages:
+            query = self._get_query(state)
+            if not query:
                 return state
 
-            latest_message = messages[-1]
-            query = latest_message.get("content", "")
+            # Retriever for this invocation only; the node is shared
+            retriever = self.retriever or self._create_retriever(state)
+
+            # Generate response using RAG chain; retrieval fills context_stats
+            context_stats: Dict[str, Any] = {}
+            response = self.rag_chain.invoke(
+                {
+                    "question": query,
+                    "retriever": retriever,
+                    "cache_scope": self._cache_scope(state),
+                    "context_stats": context_stats,
+                }
+            )
+            return self._add_response(state, query, response, context_stats)
+
+        except Exception as e:
+            return self._add_error(state, e)
 
+    async def ainvoke(self, state: RAGAgentState) -> RAGAgentState:
+        """
+        Async version of __call__, used when the graph runs with ainvoke.
+
+        Retrieval and the LLM call are awaited end to end, so a slow
+        completion does not block the event loop.
+        """
+        try:
+            query = self._get_query(state)
             if not query:
                 return state
 
-            # Set up retriever dynamically if not already set
-            if (
-                not self.retriever
-                and state.get("user_id")
-                and state.get("tradition_id")
-            ):
-                try:
-                    user_id = state.get("user_id")
-                    tradition_id = state.get("tradition_id")
-                    
-                    # NEW: Read the flag from the state metadata.
-                    # Default to False if not present.
-                    metadata = state.get("metadata", {})
-                    include_journal = metadata.get("include_journal_context", False)
-
-                    logger.info(
-                        f"RAG Node: Creating retriever with user_id={user_id}, "
-                        f"tradition_id='{tradition_id}', include_journal={include_journal}"
-                    )
-                    
-                    # Pass the flag to the search service when creating the retriever.
-                    self.retriever = self.search_service.create_retriever(
-                        user_id=user_id, 
-                        tradition_id=tradition_id, 
-                        search_type="hybrid",
-                        include_personal=include_journal, # Use the flag here
-                        include_knowledge=True, # Always include the knowledge base
-                    )
-                    logger.info(
-                        f"Created retriever for user {user_id} with tradition {tradition_id}"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to create retriever: {e}", exc_info=True)
-
-            # Generate response using RAG chain
-            response = self.rag_chain.invoke(query)
-
-            # Add response to messages
-            messages.append(
+            retriever = self.retriever or self._create_retriever(state)
+
+            context_stats: Dict[str, Any] = {}
+            response = await self.rag_chain.ainvoke(
                 {
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": self._get_timestamp(),
+                    "question": query,
+                    "retriever": retriever,
+                    "cache_scope": self._cache_scope(state),
+                    "context_stats": context_stats,
                 }
             )
+            return self._add_response(state, query, response, context_stats)
 
-            # Update state
-            state["messages"] = messages
-            state["last_response"] = response
+        except Exception as e:
+            return self._add_error(state, e)
 
-            logger.info(f"Generated response for query: {query[:100]}...")
-            return state
+    async def astream(self, state: RAGAgentState) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer the latest message as a stream of events.
+
+        Yields, in order:
+            {"type": "documents", "documents": [...]} once retrieval is done,
+            {"type": "token", "content": "..."} for each chunk from the LLM,
+            {"type": "done", "response": "...", "context": {...}} with the full
+            answer and the context packing summary,
+        or a single {"type": "error", "message": "..."} if anything fails.
+        The state is updated exactly as ainvoke would update it.
+        """
+        try:
+            query = self._get_query(state)
+            if not query:
+                yield {"type": "error", "message": "No query provided."}
+                return
+
+            retriever = self.retriever or self._create_retriever(state)
+            documents: Optional[List[Document]] = None
+            context_stats: Dict[str, Any] = {}
+            if retriever:
+                documents = await retriever.ainvoke(query)
+                context = self._format_context(query, documents, context_stats)
+            else:
+                context = self._missing_retriever_context(query)
+
+            retrieved = [
+                {key: value for key, value in doc.metadata.items() if key != "text"}
+                for doc in documents or []
+            ]
+            state["retrieved_documents"] = retrieved
+            yield {"type": "documents", "documents": retrieved}
+
+            cache_key, embedding, cached = await self._alookup_answer(
+                self._cache_scope(state), documents, query
+            )
+            if cached is not None:
+                self._add_response(state, query, cached, context_stats)
+                yield {"type": "token", "content": cached}
+                yield {"type": "done", "response": cached, "context": context_stats}
+                return
+
+            parts: List[str] = []
+            async for chunk in self.answer_chain.astream(
+                {"context": context, "question": query}
+            ):
+                if chunk:
+                    parts.append(chunk)
+                    yield {"type": "token", "content": chunk}
+
+            response = "".join(parts)
+            if cache_key is not None and response:
+                self.answer_cache.put(cache_key, response, embedding)
+            self._add_response(state, query, response, context_stats)
+            yield {"type": "done", "response": response, "context": context_stats}
 
         except Exception as e:
-            logger.error(f"Error in RAG node: {e}")
-            # Add error response to messages
-            messages = state.get("messages", [])
-            messages.append(
-                {
-                    "role": "assistant",
-                    "content": f"I apologize, but I encountered an error: {str(e)}",
-                    "timestamp": self._get_timestamp(),
-                }
+            self._add_error(state, e)
+            yield {"type": "error", "message": str(e)}
+
+    def _get_query(self, state: RAGAgentState) -> str:
+        """Return the content of the latest message, or an empty string."""
+        messages = state.get("messages", [])
+        if not messages:
+            return ""
+        return messages[-1].get("content", "")
+
+    def _add_response(
+        self,
+        state: RAGAgentState,
+        query: str,
+        response: str,
+        context_stats: Optional[Dict[str, Any]] = None,
+    ) -> RAGAgentState:
+        """
+        Append the assistant response to the conversation in the state.
+
+        The context packing summary, if given, replaces the previous turn's
+        under metadata["context"].
+        """
+        messages = state.get("messages", [])
+        messages.append(
+            {
+                "role": "assistant",
+                "content": response,
+                "timestamp": self._get_timestamp(),
+            }
+        )
+
+        # Update state
+        state["messages"] = messages
+        state["last_response"] = response
+        if context_stats is not None:
+            state.setdefault("metadata", {})["context"] = dict(context_stats)
+
+        logger.info(f"Generated response for query: {query[:100]}...")
+        return state
+
+    def _add_error(self, state: RAGAgentState, error: Exception) -> RAGAgentState:
+        """Record an error and an apology message in the state."""
+        logger.error(f"Error in RAG node: {error}")
+        messages = state.get("messages", [])
+        messages.append(
+            {
+                "role": "assistant",
+                "content": f"I apologize, but I encountered an error: {str(error)}",
+                "timestamp": self._get_timestamp(),
+            }
+        )
+        state["messages"] = messages
+        state["error"] = str(error)
+        # The previous turn's context summary does not describe this one
+        (state.get("metadata") or {}).pop("context", None)
+        return state
+
+    def _create_retriever(self, state: RAGAgentState):
+        """
+        Create a retriever for the user and tradition in the state.
+
+        Returns:
+            A QdrantRetriever, or None without user context or on failure
+        """
+        user_id = state.get("user_id")
+        tradition_id = state.get("tradition_id")
+        if not (user_id and tradition_id):
+            return None
+
+        try:
+            # Default to False if the flag is not in the state metadata
+            metadata = state.get("metadata", {})
+            include_journal = metadata.get("include_journal_context", False)
+
+            logger.info(
+                f"RAG Node: Creating retriever with user_id={user_id}, "
+                f"tradition_id='{tradition_id}', include_journal={include_journal}"
             )
-            state["messages"] = messages
-            state["error"] = str(e)
-            return state
+
+            return self.search_service.create_retriever(
+                user_id=user_id,
+                tradition_id=tradition_id,
+                search_type="hybrid",
+                include_personal=include_journal,
+                include_knowledge=True,  # Always include the knowledge base
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create retriever: {e}", exc_info=True)
+            return None
 
     def _get_timestamp(self) -> str:
         """Get current timestamp string."""
@@ -6,8 +6,12 @@ factory with the existing MindMirror system and provides high-level management
 functions for LLM providers. NO hardcoded defaults - fail fast if config missing.
 """
 
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 from langchain_core.language_models import BaseLanguageModel
 
@@ -34,6 +38,21 @@ class ProviderManager:
         self._default_provider = None  # For backward compatibility with tests
         self._validate_configuration()
 
+        # Model instances keyed by their configuration. Each chat model owns
+        # an HTTP client, so reusing the instance reuses its connections.
+        self._model_pool: "OrderedDict[Hashable, BaseLanguageModel]" = OrderedDict()
+        self._pool_max_size = self._settings.llm_model_pool_size
+        self._pool_lock = threading.Lock()
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._pool_evictions = 0
+
+        # Health check results: provider name -> (healthy, checked_at)
+        self._health_cache: Dict[str, Tuple[bool, float]] = {}
+        self._health_ttl = self._settings.llm_health_cache_ttl_seconds
+        self._health_checks = 0
+        self._health_cache_hits = 0
+
     def _validate_configuration(self):
         """Validate that required configuration is present."""
         # This will raise if LLM_PROVIDER is not set
@@ -113,7 +132,7 @@ class ProviderManager:
         if "provider" not in config:
             raise ValueError("Provider must be specified in configuration")
 
-        return self._factory.create_model(config)
+        return self._get_or_create_model(config)
 
     def create_model_for_provider(
         self, provider_name: str, model_name: str, **kwargs
@@ -155,7 +174,88 @@ class ProviderManager:
             api_key = self._settings.llm_api_key  # This will raise if missing
             config["api_key"] = api_key
 
-        return self._factory.create_model(config)
+        return self._get_or_create_model(config)
+
+    @staticmethod
+    def _pool_key(config: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Build the model pool key for a configuration.
+
+        API keys are hashed so they are not kept around as dictionary keys.
+
+        Returns:
+            Hashable key, or None if the configuration holds unhashable values
+        """
+        items = []
+        for name, value in sorted(config.items()):
+            if name == "api_key" and value is not None:
+                value = hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+            items.append((name, value))
+        key = tuple(items)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _get_or_create_model(self, config: Dict[str, Any]) -> BaseLanguageModel:
+        """
+        Return the pooled model for a configuration, creating it if needed.
+
+        Args:
+            config: Complete model configuration
+
+        Returns:
+            Configured language model instance
+        """
+        key = self._pool_key(config)
+        if key is None or self._pool_max_size <= 0:
+            return self._factory.create_model(config)
+
+        with self._pool_lock:
+            model = self._model_pool.get(key)
+            if model is not None:
+                self._model_pool.move_to_end(key)
+                self._pool_hits += 1
+                return model
+            self._pool_misses += 1
+
+        # Create outside the lock; a concurrent miss at worst builds twice
+        model = self._factory.create_model(config)
+
+        with self._pool_lock:
+            self._model_pool[key] = model
+            self._model_pool.move_to_end(key)
+            while len(self._model_pool) > self._pool_max_size:
+                self._model_pool.popitem(last=False)
+                self._pool_evictions += 1
+        return model
+
+    def clear_model_pool(self):
+        """Drop all pooled model instances."""
+        with self._pool_lock:
+            self._model_pool.clear()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get model pool and health check cache statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        with self._pool_lock:
+            lookups = self._pool_hits + self._pool_misses
+            return {
+                "size": len(self._model_pool),
+                "max_size": self._pool_max_size,
+                "hits": self._pool_hits,
+                "misses": self._pool_misses,
+                "evictions": self._pool_evictions,
+                "hit_rate": self._pool_hits / lookups if lookups else 0.0,
+                "health_checks": self._health_checks,
+                "health_cache_hits": self._health_cache_hits,
+                "health_cache_ttl": self._health_ttl,
+            }
 
     def list_available_providers(self) -> List[str]:
         """
@@ -243,7 +343,46 @@ class ProviderManager:
         if not provider:
             return False
 
-        return provider.test_connection()
+        return self._cached_health(provider_name, provider)
+
+    def _cached_health(self, provider_name: str, provider: BaseProvider) -> bool:
+        """
+        Test a provider's connection, reusing results younger than the TTL.
+
+        Exceptions from the connection test are not cached.
+
+        Args:
+            provider_name: Name of the provider
+            provider: Provider instance to test
+
+        Returns:
+            True if provider is healthy, False otherwise
+        """
+        now = time.monotonic()
+        with self._pool_lock:
+            cached = self._health_cache.get(provider_name)
+            if cached is not None and now - cached[1] < self._health_ttl:
+                self._health_cache_hits += 1
+                return cached[0]
+            self._health_checks += 1
+
+        is_healthy = bool(provider.test_connection())
+        with self._pool_lock:
+            self._health_cache[provider_name] = (is_healthy, time.monotonic())
+        return is_healthy
+
+    def invalidate_health_cache(self, provider_name: Optional[str] = None):
+        """
+        Forget cached health check results.
+
+        Args:
+            provider_name: Optional provider name. If None, clears all results.
+        """
+        with self._pool_lock:
+            if provider_name is None:
+                self._health_cache.clear()
+            else:
+                self._health_cache.pop(provider_name, None)
 
     def get_best_available_provider(self) -> Optional[str]:
         """
@@ -311,7 +450,7 @@ class ProviderManager:
                 }
 
             try:
-                is_healthy = provider.test_connection()
+                is_healthy = self._cached_health(provider_name, provider)
                 return {
                     "status": "healthy" if is_healthy else "unhealthy",
                     "message": (
@@ -328,7 +467,7 @@ class ProviderManager:
             for provider_name in self._factory.list_providers():
                 provider = self._factory.get_provider(provider_name)
                 try:
-                    is_healthy = provider.test_connection()
+                    is_healthy = self._cached_health(provider_name, provider)
                     status[provider_name] = {
                         "status": "healthy" if is_healthy else "unhealthy"
                     }
@@ -347,7 +486,7 @@ class ProviderManager:
         for provider_name in self._factory.list_providers():
             provider = self._factory.get_provider(provider_name)
             try:
-                if provider and provider.test_connection():
+                if provider and self._cached_health(provider_name, provider):
                     working_providers.append(provider_name)
             except Exception:
                 # Provider is not working, skip it
@@ -415,7 +554,7 @@ class ProviderManager:
 
         # Try to create model with provided config - no fallback
         try:
-            return self._factory.create_model(config)
+            return self._get_or_create_model(config)
         except Exception as e:
             logger.error(f"Failed to create model with config {config}: {e}")
             raise RuntimeError(f"Model creation failed: {e}")
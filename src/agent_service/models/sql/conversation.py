@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from agent_service.models.sql.base import Base
+
+
+class ConversationModel(Base):
+    """A chat conversation persisted by the SQL conversation store."""
+
+    __tablename__ = "agent_conversations"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    user_id: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    tradition_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    # Windowed message history: [{"role", "content", "timestamp"}, ...]
+    messages: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    # "metadata" is reserved on declarative models
+    state_metadata: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 from agent_service.app.graphql.schemas.query import Query
 from shared.auth import CurrentUser
@@ -33,8 +33,8 @@ async def test_ask_with_journal_context_true(
     """
     # Arrange
     query_instance = Query()
-    mock_graph = MagicMock()
-    mock_graph.invoke.return_value = {"last_response": "Test response"}
+    mock_graph = AsyncMock()
+    mock_graph.ainvoke.return_value = {"last_response": "Test response"}
     mock_chat_graph_factory.create_default_chat_graph.return_value.get_chat_graph.return_value = mock_graph
 
     # Act
@@ -64,8 +64,8 @@ async def test_ask_with_journal_context_false(
     """
     # Arrange
     query_instance = Query()
-    mock_graph = MagicMock()
-    mock_graph.invoke.return_value = {"last_response": "Test response"}
+    mock_graph = AsyncMock()
+    mock_graph.ainvoke.return_value = {"last_response": "Test response"}
     mock_chat_graph_factory.create_default_chat_graph.return_value.get_chat_graph.return_value = mock_graph
 
     # Act
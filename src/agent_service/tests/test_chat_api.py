@@ -44,8 +44,8 @@ class TestChatAPI:
         # Mock the entire chain to avoid calling real services
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
             # Mock the chat graph
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -99,12 +99,43 @@ class TestChatAPI:
             assert data["metadata"]["user_id"] == "12345678-1234-5678-9abc-123456789abc"
             assert data["metadata"]["tradition_id"] == "test_tradition"
 
+    def test_ask_question_stream(self, mock_auth_dependency):
+        """Test that the streaming endpoint sends documents, tokens, then done."""
+        with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
+
+            async def _astream_answer(state):
+                yield {"type": "documents", "documents": [{"source": "a.pdf"}]}
+                yield {"type": "token", "content": "Mindful"}
+                yield {"type": "token", "content": "ness"}
+                yield {"type": "done", "response": "Mindfulness"}
+
+            mock_builder = Mock()
+            mock_builder.astream_answer = _astream_answer
+            mock_factory.create_default_chat_graph.return_value = mock_builder
+
+            response = client.post(
+                "/chat/ask/stream",
+                json={"message": "What is mindfulness?", "tradition_id": "test_tradition"},
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"].startswith("text/event-stream")
+
+            events = [
+                line.split(": ", 1)[1]
+                for line in response.text.splitlines()
+                if line.startswith("event: ")
+            ]
+            assert events == ["documents", "token", "token", "done"]
+            assert '"conversation_id"' in response.text
+            assert '"content": "Mindful"' in response.text
+
     def test_ask_question_with_conversation_id(self, mock_auth_dependency):
         """Test ask question with existing conversation."""
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
             # Mock the chat graph
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -179,8 +210,8 @@ class TestChatAPI:
         """Test getting user conversations."""
         # First, create a conversation
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -239,8 +270,8 @@ class TestChatAPI:
         """Test getting a specific conversation."""
         # First, create a conversation
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -297,8 +328,8 @@ class TestChatAPI:
         """Test deleting a conversation."""
         # First, create a conversation
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -355,8 +386,8 @@ class TestChatAPI:
         """Test clearing a conversation."""
         # First, create a conversation
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -436,8 +467,8 @@ class TestChatAPI:
         """Test ask question when graph returns an error."""
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
             # Mock the chat graph with error
-            mock_graph = Mock()
-            mock_graph.invoke.return_value = {
+            mock_graph = AsyncMock()
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
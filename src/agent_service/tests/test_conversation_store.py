@@ -0,0 +1,246 @@
+"""
+Tests for the chat conversation stores.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from agent_service.app.services.conversation_store import (
+    InMemoryConversationStore,
+    SqlConversationStore,
+    new_conversation_id,
+    truncate_history,
+)
+from agent_service.langgraph_.state import StateManager
+
+# Mark all tests in this file as asyncio
+pytestmark = pytest.mark.asyncio
+
+
+def _state(user_id: str = "user-1", messages: int = 1):
+    state = StateManager.create_initial_state(
+        user_id=user_id, tradition_id="canon-default", initial_message="msg 0"
+    )
+    for i in range(1, messages):
+        state = StateManager.add_user_message(state, f"msg {i}")
+    state["retrieved_documents"] = [{"content": "a large retrieved chunk"}]
+    return state
+
+
+class TestConversationHelpers:
+    """Test id generation and history truncation."""
+
+    async def test_new_conversation_ids_are_unique(self):
+        assert new_conversation_id() != new_conversation_id()
+
+    async def test_truncate_history_keeps_most_recent(self):
+        messages = [{"content": str(i)} for i in range(5)]
+
+        assert [m["content"] for m in truncate_history(messages, 2)] == ["3", "4"]
+        assert truncate_history(messages, 0) == messages
+
+
+class TestInMemoryConversationStore:
+    """Test the bounded in-memory conversation store."""
+
+    async def test_save_applies_history_window(self):
+        store = InMemoryConversationStore(max_messages=3)
+
+        await store.save("conv-1", _state(messages=5))
+        state = await store.get("conv-1")
+
+        assert [m["content"] for m in state["messages"]] == ["msg 2", "msg 3", "msg 4"]
+        assert state["retrieved_documents"] == []
+
+    async def test_evicts_least_recently_used(self):
+        store = InMemoryConversationStore(max_size=2)
+
+        await store.save("conv-1", _state())
+        await store.save("conv-2", _state())
+        await store.get("conv-1")
+        await store.save("conv-3", _state())
+
+        assert await store.get("conv-2") is None
+        assert await store.get("conv-1") is not None
+        assert len(store) == 2
+        assert store.evictions == 1
+
+    async def test_expires_after_ttl(self):
+        store = InMemoryConversationStore(ttl=60)
+
+        with patch(
+            "agent_service.app.services.conversation_store.time.monotonic",
+            return_value=1000.0,
+        ):
+            await store.save("conv-1", _state())
+
+        with patch(
+            "agent_service.app.services.conversation_store.time.monotonic",
+            return_value=1061.0,
+        ):
+            assert await store.get("conv-1") is None
+            assert await store.list_for_user("user-1") == []
+
+    async def test_list_for_user_filters_and_limits(self):
+        store = InMemoryConversationStore()
+
+        await store.save("conv-1", _state("user-1"))
+        await store.save("conv-2", _state("user-2"))
+        await store.save("conv-3", _state("user-1"))
+
+        conversations = await store.list_for_user("user-1", limit=1)
+
+        assert [conv_id for conv_id, _ in conversations] == ["conv-3"]
+
+    async def test_returned_state_is_a_copy(self):
+        store = InMemoryConversationStore()
+        await store.save("conv-1", _state())
+
+        state = await store.get("conv-1")
+        state["messages"].append({"role": "user", "content": "unsaved"})
+
+        assert len((await store.get("conv-1"))["messages"]) == 1
+        assert await store.delete("conv-1") is True
+        assert await store.delete("conv-1") is False
+
+
+class StubConnection:
+    def __init__(self, ddl_calls):
+        self.ddl_calls = ddl_calls
+
+    async def run_sync(self, fn):
+        self.ddl_calls.append(fn)
+
+
+class StubSession:
+    """
+    Async session over a dict of committed rows.
+
+    Rows are stored as JSON and rebuilt on every get, like JSONB columns
+    round-tripping through Postgres, so nothing leaks between sessions.
+    """
+
+    is_active = True
+
+    def __init__(self, rows, ddl_calls):
+        self.rows = rows
+        self.ddl_calls = ddl_calls
+        self._loaded = {}
+        self._deleted = set()
+
+    async def connection(self):
+        return StubConnection(self.ddl_calls)
+
+    async def get(self, model, key):
+        if key in self._loaded:
+            return self._loaded[key]
+        stored = self.rows.get(key)
+        if stored is None:
+            return None
+        row = model(**json.loads(stored))
+        self._loaded[key] = row
+        return row
+
+    def add(self, row):
+        self._loaded[row.id] = row
+
+    async def delete(self, row):
+        self._deleted.add(row.id)
+
+    async def commit(self):
+        for key, row in self._loaded.items():
+            self.rows[key] = json.dumps(
+                {
+                    "id": row.id,
+                    "user_id": row.user_id,
+                    "tradition_id": row.tradition_id,
+                    "messages": row.messages,
+                    "state_metadata": row.state_metadata,
+                }
+            )
+        for key in self._deleted:
+            self.rows.pop(key, None)
+
+    async def rollback(self):
+        self._loaded.clear()
+        self._deleted.clear()
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def sql_store():
+    rows = {}
+    ddl_calls = []
+    store = SqlConversationStore(
+        session_factory=lambda: StubSession(rows, ddl_calls), max_messages=3
+    )
+    return store, rows, ddl_calls
+
+
+class TestSqlConversationStore:
+    """Test the SQL conversation store against a stubbed session."""
+
+    async def test_save_and_load_round_trip(self, sql_store):
+        store, rows, _ = sql_store
+        state = _state(messages=5)
+        state = StateManager.add_assistant_message(state, "answer")
+        state["metadata"] = {"session": {"turns": 3}}
+
+        await store.save("conv-1", state)
+        loaded = await store.get("conv-1")
+
+        assert [m["content"] for m in loaded["messages"]] == ["msg 3", "msg 4", "answer"]
+        assert loaded["query"] == "msg 4"
+        assert loaded["last_response"] == "answer"
+        assert loaded["metadata"] == {"session": {"turns": 3}}
+        assert loaded["retrieved_documents"] == []
+        assert loaded["user_id"] == "user-1"
+        assert loaded["tradition_id"] == "canon-default"
+        assert "a large retrieved chunk" not in rows["conv-1"]
+
+    async def test_save_replaces_existing_conversation(self, sql_store):
+        store, rows, _ = sql_store
+
+        await store.save("conv-1", _state(messages=2))
+        await store.save("conv-1", _state(messages=4))
+        loaded = await store.get("conv-1")
+
+        assert len(rows) == 1
+        assert [m["content"] for m in loaded["messages"]] == ["msg 1", "msg 2", "msg 3"]
+
+    async def test_delete_evicts_conversation(self, sql_store):
+        store, rows, _ = sql_store
+        await store.save("conv-1", _state())
+
+        assert await store.delete("conv-1") is True
+        assert await store.delete("conv-1") is False
+        assert await store.get("conv-1") is None
+        assert rows == {}
+
+    async def test_table_created_once_when_auto_create_allowed(self, sql_store):
+        store, _, ddl_calls = sql_store
+
+        with patch(
+            "agent_service.app.services.conversation_store.should_auto_create_schema",
+            return_value=True,
+        ):
+            await store.save("conv-1", _state())
+            await store.get("conv-1")
+
+        assert len(ddl_calls) == 1
+
+    async def test_table_left_to_migrations_otherwise(self, sql_store):
+        store, _, ddl_calls = sql_store
+
+        with patch(
+            "agent_service.app.services.conversation_store.should_auto_create_schema",
+            return_value=False,
+        ):
+            await store.save("conv-1", _state())
+
+        assert ddl_calls == []
+        assert await store.get("conv-1") is not None
@@ -68,8 +68,8 @@ class TestRAGIntegration:
                 with patch(
                     "agent_service.app.api.chat.ChatGraphFactory"
                 ) as mock_factory:
-                    mock_graph = Mock()
-                    mock_graph.invoke.return_value = {
+                    mock_graph = AsyncMock()
+                    mock_graph.ainvoke.return_value = {
                         "user_id": "12345678-1234-5678-9abc-123456789abc",
                         "tradition_id": "test_tradition",
                         "messages": [
@@ -159,8 +159,8 @@ class TestRAGIntegration:
                 with patch(
                     "agent_service.app.api.chat.ChatGraphFactory"
                 ) as mock_factory:
-                    mock_graph = Mock()
-                    mock_graph.invoke.return_value = {
+                    mock_graph = AsyncMock()
+                    mock_graph.ainvoke.return_value = {
                         "user_id": "12345678-1234-5678-9abc-123456789abc",
                         "tradition_id": "test_tradition",
                         "messages": [
@@ -227,8 +227,8 @@ class TestRAGIntegration:
                 with patch(
                     "agent_service.app.api.chat.ChatGraphFactory"
                 ) as mock_factory:
-                    mock_graph = Mock()
-                    mock_graph.invoke.return_value = {
+                    mock_graph = AsyncMock()
+                    mock_graph.ainvoke.return_value = {
                         "user_id": "12345678-1234-5678-9abc-123456789abc",
                         "tradition_id": "test_tradition",
                         "messages": [
@@ -272,10 +272,10 @@ class TestRAGIntegration:
     def test_conversation_continuity(self, mock_auth_dependency):
         """Test that conversations maintain context across multiple messages."""
         with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
-            mock_graph = Mock()
+            mock_graph = AsyncMock()
 
             # First message
-            mock_graph.invoke.return_value = {
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -312,7 +312,7 @@ class TestRAGIntegration:
             conversation_id = data1["conversation_id"]
 
             # Second message in same conversation
-            mock_graph.invoke.return_value = {
+            mock_graph.ainvoke.return_value = {
                 "user_id": "12345678-1234-5678-9abc-123456789abc",
                 "tradition_id": "test_tradition",
                 "messages": [
@@ -369,8 +369,8 @@ class TestRAGIntegration:
             mock_embedding.side_effect = Exception("Embedding service unavailable")
 
             with patch("agent_service.app.api.chat.ChatGraphFactory") as mock_factory:
-                mock_graph = Mock()
-                mock_graph.invoke.return_value = {
+                mock_graph = AsyncMock()
+                mock_graph.ainvoke.return_value = {
                     "user_id": "12345678-1234-5678-9abc-123456789abc",
                     "tradition_id": "test_tradition",
                     "messages": [
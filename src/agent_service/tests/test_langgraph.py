@@ -9,15 +9,19 @@ from typing import Any, Dict
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from langchain_core.documents import Document
 
 from agent_service.app.clients.qdrant_retriever import (
     QdrantRetriever,
     QdrantRetrieverFactory,
 )
+from agent_service.app.services.answer_cache import AnswerCache
+from agent_service.app.services.context_builder import ContextBuilder
 from agent_service.langgraph_.graphs.base import BaseGraphBuilder
 from agent_service.langgraph_.graphs.chat_graph import (
     ChatGraphBuilder,
     ChatGraphFactory,
+    clear_chat_graph_cache,
 )
 from agent_service.langgraph_.graphs.journal_graph import JournalGraphBuilder
 from agent_service.langgraph_.graphs.review_graph import ReviewGraphBuilder
@@ -218,6 +222,187 @@ class TestGraphBuilders:
         assert graph is not None
         assert hasattr(graph, "invoke")
 
+    def test_chat_graph_factory_caches_builders(self):
+        """Test that chat graph builders are shared per configuration."""
+        clear_chat_graph_cache()
+
+        first = ChatGraphFactory.create_default_chat_graph(provider="openai")
+        second = ChatGraphFactory.create_default_chat_graph(provider="openai")
+        other = ChatGraphFactory.create_default_chat_graph(provider="ollama")
+
+        assert first is second
+        assert first is not other
+        clear_chat_graph_cache()
+
+    @patch("agent_service.langgraph_.graphs.chat_graph.RAGNode")
+    def test_chat_graph_compiled_once(self, mock_rag_node):
+        """Test that the chat graph is built and compiled only once."""
+        rag_node = Mock(side_effect=lambda state: state)
+        rag_node.__name__ = "rag"
+        rag_node.ainvoke = AsyncMock(side_effect=lambda state: state)
+        mock_rag_node.return_value = rag_node
+        builder = ChatGraphBuilder()
+
+        first = builder.get_chat_graph()
+        second = builder.get_chat_graph()
+
+        assert first is second
+        mock_rag_node.assert_called_once()
+
+        builder.reset()
+        assert builder.get_chat_graph() is not first
+
+
+class TestRAGNode:
+    """Test the RAG node's per-invocation retriever handling."""
+
+    @patch("agent_service.langgraph_.nodes.rag_node.get_provider_manager")
+    @patch("agent_service.langgraph_.nodes.rag_node.SearchService")
+    @patch("agent_service.langgraph_.nodes.rag_node.QdrantService")
+    @patch("agent_service.langgraph_.nodes.rag_node.EmbeddingService")
+    def test_retriever_is_built_per_invocation(
+        self, mock_embedding, mock_qdrant, mock_search, mock_provider_manager
+    ):
+        """Test that each call gets a retriever for its own user and tradition."""
+        node = RAGNode()
+        node.rag_chain = Mock()
+        node.rag_chain.invoke.return_value = "answer"
+        search_service = mock_search.return_value
+
+        for user_id in ("user-a", "user-b"):
+            state = StateManager.create_initial_state(
+                user_id=user_id,
+                tradition_id="canon-default",
+                initial_message="What is virtue?",
+            )
+            result = node(state)
+
+            assert result["last_response"] == "answer"
+            assert search_service.create_retriever.call_args.kwargs["user_id"] == user_id
+            chain_input = node.rag_chain.invoke.call_args.args[0]
+            assert chain_input["question"] == "What is virtue?"
+            assert chain_input["retriever"] is search_service.create_retriever.return_value
+
+        # Nothing user-specific is left on the shared node
+        assert node.retriever is None
+        assert search_service.create_retriever.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("agent_service.langgraph_.nodes.rag_node.get_provider_manager")
+    @patch("agent_service.langgraph_.nodes.rag_node.SearchService")
+    @patch("agent_service.langgraph_.nodes.rag_node.QdrantService")
+    @patch("agent_service.langgraph_.nodes.rag_node.EmbeddingService")
+    async def test_ainvoke_awaits_chain(
+        self, mock_embedding, mock_qdrant, mock_search, mock_provider_manager
+    ):
+        """Test that the async path awaits the chain instead of invoking it."""
+        node = RAGNode()
+        node.rag_chain = Mock()
+        node.rag_chain.ainvoke = AsyncMock(return_value="async answer")
+        state = StateManager.create_initial_state(
+            user_id="user-a",
+            tradition_id="canon-default",
+            initial_message="What is virtue?",
+        )
+
+        result = await node.ainvoke(state)
+
+        assert result["last_response"] == "async answer"
+        node.rag_chain.ainvoke.assert_awaited_once()
+        node.rag_chain.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("agent_service.langgraph_.nodes.rag_node.get_provider_manager")
+    @patch("agent_service.langgraph_.nodes.rag_node.SearchService")
+    @patch("agent_service.langgraph_.nodes.rag_node.QdrantService")
+    @patch("agent_service.langgraph_.nodes.rag_node.EmbeddingService")
+    async def test_async_retrieval_uses_retriever_ainvoke(
+        self, mock_embedding, mock_qdrant, mock_search, mock_provider_manager
+    ):
+        """Test that async retrieval awaits the retriever on the running loop."""
+        node = RAGNode()
+        retriever = Mock()
+        retriever.ainvoke = AsyncMock(
+            return_value=[Document(page_content="Virtue is enough.", metadata={"source": "a.pdf"})]
+        )
+
+        context = await node._aretrieve_documents("What is virtue?", retriever)
+
+        assert "Virtue is enough." in context
+        retriever.ainvoke.assert_awaited_once_with("What is virtue?")
+        retriever.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("agent_service.langgraph_.nodes.rag_node.get_answer_cache")
+    @patch("agent_service.langgraph_.nodes.rag_node.get_provider_manager")
+    @patch("agent_service.langgraph_.nodes.rag_node.SearchService")
+    @patch("agent_service.langgraph_.nodes.rag_node.QdrantService")
+    @patch("agent_service.langgraph_.nodes.rag_node.EmbeddingService")
+    async def test_answer_cache_skips_llm_for_repeated_question(
+        self,
+        mock_embedding,
+        mock_qdrant,
+        mock_search,
+        mock_provider_manager,
+        mock_get_answer_cache,
+    ):
+        """Test that a repeated question over the same documents skips the LLM."""
+        mock_get_answer_cache.return_value = AnswerCache()
+        node = RAGNode()
+        node.answer_chain = Mock()
+        node.answer_chain.ainvoke = AsyncMock(return_value="Virtue is enough.")
+        retriever = mock_search.return_value.create_retriever.return_value
+        retriever.ainvoke = AsyncMock(
+            return_value=[Document(page_content="...", metadata={"id": "doc-1"})]
+        )
+
+        for user_id in ("user-a", "user-b"):
+            state = StateManager.create_initial_state(
+                user_id=user_id,
+                tradition_id="canon-default",
+                initial_message="What is virtue?",
+            )
+            result = await node.ainvoke(state)
+            assert result["last_response"] == "Virtue is enough."
+
+        node.answer_chain.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("agent_service.langgraph_.nodes.rag_node.get_provider_manager")
+    @patch("agent_service.langgraph_.nodes.rag_node.SearchService")
+    @patch("agent_service.langgraph_.nodes.rag_node.QdrantService")
+    @patch("agent_service.langgraph_.nodes.rag_node.EmbeddingService")
+    async def test_context_is_packed_into_token_budget(
+        self, mock_embedding, mock_qdrant, mock_search, mock_provider_manager
+    ):
+        """Test that the prompt context respects the budget and is reported."""
+        node = RAGNode()
+        node.context_builder = ContextBuilder(token_budget=60, min_section_tokens=200)
+        node.answer_chain = Mock()
+        node.answer_chain.ainvoke = AsyncMock(return_value="Virtue is enough.")
+        retriever = mock_search.return_value.create_retriever.return_value
+        retriever.ainvoke = AsyncMock(
+            return_value=[
+                Document(page_content="Virtue is enough.", metadata={"source": "a"}),
+                Document(page_content="word " * 500, metadata={"source": "b"}),
+            ]
+        )
+
+        state = StateManager.create_initial_state(
+            user_id="user-a",
+            tradition_id="canon-default",
+            initial_message="What is virtue?",
+        )
+        result = await node.ainvoke(state)
+
+        prompt_context = node.answer_chain.ainvoke.call_args.args[0]["context"]
+        assert "Virtue is enough." in prompt_context
+        assert "word" not in prompt_context
+        context_stats = result["metadata"]["context"]
+        assert 0 < context_stats["tokens_used"] <= 60
+        assert context_stats["documents_used"] == 1
+        assert context_stats["truncated"] is True
+
 
 class TestGraphRunner:
     """Test graph runner functionality."""
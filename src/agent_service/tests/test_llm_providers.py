@@ -600,6 +600,62 @@ class TestProviderManager:
                 with pytest.raises(RuntimeError, match="Model creation failed"):
                     manager.create_model_with_fallback()
 
+    def test_create_model_reuses_pooled_instance(self):
+        """Test that identical configs share one model instance."""
+        manager = ProviderManager()
+        config = {"provider": "openai", "model": "gpt-3.5-turbo", "temperature": 0.7}
+
+        with patch.object(manager._factory, "create_model") as mock_create:
+            mock_create.side_effect = lambda config: Mock()
+            first = manager.create_model(dict(config))
+            second = manager.create_model(dict(config))
+            other = manager.create_model({**config, "temperature": 0.2})
+
+            assert first is second
+            assert other is not first
+            assert mock_create.call_count == 2
+
+        stats = manager.get_pool_stats()
+        assert stats["size"] == 2
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_model_pool_evicts_least_recently_used(self):
+        """Test that the pool stays within its maximum size."""
+        manager = ProviderManager()
+        manager._pool_max_size = 1
+
+        with patch.object(manager._factory, "create_model") as mock_create:
+            mock_create.side_effect = lambda config: Mock()
+            manager.create_model({"provider": "openai", "model": "gpt-4o"})
+            manager.create_model({"provider": "openai", "model": "gpt-4o-mini"})
+            manager.create_model({"provider": "openai", "model": "gpt-4o"})
+
+            assert mock_create.call_count == 3
+
+        stats = manager.get_pool_stats()
+        assert stats["size"] == 1
+        assert stats["evictions"] == 2
+
+    def test_health_checks_are_cached(self):
+        """Test that health check results are reused within the TTL."""
+        manager = ProviderManager()
+
+        with patch.object(manager._factory, "list_providers") as mock_list:
+            mock_list.return_value = ["openai"]
+            with patch.object(manager._factory, "get_provider") as mock_get:
+                mock_provider = Mock()
+                mock_provider.test_connection.return_value = True
+                mock_get.return_value = mock_provider
+
+                assert manager.get_working_providers() == ["openai"]
+                assert manager.test_provider_health("openai")
+                assert mock_provider.test_connection.call_count == 1
+
+                manager.invalidate_health_cache("openai")
+                assert manager.test_provider_health("openai")
+                assert mock_provider.test_connection.call_count == 2
+
 
 class TestIntegration:
     """Integration tests for the complete LLM provider system."""
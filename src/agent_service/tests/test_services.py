@@ -10,13 +10,190 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from agent_service.app.clients.embedding_client import EmbeddingClient
-from agent_service.app.clients.qdrant_client import QdrantClient
+from langchain_core.documents import Document
+
+from agent_service.app.clients.embedding_client import EmbeddingCache, EmbeddingClient
+from agent_service.app.clients.qdrant_client import (
+    SEARCH_PAYLOAD_FIELDS,
+    QdrantClient,
+    SearchResult,
+)
+from agent_service.app.clients.qdrant_retriever import (
+    QdrantRetriever,
+    reciprocal_rank_fusion,
+)
+from agent_service.app.services.answer_cache import AnswerCache
+from agent_service.app.services.context_builder import ContextBuilder
 from agent_service.app.services.embedding_service import EmbeddingService
 from agent_service.app.services.qdrant_service import QdrantService
+from agent_service.app.services.reranking import (
+    CrossEncoderReranker,
+    MMRReranker,
+    hybrid_rank_scores,
+)
 from agent_service.app.services.search_service import SearchService
 
 
+class TestEmbeddingCache:
+    """Test the query-embedding cache."""
+
+    def test_key_normalizes_whitespace(self):
+        """Test that trivially different queries share a cache key."""
+        assert EmbeddingCache.make_key(
+            "ollama", "nomic", "  what is   stoicism? "
+        ) == EmbeddingCache.make_key("ollama", "nomic", "what is stoicism?")
+
+    def test_key_includes_provider_and_model(self):
+        """Test that providers and models never share entries."""
+        assert EmbeddingCache.make_key("ollama", "a", "q") != EmbeddingCache.make_key(
+            "openai", "a", "q"
+        )
+        assert EmbeddingCache.make_key("ollama", "a", "q") != EmbeddingCache.make_key(
+            "ollama", "b", "q"
+        )
+
+    def test_hit_and_miss_stats(self):
+        """Test hit/miss accounting."""
+        cache = EmbeddingCache()
+        key = EmbeddingCache.make_key("ollama", "nomic", "hello")
+
+        assert cache.get(key) is None
+        cache.put(key, [0.1, 0.2, 0.3])
+        assert cache.get(key) == [0.1, 0.2, 0.3]
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_evicts_least_recently_used_when_over_budget(self):
+        """Test that the memory budget evicts the oldest entries first."""
+        first = EmbeddingCache.make_key("ollama", "nomic", "first")
+        second = EmbeddingCache.make_key("ollama", "nomic", "second")
+        third = EmbeddingCache.make_key("ollama", "nomic", "third")
+        entry_size = EmbeddingCache._entry_size(first, tuple([0.1] * 8))
+        cache = EmbeddingCache(max_bytes=entry_size * 2 + 10)
+
+        cache.put(first, [0.1] * 8)
+        cache.put(second, [0.1] * 8)
+        cache.get(first)  # Touch so "second" becomes least recently used
+        cache.put(third, [0.1] * 8)
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_expired_entries_are_misses(self):
+        """Test TTL expiry."""
+        cache = EmbeddingCache(ttl=10)
+        key = EmbeddingCache.make_key("ollama", "nomic", "hello")
+
+        with patch("agent_service.app.clients.embedding_client.time") as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            cache.put(key, [0.1])
+            mock_time.monotonic.return_value = 111.0
+            assert cache.get(key) is None
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_client_serves_repeated_queries_from_cache(self):
+        """Test that the client skips the HTTP call on a cache hit."""
+        settings = Mock(
+            embedding_model_name="nomic",
+            embedding_provider="ollama",
+        )
+        response = Mock()
+        response.raise_for_status = Mock()
+        response.json = Mock(return_value={"embedding": [0.1, 0.2, 0.3]})
+
+        with patch("agent_service.app.config.get_settings", return_value=settings):
+            client = EmbeddingClient(
+                base_url="http://ollama:11434", cache=EmbeddingCache()
+            )
+            client.client = Mock()
+            client.client.post = AsyncMock(return_value=response)
+
+            first = await client.get_embedding("hello world")
+            second = await client.get_embedding("hello   world")
+
+        assert first == second == [0.1, 0.2, 0.3]
+        client.client.post.assert_called_once()
+        assert client.get_cache_stats()["hits"] == 1
+
+
+class TestAnswerCache:
+    """Test the RAG answer cache."""
+
+    def test_key_normalizes_question_and_document_order(self):
+        """Test that trivially different questions over the same documents match."""
+        first = AnswerCache.make_key(
+            "stoic", False, "user-a", ["d2", "d1"], "What is  virtue?"
+        )
+        second = AnswerCache.make_key(
+            "stoic", False, "user-b", ["d1", "d2"], "what is virtue"
+        )
+        assert first == second
+
+    def test_personal_answers_are_scoped_to_the_user(self):
+        """Test that journal-grounded answers are never shared between users."""
+        assert AnswerCache.make_key(
+            "stoic", True, "user-a", ["d1"], "q"
+        ) != AnswerCache.make_key("stoic", True, "user-b", ["d1"], "q")
+
+    def test_similar_question_hit(self):
+        """Test the near-duplicate lookup within the same retrieval context."""
+        cache = AnswerCache(similarity_threshold=0.9)
+        key = AnswerCache.make_key("stoic", False, None, ["d1"], "what is virtue")
+        cache.put(key, "Virtue is the only good.", [1.0, 0.0])
+
+        similar = AnswerCache.make_key("stoic", False, None, ["d1"], "define virtue")
+        other_docs = AnswerCache.make_key("stoic", False, None, ["d2"], "define virtue")
+
+        assert cache.get(similar, [0.99, 0.05]) == "Virtue is the only good."
+        assert cache.get(similar, [0.0, 1.0]) is None
+        assert cache.get(other_docs, [0.99, 0.05]) is None
+        assert cache.get_stats()["similar_hits"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test LRU eviction once max_entries is reached."""
+        cache = AnswerCache(max_entries=2)
+        first, second, third = (
+            AnswerCache.make_key("stoic", False, None, [], question)
+            for question in ("first", "second", "third")
+        )
+
+        cache.put(first, "1")
+        cache.put(second, "2")
+        cache.get(first)  # Touch so "second" becomes least recently used
+        cache.put(third, "3")
+
+        assert cache.get(second) is None
+        assert cache.get(first) == "1"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_expired_entries_are_misses(self):
+        """Test TTL expiry."""
+        cache = AnswerCache(ttl=10)
+        key = AnswerCache.make_key("stoic", False, None, ["d1"], "hello")
+
+        with patch("agent_service.app.services.answer_cache.time") as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            cache.put(key, "hi")
+            mock_time.monotonic.return_value = 111.0
+            assert cache.get(key) is None
+
+    def test_invalidate_tradition(self):
+        """Test that re-indexing a tradition drops only its answers."""
+        cache = AnswerCache()
+        cache.put(AnswerCache.make_key("stoic", False, None, ["d1"], "q"), "a")
+        cache.put(AnswerCache.make_key("zen", False, None, ["d1"], "q"), "b")
+
+        assert cache.invalidate_tradition("stoic") == 1
+        assert len(cache) == 1
+
+
 class TestEmbeddingService:
     """Test embedding service functionality."""
 
@@ -95,8 +272,7 @@ class TestQdrantService:
     def mock_qdrant_client(self):
         """Create a mock Qdrant client."""
         client = Mock(spec=QdrantClient)
-        # QdrantClient methods are synchronous, not async
-        client.search_knowledge_base = Mock(return_value=[])
+        client.asearch_knowledge_base = AsyncMock(return_value=[])
         client.search_personal_entries = AsyncMock(return_value=[])
         client.hybrid_search = AsyncMock(return_value=[])
         client.health_check = AsyncMock(return_value=True)
@@ -127,7 +303,7 @@ class TestQdrantService:
             # Verify the mocks were called
             MockEmbeddingService.assert_called_once()
             mock_embedding_instance.get_embedding.assert_called_once_with("test query")
-            mock_qdrant_client.search_knowledge_base.assert_called_once()
+            mock_qdrant_client.asearch_knowledge_base.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_search_personal_entries(self, qdrant_service, mock_qdrant_client):
@@ -162,6 +338,75 @@ class TestQdrantService:
             mock_embedding_instance.get_embedding.assert_called_once_with("test query")
             mock_qdrant_client.hybrid_search.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_hybrid_search_with_precomputed_embedding(
+        self, qdrant_service, mock_qdrant_client
+    ):
+        """Test hybrid search reuses a precomputed query embedding."""
+        with patch(
+            "agent_service.app.services.embedding_service.EmbeddingService"
+        ) as MockEmbeddingService:
+            await qdrant_service.hybrid_search(
+                "test query",
+                "user123",
+                "test-tradition",
+                query_embedding=[0.1, 0.2, 0.3],
+            )
+
+            MockEmbeddingService.assert_not_called()
+            call_kwargs = mock_qdrant_client.hybrid_search.call_args.kwargs
+            assert call_kwargs["query_embedding"] == [0.1, 0.2, 0.3]
+
+    @pytest.mark.asyncio
+    async def test_search_knowledge_base_uses_injected_embedding_service(
+        self, mock_qdrant_client
+    ):
+        """Test knowledge base search embeds through the injected service."""
+        embedding_service = Mock(spec=EmbeddingService)
+        embedding_service.get_embedding = AsyncMock(return_value=[0.1, 0.2, 0.3])
+        qdrant_service = QdrantService(
+            qdrant_client=mock_qdrant_client, embedding_service=embedding_service
+        )
+
+        await qdrant_service.search_knowledge_base("test query", "test-tradition")
+
+        embedding_service.get_embedding.assert_called_once_with("test query")
+        call_kwargs = mock_qdrant_client.asearch_knowledge_base.call_args.kwargs
+        assert call_kwargs["query_embedding"] == [0.1, 0.2, 0.3]
+
+    @pytest.mark.asyncio
+    async def test_search_pushes_threshold_and_projection_to_qdrant(
+        self, qdrant_service, mock_qdrant_client
+    ):
+        """Test that filtering and payload selection happen server-side."""
+        mock_qdrant_client.hybrid_search.return_value = [
+            SearchResult(
+                text="t", score=0.8, metadata={"source_id": "a.pdf"}, id="point-1"
+            )
+        ]
+
+        documents = await qdrant_service.hybrid_search(
+            "test query",
+            "user123",
+            "test-tradition",
+            score_threshold=0.7,
+            query_embedding=[0.1, 0.2, 0.3],
+        )
+
+        call_kwargs = mock_qdrant_client.hybrid_search.call_args.kwargs
+        assert call_kwargs["score_threshold"] == 0.7
+        assert call_kwargs["payload_fields"] == SEARCH_PAYLOAD_FIELDS
+        assert documents[0].metadata["id"] == "point-1"
+
+        await qdrant_service.search_knowledge_base(
+            "test query",
+            "test-tradition",
+            score_threshold=0.0,
+            query_embedding=[0.1, 0.2, 0.3],
+        )
+        call_kwargs = mock_qdrant_client.asearch_knowledge_base.call_args.kwargs
+        assert call_kwargs["score_threshold"] is None
+
     @pytest.mark.asyncio
     async def test_health_check(self, qdrant_service, mock_qdrant_client):
         """Test health check."""
@@ -171,6 +416,370 @@ class TestQdrantService:
         mock_qdrant_client.health_check.assert_called_once()
 
 
+class TestQdrantClientHybridSearch:
+    """Test the concurrent fan-out in QdrantClient.hybrid_search."""
+
+    @pytest.fixture
+    def qdrant_client(self):
+        """Create a Qdrant client with both underlying clients patched out."""
+        with patch("agent_service.app.clients.qdrant_client.QdrantClientBase"), patch(
+            "agent_service.app.clients.qdrant_client.AsyncQdrantClientBase"
+        ):
+            yield QdrantClient(url="http://localhost:6333")
+
+    @pytest.mark.asyncio
+    async def test_knowledge_and_personal_searches_run_concurrently(
+        self, qdrant_client
+    ):
+        """Both channels must be in flight at the same time."""
+        import asyncio
+
+        started = {"knowledge": asyncio.Event(), "personal": asyncio.Event()}
+
+        async def fake_channel(name, result):
+            started[name].set()
+            other = "personal" if name == "knowledge" else "knowledge"
+            # Deadlocks (and times out) if the channels run sequentially
+            await asyncio.wait_for(started[other].wait(), timeout=1)
+            return [result]
+
+        knowledge = SearchResult(text="k", score=0.9, metadata={"source_type": "pdf"})
+        personal = SearchResult(
+            text="p", score=0.5, metadata={"source_type": "journal"}
+        )
+        qdrant_client._search_knowledge_channel = lambda *a: fake_channel(
+            "knowledge", knowledge
+        )
+        qdrant_client._search_personal_channel = lambda *a: fake_channel(
+            "personal", personal
+        )
+
+        results = await qdrant_client.hybrid_search(
+            query="q",
+            user_id="user123",
+            tradition="canon-default",
+            query_embedding=[0.1, 0.2, 0.3],
+        )
+
+        assert {r.text for r in results} == {"k", "p"}
+
+    @pytest.mark.asyncio
+    async def test_only_requested_channels_are_searched(self, qdrant_client):
+        """Test that include_personal=False skips the personal collection."""
+        qdrant_client._search_knowledge_channel = AsyncMock(return_value=[])
+        qdrant_client._search_personal_channel = AsyncMock(return_value=[])
+
+        await qdrant_client.hybrid_search(
+            query="q",
+            user_id="user123",
+            tradition="canon-default",
+            query_embedding=[0.1, 0.2, 0.3],
+            include_personal=False,
+        )
+
+        qdrant_client._search_knowledge_channel.assert_awaited_once()
+        qdrant_client._search_personal_channel.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_search_documents_requests_only_needed_payload(self, qdrant_client):
+        """Test server-side threshold and payload projection in search_documents."""
+        hit = Mock(id="point-1", score=0.9, payload={"text": "t", "source_id": "a"})
+        qdrant_client.async_client.search = AsyncMock(return_value=[hit])
+
+        with patch("agent_service.app.config.get_settings") as mock_settings:
+            mock_settings.return_value.embedding_vector_size = 3
+            results = await qdrant_client.search_documents(
+                "canon-default_knowledge",
+                [0.1, 0.2, 0.3],
+                score_threshold=0.5,
+                payload_fields=["source_id"],
+            )
+
+        call_kwargs = qdrant_client.async_client.search.call_args.kwargs
+        assert call_kwargs["score_threshold"] == 0.5
+        assert call_kwargs["with_payload"] == ["text", "source_id"]
+        assert results[0].text == "t"
+        assert results[0].id == "point-1"
+        assert results[0].metadata == {"source_id": "a"}
+
+
+class TestQdrantClientPersonalLayout:
+    """Test the per-user and shared personal collection layouts."""
+
+    def _make_client(self, layout):
+        with patch("agent_service.app.clients.qdrant_client.QdrantClientBase"), patch(
+            "agent_service.app.clients.qdrant_client.AsyncQdrantClientBase"
+        ):
+            return QdrantClient(url="http://localhost:6333", personal_layout=layout)
+
+    def test_collection_names(self):
+        """Test collection naming for both layouts."""
+        per_user = self._make_client("per_user")
+        shared = self._make_client("shared")
+
+        assert (
+            per_user._get_personal_collection_name("canon-default", "u1")
+            == "canon-default_u1_personal"
+        )
+        assert (
+            shared._get_personal_collection_name("canon-default", "u1")
+            == "canon-default_personal"
+        )
+
+    def test_invalid_layout(self):
+        """Test that unknown layouts are rejected."""
+        with pytest.raises(ValueError):
+            self._make_client("sharded")
+
+    @pytest.mark.asyncio
+    async def test_shared_layout_filters_personal_search_by_user(self):
+        """Shared-layout personal searches must be restricted to the caller."""
+        client = self._make_client("shared")
+        client.get_or_create_personal_collection = AsyncMock(
+            return_value="canon-default_personal"
+        )
+        client.search_documents = AsyncMock(return_value=[])
+
+        await client._search_personal_channel(
+            "canon-default", "u1", [0.1, 0.2, 0.3], None, 5
+        )
+
+        call_kwargs = client.search_documents.call_args.kwargs
+        assert call_kwargs["collection_name"] == "canon-default_personal"
+        assert call_kwargs["metadata_filter"]["user_id"] == "u1"
+
+
+class TestQdrantClientCollectionCache:
+    """Test the known-collections cache in QdrantClient."""
+
+    @pytest.fixture
+    def qdrant_client(self):
+        """Create a Qdrant client with both underlying clients patched out."""
+        with patch("agent_service.app.clients.qdrant_client.QdrantClientBase"), patch(
+            "agent_service.app.clients.qdrant_client.AsyncQdrantClientBase"
+        ):
+            client = QdrantClient(url="http://localhost:6333")
+        existing = Mock()
+        existing.name = "canon-default_knowledge"
+        client.async_client.get_collections = AsyncMock(
+            return_value=Mock(collections=[existing])
+        )
+        client.async_client.create_collection = AsyncMock()
+        client.async_client.delete_collection = AsyncMock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_existing_collection_is_listed_once(self, qdrant_client):
+        """Repeated get-or-create calls must not list collections every time."""
+        for _ in range(3):
+            await qdrant_client.get_or_create_knowledge_collection("canon-default")
+
+        qdrant_client.async_client.get_collections.assert_awaited_once()
+        qdrant_client.async_client.create_collection.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_created_collection_is_cached(self, qdrant_client):
+        """A collection created by this client is remembered."""
+        with patch("agent_service.app.config.get_settings") as mock_settings:
+            mock_settings.return_value = Mock(embedding_vector_size=768)
+            await qdrant_client.get_or_create_personal_collection("canon-default", "u1")
+            await qdrant_client.get_or_create_personal_collection("canon-default", "u1")
+
+        qdrant_client.async_client.get_collections.assert_awaited_once()
+        qdrant_client.async_client.create_collection.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_collection_invalidates_cache(self, qdrant_client):
+        """Deleting a collection forces the next check back to Qdrant."""
+        await qdrant_client.get_or_create_knowledge_collection("canon-default")
+        await qdrant_client.delete_collection("canon-default_knowledge")
+        await qdrant_client.get_or_create_knowledge_collection("canon-default")
+
+        assert qdrant_client.async_client.get_collections.await_count == 2
+
+
+class TestKeywordSearch:
+    """Test BM25 keyword search and reciprocal-rank fusion."""
+
+    @pytest.fixture
+    def qdrant_client(self):
+        """Create a Qdrant client with both underlying clients patched out."""
+        with patch("agent_service.app.clients.qdrant_client.QdrantClientBase"), patch(
+            "agent_service.app.clients.qdrant_client.AsyncQdrantClientBase"
+        ):
+            client = QdrantClient(url="http://localhost:6333")
+        client.async_client.search = AsyncMock(return_value=[])
+        return client
+
+    @pytest.mark.asyncio
+    async def test_sparse_search_uses_bm25_vector(self, qdrant_client):
+        """Keyword search queries the named sparse vector."""
+        qdrant_client._sparse_collections["canon-default_knowledge"] = True
+
+        await qdrant_client.sparse_search(
+            "canon-default_knowledge", "Bulgarian split squat", limit=5
+        )
+
+        query_vector = qdrant_client.async_client.search.call_args.kwargs[
+            "query_vector"
+        ]
+        assert query_vector.name == "text-bm25"
+        assert len(query_vector.vector.indices) == 3
+
+    @pytest.mark.asyncio
+    async def test_sparse_search_skips_collections_without_sparse_vector(
+        self, qdrant_client
+    ):
+        """Collections created before keyword search return no results."""
+        info = Mock()
+        info.config.params.sparse_vectors = None
+        qdrant_client.async_client.get_collection = AsyncMock(return_value=info)
+
+        for _ in range(2):
+            results = await qdrant_client.sparse_search("old_knowledge", "squat")
+
+        assert results == []
+        qdrant_client.async_client.get_collection.assert_awaited_once()
+        qdrant_client.async_client.search.assert_not_called()
+
+    def test_reciprocal_rank_fusion_rewards_agreement(self):
+        """Documents found by both channels outrank single-channel hits."""
+        dense = [
+            Document(page_content="a", metadata={"id": "1", "score": 0.9}),
+            Document(page_content="b", metadata={"id": "2", "score": 0.8}),
+        ]
+        keyword = [
+            Document(page_content="c", metadata={"id": "3", "score": 7.5}),
+            Document(page_content="b", metadata={"id": "2", "score": 6.1}),
+        ]
+
+        fused = reciprocal_rank_fusion([dense, keyword], limit=2)
+
+        assert [doc.metadata["id"] for doc in fused] == ["2", "1"]
+        assert fused[0].metadata["rrf_score"] == pytest.approx(1 / 62 + 1 / 62)
+        assert fused[0].metadata["score"] == 0.8
+
+    @pytest.mark.asyncio
+    async def test_hybrid_retriever_fuses_dense_and_keyword_results(self):
+        """Hybrid retrieval queries both channels and fuses them."""
+        qdrant_service = Mock(spec=QdrantService)
+        qdrant_service.search_knowledge_base = AsyncMock(
+            return_value=[Document(page_content="dense", metadata={"id": "1"})]
+        )
+        qdrant_service.keyword_search = AsyncMock(
+            return_value=[Document(page_content="exact", metadata={"id": "2"})]
+        )
+        embedding_service = Mock(spec=EmbeddingService)
+        embedding_service.get_embedding = AsyncMock(return_value=[0.1, 0.2, 0.3])
+
+        retriever = QdrantRetriever(
+            qdrant_service=qdrant_service,
+            embedding_service=embedding_service,
+            collection_name="canon-default_knowledge",
+            tradition_id="canon-default",
+        )
+        documents = await retriever._aget_relevant_documents("split squat")
+
+        assert {doc.page_content for doc in documents} == {"dense", "exact"}
+        qdrant_service.keyword_search.assert_awaited_once()
+        assert all("rrf_score" in doc.metadata for doc in documents)
+
+
+class TestReranking:
+    """Test hybrid scoring and the re-ranking stages."""
+
+    def test_hybrid_rank_scores(self):
+        """Recency and personal bonuses only apply to journal entries."""
+        from datetime import datetime, timedelta, timezone
+
+        now = datetime(2025, 1, 31, tzinfo=timezone.utc)
+        scores = hybrid_rank_scores(
+            [0.5, 0.5, 0.5, 0.5],
+            [False, True, True, True],
+            [
+                None,
+                (now - timedelta(days=15)).isoformat(),
+                "not a date",
+                now.timestamp(),
+            ],
+            now=now,
+        )
+
+        assert scores.tolist() == pytest.approx([0.35, 0.55, 0.45, 0.65])
+
+    def test_mmr_drops_near_duplicate_chunks(self):
+        """Overlapping chunks with the same text are only kept once."""
+        documents = [
+            Document(page_content=text, metadata={"score": score})
+            for text, score in [
+                ("Squat with knees out to depth", 0.9),
+                ("squat with knees out to depth.", 0.8),
+                ("Hinge at the hips to deadlift", 0.5),
+            ]
+        ]
+
+        selected = MMRReranker().select(documents, limit=3)
+
+        assert [doc.page_content for doc in selected] == [
+            documents[0].page_content,
+            documents[2].page_content,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cross_encoder_stops_at_latency_budget(self):
+        """Unscored documents keep their order after the scored ones."""
+        import time
+
+        def slow_batch(query, texts):
+            time.sleep(0.01)
+            return [0.1, 0.9]
+
+        reranker = CrossEncoderReranker(batch_size=2, latency_budget_ms=1)
+        reranker._get_model = Mock(return_value=Mock())
+        reranker.score_batch = Mock(side_effect=slow_batch)
+        documents = [Document(page_content=str(i)) for i in range(4)]
+
+        ranked = await reranker.rerank("q", documents, limit=4)
+
+        assert [doc.page_content for doc in ranked] == ["1", "0", "2", "3"]
+        assert ranked[0].metadata["rerank_score"] == 0.9
+        assert "rerank_score" not in ranked[2].metadata
+
+
+class TestContextBuilder:
+    """Test token-budgeted context assembly."""
+
+    def test_merges_overlapping_chunks_of_a_source(self):
+        """Chunks sharing their overlap are joined without repeating it."""
+        text = "".join(f"sentence {i}. " for i in range(100))
+        documents = [
+            Document(page_content=text[:800], metadata={"source": "a.pdf"}),
+            Document(page_content="unrelated", metadata={"source": "b.pdf"}),
+            Document(page_content=text[600:], metadata={"source": "a.pdf"}),
+        ]
+
+        built = ContextBuilder(token_budget=0).build(documents)
+
+        assert built.text.count("sentence 50.") == 1
+        assert built.text.index("a.pdf") < built.text.index("b.pdf")
+        assert built.documents_used == 3
+        assert built.truncated is False
+
+    def test_trims_last_section_to_budget(self):
+        """A section that does not fit is cut down to the remaining budget."""
+        documents = [
+            Document(page_content="word " * 1000, metadata={"source": "a.pdf"}),
+        ]
+
+        built = ContextBuilder(token_budget=100, min_section_tokens=10).build(
+            documents
+        )
+
+        assert 10 < built.tokens_used <= 100
+        assert built.truncated is True
+        assert built.as_metadata()["token_budget"] == 100
+
+
 class TestSearchService:
     """Test search service functionality."""
 
@@ -209,6 +818,8 @@ class TestSearchService:
         assert result == []
         mock_embedding_service.get_embedding.assert_called_once_with("test query")
         mock_qdrant_service.hybrid_search.assert_called_once()
+        call_kwargs = mock_qdrant_service.hybrid_search.call_args.kwargs
+        assert call_kwargs["query_embedding"] == [0.1, 0.2, 0.3]
 
     @pytest.mark.asyncio
     async def test_semantic_search_embedding_failure(
@@ -222,6 +833,17 @@ class TestSearchService:
         assert result == []
         mock_qdrant_service.hybrid_search.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_search_by_embedding(
+        self, search_service, mock_embedding_service, mock_qdrant_service
+    ):
+        """Test search with a precomputed embedding skips embedding the query."""
+        await search_service.search_by_embedding([0.1, 0.2, 0.3], "user123")
+
+        mock_embedding_service.get_embedding.assert_not_called()
+        call_kwargs = mock_qdrant_service.hybrid_search.call_args.kwargs
+        assert call_kwargs["query_embedding"] == [0.1, 0.2, 0.3]
+
     @pytest.mark.asyncio
     async def test_search_knowledge_base(self, search_service, mock_qdrant_service):
         """Test knowledge base search."""
@@ -69,6 +69,8 @@ def _load_agent_service_models() -> bool:
         
     try:
         from agent_service.models.sql.base import Base as AgentBase
+        # Imported for its side effect: registers the conversation table on AgentBase
+        from agent_service.models.sql.conversation import ConversationModel  # noqa: F401
         
         # Check if agent service has any models
         if not hasattr(AgentBase.metadata, 'tables') or not AgentBase.metadata.tables:
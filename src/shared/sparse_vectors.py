@@ -0,0 +1,95 @@
+"""
+BM25-style sparse vectors for lexical search in Qdrant.
+
+Indexers (CLI builder, celery worker, agent service) and the agent's
+keyword search must tokenize identically, so the tokenizer and term
+hashing live here. Document vectors carry BM25 term-frequency weights;
+the collection's sparse vector is configured with Qdrant's IDF modifier,
+so the server supplies the inverse document frequency at query time.
+
+Usage:
+    from shared.sparse_vectors import SPARSE_VECTOR_NAME, document_sparse_vector
+
+    indices, values = document_sparse_vector(chunk_text)
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import List, Tuple
+
+# Name of the sparse vector in every collection that supports lexical search
+SPARSE_VECTOR_NAME = "text-bm25"
+
+# BM25 parameters. Chunk lengths are bounded by the splitter, so a fixed
+# average length stands in for the corpus average.
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_AVG_DOC_LENGTH = 150.0
+
+_TOKEN_RE = re.compile(r"[\w']+", re.UNICODE)
+
+_STOPWORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be because
+    been before being below between both but by can could did do does doing
+    down during each few for from further had has have having he her here hers
+    herself him himself his how i if in into is it its itself just me more
+    most my myself no nor not now of off on once only or other our ours
+    ourselves out over own same she should so some such than that the their
+    theirs them themselves then there these they this those through to too
+    under until up very was we were what when where which while who whom why
+    will with would you your yours yourself yourselves
+    """.split()
+)
+
+SparseVectorData = Tuple[List[int], List[float]]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords and one-character tokens removed."""
+    return [
+        token
+        for token in (match.strip("'") for match in _TOKEN_RE.findall(text.lower()))
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+def term_index(token: str) -> int:
+    """Stable (process-independent) sparse index for a token."""
+    return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+
+def document_sparse_vector(text: str) -> SparseVectorData:
+    """
+    Build the sparse vector stored with a document chunk.
+
+    Returns:
+        (indices, values) with BM25 term-frequency weights
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return [], []
+
+    length_norm = 1 - BM25_B + BM25_B * len(tokens) / BM25_AVG_DOC_LENGTH
+    weights = {}
+    for token, tf in Counter(tokens).items():
+        index = term_index(token)
+        # Hash collisions simply add up, like a repeated term would
+        weights[index] = weights.get(index, 0.0) + (
+            tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+        )
+
+    indices = sorted(weights)
+    return indices, [weights[index] for index in indices]
+
+
+def query_sparse_vector(text: str) -> SparseVectorData:
+    """
+    Build the sparse query vector for a search.
+
+    Each distinct query term gets weight 1.0; Qdrant multiplies in the
+    IDF, so the dot product is the BM25 score.
+    """
+    indices = sorted({term_index(token) for token in tokenize(text)})
+    return indices, [1.0] * len(indices)
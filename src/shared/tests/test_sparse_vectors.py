@@ -0,0 +1,48 @@
+"""
+Unit tests for shared.sparse_vectors module.
+"""
+
+from shared.sparse_vectors import (
+    document_sparse_vector,
+    query_sparse_vector,
+    term_index,
+    tokenize,
+)
+
+
+class TestTokenize:
+    """Test suite for tokenize()."""
+
+    def test_lowercases_and_drops_stopwords(self):
+        assert tokenize("The Bulgarian Split-Squat is KEY") == [
+            "bulgarian",
+            "split",
+            "squat",
+            "key",
+        ]
+
+    def test_term_index_is_stable(self):
+        assert term_index("squat") == term_index("squat")
+        assert 0 <= term_index("squat") < 2**31
+
+
+class TestSparseVectors:
+    """Test suite for document and query sparse vectors."""
+
+    def test_repeated_terms_saturate(self):
+        indices, values = document_sparse_vector("squat squat squat deadlift")
+        weights = dict(zip(indices, values))
+
+        squat = weights[term_index("squat")]
+        deadlift = weights[term_index("deadlift")]
+        assert deadlift < squat < 3 * deadlift
+
+    def test_query_vector_has_unit_weights(self):
+        indices, values = query_sparse_vector("squat and the squat")
+
+        assert indices == [term_index("squat")]
+        assert values == [1.0]
+
+    def test_stopword_only_text_is_empty(self):
+        assert document_sparse_vector("the and of") == ([], [])
+        assert query_sparse_vector("") == ([], [])